@@ -1,10 +1,15 @@
 import multiprocessing
 
+import glob
 import importlib.util
 import json
 import os
+import threading
 import urllib.parse
-from typing import Any, List, Literal, Optional, TYPE_CHECKING
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Iterable, Iterator, List, Literal, Optional, TYPE_CHECKING, Union
 
 import pyarrow as pa
 
@@ -16,13 +21,17 @@ if TYPE_CHECKING:
     import polars as pl
 from pyarrow import ArrowException
 
-from influxdb_client_3.exceptions import InfluxDB3ClientQueryError
+from influxdb_client_3.exceptions import InfluxDB3ClientQueryError, InfluxDB3ClientWriteFileError
 from influxdb_client_3.exceptions import InfluxDBError
-from influxdb_client_3.query.query_api import QueryApi as _QueryApi, QueryApiOptionsBuilder
-from influxdb_client_3.read_file import UploadFile
+from influxdb_client_3.query.query_api import QueryApi as _QueryApi, QueryApiOptionsBuilder, QueryResult
+from influxdb_client_3.query.pandas_options import PandasOptions
+from influxdb_client_3.query.query_cache import QueryCache, SchemaCache
+from influxdb_client_3.read_file import UploadFile, UploadManifest, resolve_files
 from influxdb_client_3.write_client import WriteOptions, Point
 from influxdb_client_3.write_client.client.write_api import WriteApi as _WriteApi, SYNCHRONOUS, ASYNCHRONOUS, \
     PointSettings, DefaultWriteOptions, WriteType
+from influxdb_client_3.write_client.client.write.retry import RetryBudget
+from influxdb_client_3.write_client.client.write.write_handle import WriteHandle
 from influxdb_client_3.write_client.domain.write_precision import WritePrecision
 
 polars = importlib.util.find_spec("polars") is not None
@@ -123,7 +132,7 @@ def _parse_precision(precision: str) -> WritePrecision:
 
     :param precision: The precision value to be validated.
                       Must be one of WritePrecision.NS, WritePrecision.MS,
-                      WritePrecision.S, or WritePrecision.US.
+                      WritePrecision.S, WritePrecision.US or WritePrecision.AUTO.
     :return: The valid precision value.
     :rtype: WritePrecision
     :raises ValueError: If the provided precision is not valid.
@@ -136,6 +145,8 @@ def _parse_precision(precision: str) -> WritePrecision:
         return WritePrecision.MS
     if precision == WritePrecision.S or precision == "second":
         return WritePrecision.S
+    if precision == WritePrecision.AUTO:
+        return WritePrecision.AUTO
     raise ValueError(f"Invalid precision value: {precision}")
 
 
@@ -188,6 +199,23 @@ def _parse_timeout(to: str) -> int:
     return timeout
 
 
+def _synchronized(callback):
+    """Return the callback whose calls from several threads don't run concurrently."""
+    lock = threading.Lock()
+
+    def synchronized(*args):
+        with lock:
+            return callback(*args)
+
+    return synchronized
+
+
+def _wrap_query_error(result: QueryResult) -> QueryResult:
+    if isinstance(result.error, ArrowException):
+        return result._replace(error=InfluxDB3ClientQueryError(f"Error while executing query: {result.error}"))
+    return result
+
+
 class InfluxDBClient3:
     def __init__(
             self,
@@ -245,9 +273,22 @@ class InfluxDBClient3:
                                 authentication. (Applies to Write API only)
         :key int connection_pool_maxsize: Number of connections to save that can be reused by urllib3.
                                           Defaults to "multiprocessing.cpu_count() * 5".
+        :key Transport transport: The HTTP transport used by the Write API, defaults to the urllib3 based transport.
+                                  See :class:`~influxdb_client_3.write_client._sync.transport.LoopbackTransport`.
         :key urllib3.util.retry.Retry retries: Set the default retry strategy that is used for all HTTP requests
                                                except batching writes. As a default there is no one retry strategy.
         :key str query_timeout: int value used to set the client query API timeout in milliseconds.
+        :key QueryCache query_cache: Cache the query results, see :class:`~influxdb_client_3.QueryCache`.
+        :key SchemaCache query_schema_cache: Cache the schemas returned by ``query_schema`` and ``mode="schema"``,
+                                             see :class:`~influxdb_client_3.SchemaCache`. The schemas are not
+                                             cached by default.
+        :key int query_stream_workers: Number of threads reading the streams of ``query_stream_async``. Defaults to 8.
+        :key int query_channel_pool_size: Number of Flight clients, each with its own gRPC channel, the concurrent
+                                          queries are spread over. Defaults to 1.
+        :key str query_channel_pool_strategy: Selection of the Flight client for a query, "least_loaded" (default)
+                                              or "round_robin".
+        :key bool query_coalesce: Share the result of a query in flight with the identical concurrent queries instead
+                                  of executing them again. Defaults to ``False``.
         :key str write_timeout: int value used to set the client write API timeout in milliseconds.
         :key bool write_accept_partial: allow partial writes when some lines fail.
         :key bool write_use_v2_api: route writes through /api/v2/write compatibility endpoint.
@@ -337,7 +378,8 @@ class InfluxDBClient3:
             proxy_headers=kwargs.get('proxy_headers', None),
             retries=kwargs.get('retries', False),
             debug=debug,
-            connection_pool_maxsize=kwargs.get('connection_pool_maxsize', multiprocessing.cpu_count() * 5,)
+            connection_pool_maxsize=kwargs.get('connection_pool_maxsize', multiprocessing.cpu_count() * 5,),
+            transport=kwargs.get('transport', None)
         )
 
         if point_settings is None:
@@ -379,6 +421,17 @@ class InfluxDBClient3:
         if kw_keys.__contains__('query_timeout'):
             query_timeout_float = float(kwargs.get('query_timeout'))
             q_opts_builder.timeout(query_timeout_float / 1000.0)
+        if kw_keys.__contains__('query_cache'):
+            q_opts_builder.query_cache(kwargs.get('query_cache', None))
+        if kw_keys.__contains__('query_stream_workers'):
+            q_opts_builder.stream_workers(kwargs.get('query_stream_workers', None))
+        if kw_keys.__contains__('query_channel_pool_size'):
+            q_opts_builder.channel_pool(kwargs.get('query_channel_pool_size', None),
+                                        kwargs.get('query_channel_pool_strategy', None))
+        if kw_keys.__contains__('query_coalesce'):
+            q_opts_builder.coalesce_queries(kwargs.get('query_coalesce', False))
+        if kw_keys.__contains__('query_schema_cache'):
+            q_opts_builder.schema_cache(kwargs.get('query_schema_cache', None))
         self._query_api = _QueryApi(connection_string=connection_string, token=token,
                                     flight_client_options=flight_client_options,
                                     proxy=kwargs.get("proxy", None), options=q_opts_builder.build())
@@ -479,6 +532,7 @@ class InfluxDBClient3:
         :param database: The database to write to. If not provided, uses the database provided during initialization.
         :type database: str
         :param kwargs: Additional arguments to pass to the write API.
+        :return: In batching mode a :class:`WriteHandle` which is completed when the records are written.
         """
         if database is None:
             database = self._database
@@ -557,12 +611,30 @@ class InfluxDBClient3:
             raise e
 
     def write_file(self, file, measurement_name=None, tag_columns=None, timestamp_column='time', database=None,
-                   file_parser_options=None, **kwargs):
+                   file_parser_options=None, streaming=False, columns=None, row_filter=None,
+                   streaming_batch_size=None, max_workers=None, manifest=None, progress_callback=None,
+                   concurrent_requests=1, **kwargs):
         """
-        Write data from a file to InfluxDB.
-
-        :param file: The file to write.
-        :type file: str
+        Write data from a file or multiple files to InfluxDB.
+
+        By default, the whole file is loaded into memory before it is written. With ``streaming=True``
+        the file is read, serialized and written one record batch at a time, so large files can be imported
+        with bounded memory. Streaming is supported for CSV, Parquet, Feather and ORC files.
+
+        Multiple files can be specified by a list of paths, a glob pattern or a directory. They are written
+        concurrently by a pool of ``max_workers`` threads sharing the connection pool of the client.
+
+        Line protocol files (``.lp``, ``.txt`` and ``.lp.gz``) are not parsed. They are read in large blocks,
+        split on line boundaries into bodies of at most ``max_body_bytes`` (see ``file_parser_options``)
+        and posted directly. A gzipped file which fits into one body is posted without decompressing.
+        A ``.txt`` file is written as line protocol only if its path is given, the directories and the glob
+        patterns select only the ``.lp`` and ``.lp.gz`` line protocol files. The ``manifest`` is never written.
+        With ``WritePrecision.AUTO`` the timestamps of line protocol files are expected in nanoseconds, each body
+        is rescaled to its coarsest lossless precision, a body posted without decompressing is sent in nanoseconds.
+
+        :param file: The file to write, a glob pattern (e.g. ``'export/*.parquet'``), a directory
+                     or a list of them.
+        :type file: str or list[str]
         :param measurement_name: The name of the measurement.
         :type measurement_name: str
         :param tag_columns: Tag columns.
@@ -572,21 +644,139 @@ class InfluxDBClient3:
         :param database: The database to write to. If not provided, uses the database provided during initialization.
         :type database: str
         :param file_parser_options: Function for providing additional arguments for the file parser.
+                                    In streaming mode the options are passed into ``pyarrow.dataset.FileFormat``.
+                                    For line protocol files the supported option is ``max_body_bytes``.
         :type file_parser_options: callable
+        :param streaming: Read and write the file by record batches. Enabled automatically
+                          if ``columns`` or ``row_filter`` is specified.
+        :type streaming: bool
+        :param columns: The columns to read from the file, pushed down to the file reader.
+        :type columns: list
+        :param row_filter: The filter expression which selects the rows to write, pushed down to the file reader.
+                           For example: ``pyarrow.dataset.field("temperature") > 70``.
+        :type row_filter: pyarrow.dataset.Expression
+        :param streaming_batch_size: The maximum number of rows read, serialized and written at once in streaming mode.
+        :type streaming_batch_size: int
+        :param max_workers: The number of files written concurrently. Defaults to the number of CPUs.
+        :type max_workers: int
+        :param manifest: The path of a manifest file which records the written files. Files already recorded
+                         in the manifest are skipped, so an interrupted upload can be resumed.
+        :type manifest: str
+        :param progress_callback: The callable called after each written part of a file. It is called from the
+                                  threads writing the files, but never by two threads at the same time.
+                                  The callable must accept three arguments:
+                                    - `str`: the file path
+                                    - `int`: the number of rows written from the file so far
+                                    - `bool`: True if the whole file was written
+        :type progress_callback: callable
+        :param concurrent_requests: The number of concurrent requests writing one file: the bodies of a line protocol
+                                    file or the measurements of a file with the ``measurement`` column.
+        :type concurrent_requests: int
         :param kwargs: Additional arguments to pass to the write API.
+        :raises InfluxDB3ClientWriteFileError: If any of multiple files cannot be written.
         """
         if database is None:
             database = self._database
 
-        try:
-            table = UploadFile(file, file_parser_options).load_file()
+        if progress_callback is not None:
+            progress_callback = _synchronized(progress_callback)
+        write_file_kwargs = dict(measurement_name=measurement_name, tag_columns=tag_columns or [],
+                                 timestamp_column=timestamp_column, database=database,
+                                 file_parser_options=file_parser_options, streaming=streaming, columns=columns,
+                                 row_filter=row_filter, streaming_batch_size=streaming_batch_size,
+                                 progress_callback=progress_callback, concurrent_requests=concurrent_requests,
+                                 **kwargs)
+
+        if isinstance(file, str) and not os.path.isdir(file) and not glob.has_magic(file) and manifest is None:
+            self._write_file(file, **write_file_kwargs)
+            return
+
+        files = resolve_files(file, exclude=[manifest] if manifest is not None else [])
+        upload_manifest = UploadManifest(manifest) if manifest is not None else None
+        if upload_manifest is not None:
+            files = [path for path in files if not upload_manifest.is_completed(path)]
+        if not files:
+            return
+
+        file_errors = {}
+        with ThreadPoolExecutor(max_workers=max_workers or min(len(files), os.cpu_count() or 1),
+                                thread_name_prefix="influxdb_client_3-write_file") as executor:
+            futures = {executor.submit(self._write_file, path, **write_file_kwargs): path for path in files}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    file_errors[path] = e
+                    continue
+                if upload_manifest is not None:
+                    upload_manifest.mark_completed(path)
+
+        if file_errors:
+            raise InfluxDB3ClientWriteFileError(dict(sorted(file_errors.items())))
+
+    def _write_file(self, file, measurement_name, tag_columns, timestamp_column, database, file_parser_options,
+                    streaming, columns, row_filter, streaming_batch_size, progress_callback, concurrent_requests,
+                    **kwargs):
+        if UploadFile(file).is_line_protocol():
+            if columns is not None or row_filter is not None:
+                raise ValueError("The columns and row_filter are not supported for line protocol files")
+            self._write_line_protocol_file(file, database, file_parser_options, progress_callback,
+                                           concurrent_requests, **kwargs)
+            return
+
+        upload_file = UploadFile(file, file_parser_options)
+        rows = 0
+        if streaming or columns is not None or row_filter is not None:
+            for batch in upload_file.iter_batches(columns=columns, row_filter=row_filter,
+                                                  batch_size=streaming_batch_size):
+                if batch.num_rows == 0:
+                    continue
+                self._process_dataframe(batch.to_pandas(), measurement_name, tag_columns, timestamp_column,
+                                        database=database, concurrent_requests=concurrent_requests, **kwargs)
+                rows += batch.num_rows
+                if progress_callback is not None:
+                    progress_callback(file, rows, False)
+        else:
+            table = upload_file.load_file()
             df = table.to_pandas() if isinstance(table, pa.Table) else table
-            self._process_dataframe(df, measurement_name, tag_columns or [], timestamp_column, database=database,
-                                    **kwargs)
-        except Exception as e:
-            raise e
-
-    def _process_dataframe(self, df, measurement_name, tag_columns, timestamp_column, database, **kwargs):
+            self._process_dataframe(df, measurement_name, tag_columns, timestamp_column, database=database,
+                                    concurrent_requests=concurrent_requests, **kwargs)
+            rows = len(df)
+
+        if progress_callback is not None:
+            progress_callback(file, rows, True)
+
+    def _write_line_protocol_file(self, file, database, file_parser_options, progress_callback, concurrent_requests,
+                                  **kwargs):
+        bodies = UploadFile(file).iter_line_protocol(**(file_parser_options or {}))
+        rows = 0
+
+        def write_body(body, content_encoding):
+            self._write_api.write_body(body, bucket=database, content_encoding=content_encoding, **kwargs)
+            # gzipped body is not decompressed to count the lines
+            return body.count(b'\n') + 1 if content_encoding is None else 0
+
+        with ThreadPoolExecutor(max_workers=max(concurrent_requests, 1),
+                                thread_name_prefix="influxdb_client_3-write_lp") as executor:
+            in_flight = deque()
+            for body, content_encoding in bodies:
+                # bound the number of bodies held in memory
+                if len(in_flight) >= max(concurrent_requests, 1):
+                    rows += in_flight.popleft().result()
+                    if progress_callback is not None:
+                        progress_callback(file, rows, False)
+                in_flight.append(executor.submit(write_body, body, content_encoding))
+            while in_flight:
+                rows += in_flight.popleft().result()
+                if progress_callback is not None and in_flight:
+                    progress_callback(file, rows, False)
+
+        if progress_callback is not None:
+            progress_callback(file, rows, True)
+
+    def _process_dataframe(self, df, measurement_name, tag_columns, timestamp_column, database, concurrent_requests=1,
+                           **kwargs):
         # This function is factored out for clarity.
         # It processes a DataFrame before writing to InfluxDB.
 
@@ -594,12 +784,28 @@ class InfluxDBClient3:
         if measurement_name is None:
             measurement_column = next((col for col in ['measurement', 'iox::measurement'] if col in df.columns), None)
             if measurement_column:
-                for measurement in df[measurement_column].unique():
-                    df_measurement = df[df[measurement_column] == measurement].drop(columns=[measurement_column])
-                    self._write_api.write(bucket=self._database, record=df_measurement,
-                                          data_frame_measurement_name=measurement,
+                # The serializer takes the measurement of each row from the column, the frame is not split
+                # by measurement, the rows without measurement are skipped
+                measurements = df[measurement_column]
+                if measurements.isna().any():
+                    df = df[measurements.notna()]
+
+                def write_rows(rows):
+                    self._write_api.write(bucket=database, record=rows,
+                                          data_frame_measurement_column=measurement_column,
                                           data_frame_tag_columns=tag_columns,
-                                          data_frame_timestamp_column=timestamp_column)
+                                          data_frame_timestamp_column=timestamp_column, **kwargs)
+
+                parts = min(concurrent_requests, len(df))
+                if parts > 1:
+                    # the contiguous row slices are views of the frame
+                    size = -(-len(df) // parts)
+                    with ThreadPoolExecutor(max_workers=parts,
+                                            thread_name_prefix="influxdb_client_3-write_measurement") as executor:
+                        list(executor.map(write_rows, (df.iloc[start:start + size]
+                                                       for start in range(0, len(df), size))))
+                else:
+                    write_rows(df)
             else:
                 print("'measurement' column not found in the dataframe.")
         else:
@@ -619,15 +825,23 @@ class InfluxDBClient3:
         :param query: The query to execute on the database.
         :param language: The query language to use. It should be one of "influxql" or "sql". Defaults to "sql".
         :param mode: The mode to use for the query. It should be one of "all", "pandas", "polars", "chunk",
-                     "reader" or "schema". Defaults to "all".
+                     "reader", "schema", "batches", "pandas_batches" or "polars_batches". Defaults to "all".
+                     The ``*batches`` modes return an iterator over the result batch by batch.
         :param database: The database to query from. If not provided, uses the database provided during initialization.
         :param kwargs: Additional arguments to pass to the ``FlightCallOptions headers``. For example, it can be used to
                        set up per request headers.
         :keyword query_parameters: The query parameters to use in the query.
                                    It should be a ``dictionary`` of key-value pairs.
+        :keyword use_cache: Set to ``False`` to bypass the ``query_cache`` of the client for this call.
+        :keyword coalesce: Set to ``False`` to not share the result with the identical concurrent queries when
+                           ``query_coalesce`` is enabled.
+        :keyword cache_ttl: The time-to-live in seconds of the cached result.
+        :keyword batch_rows: The number of rows of the batches yielded by the ``*batches`` modes.
+        :keyword pandas_options: The conversion of the ``pandas`` and ``pandas_batches`` modes,
+                                 e.g. :meth:`PandasOptions.memory_efficient`.
         :return: The query result in the specified mode.
         """
-        if mode == "polars" and polars is False:
+        if mode in ("polars", "polars_batches") and polars is False:
             raise ImportError("Polars is not installed. Please install it with `pip install polars`.")
 
         if database is None:
@@ -638,6 +852,225 @@ class InfluxDBClient3:
         except ArrowException as e:
             raise InfluxDB3ClientQueryError(f"Error while executing query: {e}")
 
+    def query_many(self, queries: Iterable[Union[str, dict]], language: str = "sql", mode: str = "all",
+                   database: str = None, max_concurrency: int = 8, timeout: float = None, as_completed: bool = False,
+                   **kwargs) -> Union[List[QueryResult], Iterator[QueryResult]]:
+        """Execute many queries concurrently over the Flight connection of the client.
+
+        The failure of one query doesn't affect the others, its error is captured in the result:
+
+        >>> queries = [{"query": "SELECT * FROM cpu WHERE host=$host", "query_parameters": {"host": host}}
+        ...            for host in hosts]
+        >>> for result in client.query_many(queries, max_concurrency=16, mode="pandas", timeout=30):
+        ...     if result.ok:
+        ...         report(hosts[result.index], result.result)
+
+        :param queries: The queries as ``str`` or ``dict`` of the :meth:`query` arguments overriding the defaults.
+        :param language: The default query language. Defaults to "sql".
+        :param mode: The default mode of the results. Defaults to "all".
+        :param database: The default database. If not provided, uses the database provided during initialization.
+        :param max_concurrency: The maximum number of queries executed at the same time. Defaults to 8.
+        :param timeout: The timeout of each query in seconds.
+        :param as_completed: Return the iterator of results in the order of completion instead of the list of
+                             results in the order of ``queries``.
+        :param kwargs: Additional arguments of all queries passed to the ``FlightCallOptions headers``.
+        :return: The :class:`~influxdb_client_3.query.query_api.QueryResult` of each query.
+        """
+        if mode in ("polars", "polars_batches") and polars is False:
+            raise ImportError("Polars is not installed. Please install it with `pip install polars`.")
+
+        if database is None:
+            database = self._database
+
+        results = self._query_api.query_many(queries, language=language, mode=mode, database=database,
+                                             max_concurrency=max_concurrency, timeout=timeout,
+                                             as_completed=as_completed, **kwargs)
+        if as_completed:
+            return map(_wrap_query_error, results)
+        return [_wrap_query_error(result) for result in results]
+
+    async def query_many_async(self, queries: Iterable[Union[str, dict]], language: str = "sql", mode: str = "all",
+                               database: str = None, max_concurrency: int = 8, timeout: float = None,
+                               as_completed: bool = False, **kwargs) -> AsyncIterator[QueryResult]:
+        """Execute many queries concurrently and yield the results asynchronously.
+
+        The arguments are the same as of :meth:`query_many`, the results are yielded in the order of ``queries``
+        or in the order of completion if ``as_completed`` is ``True``:
+
+        >>> async for result in client.query_many_async(queries, max_concurrency=16, as_completed=True):
+        ...     print(result.index, result.ok)
+        """
+        if mode in ("polars", "polars_batches") and polars is False:
+            raise ImportError("Polars is not installed. Please install it with `pip install polars`.")
+
+        if database is None:
+            database = self._database
+
+        results = self._query_api.query_many_async(queries, language=language, mode=mode, database=database,
+                                                   max_concurrency=max_concurrency, timeout=timeout,
+                                                   as_completed=as_completed, **kwargs)
+        try:
+            async for result in results:
+                yield _wrap_query_error(result)
+        finally:
+            await results.aclose()
+
+    def query_stream_async(self, query: str, language: str = "sql", mode: str = "batches", database: str = None,
+                           max_buffered: int = 2, **kwargs):
+        """Query data from InfluxDB and iterate over the result asynchronously batch by batch.
+
+        The first batch is available as soon as it is received, the whole result is never buffered:
+
+        >>> async with client.query_stream_async("SELECT * FROM cpu", mode="pandas_batches") as frames:
+        ...     async for df in frames:
+        ...         await send(df)
+
+        :param query: The query to execute on the database.
+        :param language: The query language to use. It should be one of "influxql" or "sql". Defaults to "sql".
+        :param mode: The mode to use for the query. It should be one of "batches", "pandas_batches" or
+                     "polars_batches". Defaults to "batches".
+        :param database: The database to query from. If not provided, uses the database provided during initialization.
+        :param max_buffered: The maximum number of batches read ahead of the consumer. Defaults to 2.
+        :param kwargs: Additional arguments to pass to the ``FlightCallOptions headers``. For example, it can be used to
+                       set up per request headers.
+        :keyword query_parameters: The query parameters to use in the query.
+                                   It should be a ``dictionary`` of key-value pairs.
+        :keyword batch_rows: The number of rows of the batches.
+        :return: The asynchronous iterator, the errors of the query are raised by the iteration.
+        """
+        if mode == "polars_batches" and polars is False:
+            raise ImportError("Polars is not installed. Please install it with `pip install polars`.")
+
+        if database is None:
+            database = self._database
+
+        return self._query_api.query_stream_async(query=query, language=language, mode=mode, database=database,
+                                                  max_buffered=max_buffered, **kwargs)
+
+    def query_time_range(self, query: str, start: Union[datetime, int], end: Union[datetime, int, None] = None,
+                         language: str = "sql", mode: str = "all", database: str = None,
+                         bucket_size: Union[timedelta, int] = timedelta(minutes=5), time_column: str = "time",
+                         **kwargs):
+        """Query data for the time range and cache the result in time buckets.
+
+        The time range is passed as the ``$start`` and ``$end`` query parameters. With the ``query_cache`` of
+        the client, a repeated query of a sliding window fetches only the time buckets it doesn't have yet
+        and the newest, still open, bucket:
+
+        >>> client.query_time_range("SELECT * FROM cpu WHERE time >= $start AND time < $end",
+        ...                         start=datetime.now(timezone.utc) - timedelta(hours=6), mode="pandas")
+
+        :param query: The query selecting the rows of the ``$start``, ``$end`` range.
+        :param start: The inclusive start of the range as ``datetime`` (naive is UTC) or nanoseconds since epoch.
+        :param end: The exclusive end of the range, defaults to now.
+        :param language: The query language to use. It should be one of "influxql" or "sql". Defaults to "sql".
+        :param mode: The mode to use for the query. It should be one of "all", "pandas", "polars", "chunk",
+                     "reader", "schema", "batches", "pandas_batches" or "polars_batches". Defaults to "all".
+                     The ``*batches`` modes return an iterator over the result batch by batch.
+        :param database: The database to query from. If not provided, uses the database provided during initialization.
+        :param bucket_size: The size of the cached time buckets. Defaults to 5 minutes.
+        :param time_column: The column containing the time of the rows. Defaults to "time".
+        :param kwargs: Additional arguments to pass to the ``FlightCallOptions headers``.
+        :keyword query_parameters: The additional query parameters to use in the query.
+        :keyword start_parameter: The name of the query parameter with the start of the range. Defaults to "start".
+        :keyword end_parameter: The name of the query parameter with the end of the range. Defaults to "end".
+        :keyword use_cache: Set to ``False`` to bypass the ``query_cache`` of the client for this call.
+        :return: The query result in the specified mode.
+        """
+        if mode in ("polars", "polars_batches") and polars is False:
+            raise ImportError("Polars is not installed. Please install it with `pip install polars`.")
+
+        if database is None:
+            database = self._database
+
+        try:
+            return self._query_api.query_time_range(query=query, language=language, mode=mode, database=database,
+                                                    start=start, end=end, bucket_size=bucket_size,
+                                                    time_column=time_column, **kwargs)
+        except ArrowException as e:
+            raise InfluxDB3ClientQueryError(f"Error while executing query: {e}")
+
+    def query_partitioned(self, query: str, start: Union[datetime, int, None] = None,
+                          end: Union[datetime, int, None] = None, partitions: int = 4,
+                          partition_parameters: Optional[List[dict]] = None, language: str = "sql",
+                          mode: str = "all", database: str = None, time_column: str = "time",
+                          order_by_time: bool = False, **kwargs):
+        """Split the query into disjoint partitions executed concurrently and merge their results.
+
+        One large stream is limited by the throughput of a single stream, the partitions are streamed in parallel.
+        The time range is split into ``partitions`` sub-ranges passed as the ``$start`` and ``$end`` query
+        parameters:
+
+        >>> client.query_partitioned("SELECT * FROM cpu WHERE time >= $start AND time < $end",
+        ...                          start=datetime.now(timezone.utc) - timedelta(days=7), partitions=8,
+        ...                          order_by_time=True, mode="pandas")
+
+        or each of ``partition_parameters`` defines the query parameters of one partition:
+
+        >>> client.query_partitioned("SELECT * FROM cpu WHERE region = $region",
+        ...                          partition_parameters=[{"region": "us"}, {"region": "eu"}])
+
+        :param query: The query selecting the rows of the partition.
+        :param start: The inclusive start of the range as ``datetime`` (naive is UTC) or nanoseconds since epoch.
+        :param end: The exclusive end of the range, defaults to now.
+        :param partitions: The number of time sub-ranges. Defaults to 4.
+        :param partition_parameters: The query parameters of each partition, used instead of the time sub-ranges.
+        :param language: The query language to use. It should be one of "influxql" or "sql". Defaults to "sql".
+        :param mode: The mode to use for the query. It should be one of "all", "pandas", "polars", "chunk",
+                     "reader", "schema", "batches", "pandas_batches" or "polars_batches". Defaults to "all".
+        :param database: The database to query from. If not provided, uses the database provided during initialization.
+        :param time_column: The column containing the time of the rows. Defaults to "time".
+        :param order_by_time: Order the merged result by the ``time_column``. Defaults to ``False``, the results are
+                              concatenated in the order of the partitions.
+        :param kwargs: Additional arguments to pass to the ``FlightCallOptions headers``.
+        :keyword query_parameters: The query parameters common to all partitions.
+        :keyword max_concurrency: The maximum number of partitions executed at the same time. Defaults to all.
+        :keyword start_parameter: The name of the query parameter with the start of the range. Defaults to "start".
+        :keyword end_parameter: The name of the query parameter with the end of the range. Defaults to "end".
+        :return: The query result in the specified mode.
+        """
+        if mode in ("polars", "polars_batches") and polars is False:
+            raise ImportError("Polars is not installed. Please install it with `pip install polars`.")
+
+        if database is None:
+            database = self._database
+
+        try:
+            return self._query_api.query_partitioned(query=query, language=language, mode=mode, database=database,
+                                                     start=start, end=end, partitions=partitions,
+                                                     partition_parameters=partition_parameters,
+                                                     time_column=time_column, order_by_time=order_by_time, **kwargs)
+        except ArrowException as e:
+            raise InfluxDB3ClientQueryError(f"Error while executing query: {e}")
+
+    def query_schema(self, query: str, language: str = "sql", database: str = None, **kwargs) -> pa.Schema:
+        """Return the schema of the query result without executing the full query.
+
+        The SQL ``SELECT`` query is executed with ``LIMIT 0``, for other queries only the schema is read before
+        the stream is cancelled. The schemas can be cached, see ``query_schema_cache``:
+
+        >>> schema = client.query_schema("SELECT * FROM cpu WHERE time > now() - INTERVAL '1 hour'")
+        >>> print(schema.names)
+
+        :param query: The query to execute on the database.
+        :param language: The query language to use. It should be one of "influxql" or "sql". Defaults to "sql".
+        :param database: The database to query from. If not provided, uses the database provided during initialization.
+        :param kwargs: Additional arguments to pass to the ``FlightCallOptions headers``.
+        :keyword query_parameters: The query parameters to use in the query.
+        :keyword use_cache: Set to ``False`` to bypass the schema cache for this call.
+        :keyword cache_ttl: The time-to-live in seconds of the cached schema.
+        :keyword limit_zero: Set to ``False`` to execute the SQL query as is, without the ``LIMIT 0`` subquery,
+                             e.g. for a join with duplicate output column names.
+        :return: The :class:`pyarrow.Schema` of the query result.
+        """
+        if database is None:
+            database = self._database
+
+        try:
+            return self._query_api.query_schema(query=query, language=language, database=database, **kwargs)
+        except ArrowException as e:
+            raise InfluxDB3ClientQueryError(f"Error while executing query: {e}")
+
     def query_dataframe(
         self,
         query: str,
@@ -662,6 +1095,7 @@ class InfluxDBClient3:
         :type frame_type: Literal["pandas", "polars"]
         :param kwargs: Additional arguments to pass to the query API.
         :keyword query_parameters: Query parameters as a dictionary of key-value pairs.
+        :keyword pandas_options: The conversion into the pandas DataFrame, e.g. :meth:`PandasOptions.memory_efficient`.
         :return: Query result as a pandas or polars DataFrame.
         :rtype: pandas.DataFrame or polars.DataFrame
         :raises ImportError: If polars is requested but not installed.
@@ -693,15 +1127,23 @@ class InfluxDBClient3:
         :param query: The query to execute on the database.
         :param language: The query language to use. It should be one of "influxql" or "sql". Defaults to "sql".
         :param mode: The mode to use for the query. It should be one of "all", "pandas", "polars", "chunk",
-                     "reader" or "schema". Defaults to "all".
+                     "reader", "schema", "batches", "pandas_batches" or "polars_batches". Defaults to "all".
+                     The ``*batches`` modes return an iterator over the result batch by batch.
         :param database: The database to query from. If not provided, uses the database provided during initialization.
         :param kwargs: Additional arguments to pass to the ``FlightCallOptions headers``. For example, it can be used to
                        set up per request headers.
         :keyword query_parameters: The query parameters to use in the query.
                                    It should be a ``dictionary`` of key-value pairs.
+        :keyword use_cache: Set to ``False`` to bypass the ``query_cache`` of the client for this call.
+        :keyword coalesce: Set to ``False`` to not share the result with the identical concurrent queries when
+                           ``query_coalesce`` is enabled.
+        :keyword cache_ttl: The time-to-live in seconds of the cached result.
+        :keyword batch_rows: The number of rows of the batches yielded by the ``*batches`` modes.
+        :keyword pandas_options: The conversion of the ``pandas`` and ``pandas_batches`` modes,
+                                 e.g. :meth:`PandasOptions.memory_efficient`.
         :return: The query result in the specified mode.
         """
-        if mode == "polars" and polars is False:
+        if mode in ("polars", "polars_batches") and polars is False:
             raise ImportError("Polars is not installed. Please install it with `pip install polars`.")
 
         if database is None:
@@ -747,8 +1189,9 @@ class InfluxDBClient3:
         Flush any buffered writes to InfluxDB without closing the client.
 
         This method immediately sends all buffered data points to the server
-        when using batching write mode. After flushing, the client remains
-        open and ready for more writes.
+        when using batching write mode and waits for them at most ``max_flush_wait``
+        of the write options. After flushing, the client remains open and ready
+        for more writes.
 
         For synchronous write mode, this is a no-op since data is written
         immediately.
@@ -779,6 +1222,11 @@ __all__ = [
     "ASYNCHRONOUS",
     "WritePrecision",
     "WriteOptions",
+    "WriteHandle",
+    "RetryBudget",
+    "QueryCache",
+    "SchemaCache",
+    "PandasOptions",
     "write_client_options",
     "flight_client_options",
     "file_parser_options"
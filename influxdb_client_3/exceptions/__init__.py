@@ -1,4 +1,4 @@
 # flake8: noqa
 
 from .exceptions import InfluxDB3ClientQueryError, InfluxDBError, InfluxDB3ClientError, InfluxDBPartialWriteError, \
-    InfluxDBPartialWriteLineError
+    InfluxDBPartialWriteLineError, InfluxDB3ClientWriteFileError, InfluxDBShardedWriteError
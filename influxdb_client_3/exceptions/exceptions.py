@@ -3,7 +3,7 @@
 import json
 import logging
 from dataclasses import dataclass
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from urllib3 import HTTPResponse
 
@@ -42,6 +42,22 @@ class InfluxDB3ClientQueryError(InfluxDB3ClientError):
         self.message = error_message
 
 
+class InfluxDB3ClientWriteFileError(InfluxDB3ClientError):
+    """
+    Represents an error that occurs when some of multiple files cannot be written.
+
+    :ivar file_errors: The errors keyed by the path of the file which failed.
+    :type file_errors: Dict[str, Exception]
+    """
+
+    def __init__(self, file_errors: Dict[str, Exception]):
+        self.file_errors = file_errors
+        self.message = f"Failed to write {len(file_errors)} file(s):\n" + "\n".join(
+            f"\t{file}: {error}" for file, error in file_errors.items()
+        )
+        super().__init__(self.message)
+
+
 def _is_partial_write_error(error_message) -> bool:
     if not isinstance(error_message, str) or not error_message:
         return False
@@ -253,3 +269,20 @@ class InfluxDBPartialWriteError(InfluxDBError):
             for error_message, line_number, original_line in parsed_line_errors
         ]
         return cls(response=response, line_errors=line_errors)
+
+
+class InfluxDBShardedWriteError(InfluxDBError):
+    """
+    Raised when some shards of a write sent by several concurrent requests fail.
+
+    :ivar shard_errors: The errors keyed by the index of the failed shard.
+    :ivar shards: The total number of shards.
+    """
+
+    def __init__(self, shard_errors: Dict[int, Exception], shards: int):
+        self.shard_errors = shard_errors
+        self.shards = shards
+        message = f"Failed to write {len(shard_errors)} of {shards} shard(s):\n" + "\n".join(
+            f"\tshard {index}: {error}" for index, error in shard_errors.items()
+        )
+        super().__init__(message=message)
@@ -0,0 +1,279 @@
+"""Iterate over query results batch by batch."""
+import asyncio
+import concurrent.futures
+import threading
+import weakref
+from concurrent.futures import Executor
+from typing import Callable, Iterator, List, Optional
+
+import pyarrow as pa
+
+from influxdb_client_3.query.pandas_options import PandasOptions
+
+BATCH_MODES = ("batches", "pandas_batches", "polars_batches")
+
+
+def _read_batches(reader) -> Iterator[pa.RecordBatch]:
+    while True:
+        try:
+            chunk = reader.read_chunk()
+        except StopIteration:
+            return
+        if chunk.data is not None:
+            yield chunk.data
+
+
+def _combine(batches: List[pa.RecordBatch]) -> pa.RecordBatch:
+    if len(batches) == 1:
+        return batches[0]
+    return pa.Table.from_batches(batches).combine_chunks().to_batches()[0]
+
+
+def _rechunk(batches: Iterator[pa.RecordBatch], rows: int) -> Iterator[pa.RecordBatch]:
+    """Slice and combine the batches into batches of ``rows`` rows, the last one can be smaller."""
+    pending, pending_rows = [], 0
+    for batch in batches:
+        offset = 0
+        while offset < batch.num_rows:
+            take = min(rows - pending_rows, batch.num_rows - offset)
+            pending.append(batch.slice(offset, take))
+            pending_rows += take
+            offset += take
+            if pending_rows == rows:
+                yield _combine(pending)
+                pending, pending_rows = [], 0
+    if pending:
+        yield _combine(pending)
+
+
+class RecordBatchIterator(object):
+    """
+    Iterator over the query result which holds only one batch in memory.
+
+    The batches are yielded as :class:`pyarrow.RecordBatch` or converted to pandas or polars ``DataFrame`` one by one.
+    Closing the iterator before the end cancels the remaining stream.
+
+    Example:
+        .. code-block:: python
+
+            with client.query("SELECT * FROM cpu", mode="pandas_batches", batch_rows=100_000) as frames:
+                for df in frames:
+                    if process(df):
+                        break  # the stream is cancelled on exit
+    """
+
+    def __init__(self, reader, convert: Optional[Callable] = None, batch_rows: Optional[int] = None):
+        """
+        Initialize the iterator.
+
+        :param reader: the :class:`pyarrow.flight.FlightStreamReader` of the query
+        :param convert: the function applied to each record batch
+        :param batch_rows: re-chunk the stream into batches of ``batch_rows`` rows
+        """
+        if batch_rows is not None and batch_rows <= 0:
+            raise ValueError(f"batch_rows must be positive, not {batch_rows}")
+        self._reader = reader
+        self._convert = convert
+        batches = _read_batches(reader)
+        self._batches = _rechunk(batches, batch_rows) if batch_rows else batches
+        self._closed = False
+
+    @property
+    def schema(self) -> pa.Schema:
+        """Return the schema of the result."""
+        return self._reader.schema
+
+    def __iter__(self):
+        """Return the iterator itself."""
+        return self
+
+    def __next__(self):
+        """Return the next batch."""
+        if self._closed:
+            raise StopIteration
+        try:
+            batch = next(self._batches)
+        except StopIteration:
+            self._closed = True
+            raise
+        return self._convert(batch) if self._convert is not None else batch
+
+    def close(self) -> None:
+        """Cancel the remaining stream."""
+        if self._closed:
+            return
+        self._closed = True
+        self._reader.cancel()
+
+    def __enter__(self):
+        """Return the iterator."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Cancel the remaining stream."""
+        self.close()
+
+
+def to_batch_iterator(reader, mode: str, batch_rows: Optional[int] = None,
+                      pandas_options: Optional[PandasOptions] = None) -> RecordBatchIterator:
+    """Create the iterator for the batch ``mode``, each batch is released after its conversion."""
+    convert = None
+    if mode == "pandas_batches":
+        convert = pa.RecordBatch.to_pandas if pandas_options is None else pandas_options.to_pandas
+    elif mode == "polars_batches":
+        import polars as pl
+        convert = pl.from_arrow
+    return RecordBatchIterator(reader, convert, batch_rows)
+
+
+class _Failure(object):
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+_END = object()
+_PUT_TIMEOUT = 0.1
+
+
+class _Stream(object):
+    """The state shared by the iterator and its reading thread, the thread doesn't keep the iterator alive."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_buffered: int):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_buffered)
+        self.closed = False
+        self._iterator: Optional[RecordBatchIterator] = None
+        self._lock = threading.Lock()
+
+    def produce(self, open_iterator: Callable[[], RecordBatchIterator]):
+        try:
+            iterator = open_iterator()
+            with self._lock:
+                self._iterator = iterator
+            for batch in iterator:
+                if not self._put(batch):
+                    break
+            else:
+                self._put(_END)
+        except BaseException as e:
+            self._put(_Failure(e))
+        finally:
+            if self.closed:
+                self.close()
+
+    def _put(self, item) -> bool:
+        """Wait for the space in the queue until the stream is closed, return ``False`` if the item is dropped."""
+        if self.closed or self.loop.is_closed():
+            return False
+        future = asyncio.run_coroutine_threadsafe(self.queue.put(item), self.loop)
+        while True:
+            try:
+                future.result(timeout=_PUT_TIMEOUT)
+                return True
+            except concurrent.futures.TimeoutError:
+                if self.closed or self.loop.is_closed():
+                    future.cancel()
+                    return False
+
+    def close(self):
+        """Stop the reading thread and cancel the remaining stream."""
+        self.closed = True
+        with self._lock:
+            if self._iterator is not None:
+                self._iterator.close()
+
+    def drain(self):
+        """Release the buffered batches, called in the event loop."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+    def release(self):
+        """Close the stream of the iterator collected without ``aclose``."""
+        self.close()
+        try:
+            self.loop.call_soon_threadsafe(self.drain)
+        except RuntimeError:
+            # the event loop is already closed
+            pass
+
+
+class AsyncRecordBatchIterator(object):
+    """
+    Asynchronous iterator over the query result.
+
+    The stream is read by a thread of the executor which hands the batches over to the event loop through a queue of
+    ``max_buffered`` batches. When the queue is full the reading thread waits, so a slow consumer doesn't buffer
+    the whole result. Closing the iterator before the end cancels the remaining stream. The iterator left without
+    ``aclose``, e.g. by ``break`` out of ``async for``, cancels the stream and releases the reading thread when it is
+    garbage collected.
+
+    Example:
+        .. code-block:: python
+
+            async with client.query_stream_async("SELECT * FROM cpu", mode="batches") as batches:
+                async for batch in batches:
+                    await response.write(serialize(batch))
+    """
+
+    def __init__(self, open_iterator: Callable[[], RecordBatchIterator], executor: Optional[Executor] = None,
+                 max_buffered: int = 2):
+        """
+        Initialize the iterator, the query is executed by the first ``__anext__``.
+
+        :param open_iterator: the function executing the query and returning the :class:`RecordBatchIterator`,
+                              it is called in the executor
+        :param executor: the executor reading the stream, ``None`` is the default executor of the event loop
+        :param max_buffered: the maximum number of batches read ahead of the consumer
+        """
+        if max_buffered <= 0:
+            raise ValueError(f"max_buffered must be positive, not {max_buffered}")
+        self._open_iterator = open_iterator
+        self._executor = executor
+        self._max_buffered = max_buffered
+        self._stream: Optional[_Stream] = None
+        self._producer = None
+        self._closed = False
+
+    def __aiter__(self):
+        """Return the iterator itself."""
+        return self
+
+    async def __anext__(self):
+        """Return the next batch."""
+        if self._closed:
+            raise StopAsyncIteration
+        if self._stream is None:
+            loop = asyncio.get_running_loop()
+            self._stream = _Stream(loop, self._max_buffered)
+            weakref.finalize(self, self._stream.release)
+            self._producer = loop.run_in_executor(self._executor, self._stream.produce, self._open_iterator)
+        item = await self._stream.queue.get()
+        if item is _END:
+            self._closed = True
+            raise StopAsyncIteration
+        if isinstance(item, _Failure):
+            self._closed = True
+            raise item.exception
+        return item
+
+    async def aclose(self) -> None:
+        """Cancel the remaining stream and wait for the reading thread."""
+        if self._closed and self._producer is None:
+            return
+        self._closed = True
+        if self._stream is not None:
+            self._stream.close()
+        if self._producer is not None:
+            producer, self._producer = self._producer, None
+            while not producer.done():
+                # release the reading thread waiting for the space in the queue
+                self._stream.drain()
+                await asyncio.wait([producer], timeout=0.01)
+
+    async def __aenter__(self):
+        """Return the iterator."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Cancel the remaining stream."""
+        await self.aclose()
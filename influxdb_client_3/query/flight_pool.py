@@ -0,0 +1,109 @@
+"""Pool of Flight clients spreading the query streams over several gRPC channels."""
+import threading
+import weakref
+from typing import Callable, List
+
+from pyarrow.flight import FlightCallOptions, FlightClient, FlightStreamReader, FlightUnavailableError, Ticket
+
+POOL_STRATEGIES = ("least_loaded", "round_robin")
+
+
+class _PooledClient(object):
+    def __init__(self, client: FlightClient):
+        self.client = client
+        self.streams = 0
+        self.healthy = True
+
+
+class FlightClientPool(object):
+    """
+    Pool of :class:`pyarrow.flight.FlightClient`, each of them with its own gRPC channel.
+
+    All streams of one channel share one HTTP/2 connection and its flow-control window, the pool spreads
+    the concurrent queries over up to ``size`` channels. The ``least_loaded`` strategy picks the client with the fewest
+    open streams, ``round_robin`` cycles over the clients. The first client is opened at once, the others lazily:
+    ``least_loaded`` opens a new client only when all open clients are busy.
+
+    A stream occupies its client until the reader is released. The client whose call failed
+    with :class:`pyarrow.flight.FlightUnavailableError` is evicted from the pool, it is closed after its last stream
+    is released and replaced by a new client when needed.
+    """
+
+    def __init__(self, factory: Callable[[], FlightClient], size: int = 1, strategy: str = "least_loaded"):
+        """
+        Initialize the pool.
+
+        :param factory: the function creating a new client
+        :param size: the maximum number of clients
+        :param strategy: the selection of the client for a new stream, "least_loaded" or "round_robin"
+        """
+        if size is None or size <= 0:
+            raise ValueError(f"size must be positive, not {size}")
+        if strategy not in POOL_STRATEGIES:
+            raise ValueError(f"strategy must be one of {POOL_STRATEGIES}, not {strategy}")
+        self.size = size
+        self.strategy = strategy
+        self._factory = factory
+        self._clients: List[_PooledClient] = []
+        self._next = 0
+        self._lock = threading.Lock()
+        self._open()
+
+    def do_get(self, ticket: Ticket, options: FlightCallOptions = None) -> FlightStreamReader:
+        """Execute ``do_get`` on a client of the pool, the client is occupied until the reader is released."""
+        pooled = self._acquire()
+        try:
+            reader = pooled.client.do_get(ticket, options)
+        except FlightUnavailableError:
+            self._release(pooled, healthy=False)
+            raise
+        except BaseException:
+            self._release(pooled)
+            raise
+        try:
+            weakref.finalize(reader, self._release, pooled)
+        except TypeError:
+            # the reader doesn't support weak references, the stream is counted only while opening
+            self._release(pooled)
+        return reader
+
+    def loads(self) -> List[int]:
+        """Return the number of open streams of each client in the pool."""
+        with self._lock:
+            return [pooled.streams for pooled in self._clients]
+
+    def close(self) -> None:
+        """Close all clients of the pool."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for pooled in clients:
+            pooled.healthy = False
+            pooled.client.close()
+
+    def _open(self) -> _PooledClient:
+        pooled = _PooledClient(self._factory())
+        self._clients.append(pooled)
+        return pooled
+
+    def _acquire(self) -> _PooledClient:
+        with self._lock:
+            if self.strategy == "round_robin":
+                index = self._next % self.size
+                self._next += 1
+                pooled = self._clients[index] if index < len(self._clients) else self._open()
+            else:
+                pooled = min(self._clients, key=lambda candidate: candidate.streams, default=None)
+                if pooled is None or (pooled.streams > 0 and len(self._clients) < self.size):
+                    pooled = self._open()
+            pooled.streams += 1
+            return pooled
+
+    def _release(self, pooled: _PooledClient, healthy: bool = True) -> None:
+        with self._lock:
+            pooled.streams -= 1
+            if not healthy and pooled.healthy:
+                pooled.healthy = False
+                self._clients.remove(pooled)
+            close = not pooled.healthy and pooled.streams == 0
+        if close:
+            pooled.client.close()
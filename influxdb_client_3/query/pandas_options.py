@@ -0,0 +1,71 @@
+"""Conversion of query results into pandas DataFrame."""
+from typing import Union
+
+import pyarrow as pa
+
+
+class PandasOptions(object):
+    """
+    Options of the conversion of query results into :class:`pandas.DataFrame`.
+
+    The defaults are the defaults of :meth:`pyarrow.Table.to_pandas`: the result is copied into consolidated blocks
+    and the strings become Python objects. :meth:`memory_efficient` releases the Arrow buffers column by column
+    during the conversion and keeps the columns Arrow-backed, which roughly halves the peak memory of wide results.
+
+    Example:
+        .. code-block:: python
+
+            from influxdb_client_3 import PandasOptions
+
+            df = client.query("SELECT * FROM cpu", mode="pandas", pandas_options=PandasOptions.memory_efficient())
+    """
+
+    def __init__(self, self_destruct: bool = False, split_blocks: bool = False, use_threads: bool = True,
+                 arrow_dtypes: bool = False, strings_to_categorical: bool = False):
+        """
+        Initialize the options.
+
+        :param self_destruct: release the Arrow buffers of each column as soon as it is converted,
+                              applied only to the results which are not shared, e.g. by the query cache
+        :param split_blocks: create a block per column instead of consolidating the columns of the same type
+        :param use_threads: convert the columns in parallel
+        :param arrow_dtypes: use the Arrow-backed ``pandas.ArrowDtype`` (requires pandas 1.5+),
+                             the dictionary-encoded tag columns are converted to ``category``
+        :param strings_to_categorical: convert the string columns to ``category``
+        """
+        self.self_destruct = self_destruct
+        self.split_blocks = split_blocks
+        self.use_threads = use_threads
+        self.arrow_dtypes = arrow_dtypes
+        self.strings_to_categorical = strings_to_categorical
+
+    @classmethod
+    def memory_efficient(cls, use_threads: bool = True) -> 'PandasOptions':
+        """Return the options converting with the lowest peak memory."""
+        return cls(self_destruct=True, split_blocks=True, use_threads=use_threads, arrow_dtypes=True)
+
+    def to_pandas(self, data: Union[pa.Table, pa.RecordBatch], owned: bool = True):
+        """
+        Convert the table or record batch into the ``DataFrame``.
+
+        :param data: the query result
+        :param owned: ``True`` if ``data`` is not used after the conversion and its buffers can be released
+        """
+        options = {
+            "split_blocks": self.split_blocks,
+            "use_threads": self.use_threads,
+            "strings_to_categorical": self.strings_to_categorical,
+        }
+        if self.self_destruct and owned:
+            options["self_destruct"] = True
+        if self.arrow_dtypes:
+            options["types_mapper"] = _arrow_dtype
+        return data.to_pandas(**options)
+
+
+def _arrow_dtype(data_type: pa.DataType):
+    """Map the Arrow type to the Arrow-backed pandas dtype, the dictionary-encoded columns stay categorical."""
+    if pa.types.is_dictionary(data_type):
+        return None
+    import pandas as pd
+    return pd.ArrowDtype(data_type)
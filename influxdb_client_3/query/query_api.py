@@ -1,12 +1,27 @@
 """Query data in InfluxDB 3."""
 import asyncio
+import functools
 # coding: utf-8
 import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed as futures_as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Iterable, Iterator, List, NamedTuple, Optional, Union
 
+import pyarrow as pa
 from pyarrow.flight import FlightClient, Ticket, FlightCallOptions, FlightStreamReader
 
+from influxdb_client_3.query.batch_iterator import BATCH_MODES, AsyncRecordBatchIterator, to_batch_iterator
+from influxdb_client_3.query.flight_pool import FlightClientPool
+from influxdb_client_3.query.pandas_options import PandasOptions
+from influxdb_client_3.query.query_cache import QueryCache, SchemaCache, _concat_tables, _merge_by_time, _slice_time, \
+    _time_buckets, _to_nanoseconds, _to_rfc3339
+from influxdb_client_3.query.single_flight import SingleFlight
 from influxdb_client_3.version import USER_AGENT
 
+_SELECT_QUERY = re.compile(r"\s*(select|with)\b", re.IGNORECASE)
+
 
 class QueryApiOptions(object):
     """
@@ -21,8 +36,15 @@ class QueryApiOptions(object):
     timeout(float): timeout in seconds to wait for a response
     disable_grpc_compression (bool): disable gRPC compression for query responses
     middleware (list): list of middleware functions to be applied to Flight calls
+    query_cache (QueryCache): cache of the query results
+    stream_workers (int): number of threads reading the streams of asynchronous streaming queries
+    channel_pool_size (int): maximum number of Flight clients, each with its own gRPC channel
+    channel_pool_strategy (str): selection of the Flight client for a query, "least_loaded" or "round_robin"
+    coalesce_queries (bool): share the result of a query in flight with the identical concurrent queries
+    schema_cache (SchemaCache): cache of the schemas of query results
     """
     _DEFAULT_TIMEOUT = 300.0
+    _DEFAULT_STREAM_WORKERS = 8
     tls_root_certs: bytes = None
     tls_verify: bool = None
     proxy: str = None
@@ -30,6 +52,12 @@ class QueryApiOptions(object):
     timeout: float = None
     disable_grpc_compression: bool = False
     middleware: list = None
+    query_cache: QueryCache = None
+    stream_workers: int = _DEFAULT_STREAM_WORKERS
+    channel_pool_size: int = 1
+    channel_pool_strategy: str = "least_loaded"
+    coalesce_queries: bool = False
+    schema_cache: SchemaCache = None
 
     def __init__(self, root_certs_path: str,
                  verify: bool,
@@ -37,7 +65,13 @@ class QueryApiOptions(object):
                  flight_client_options: dict,
                  timeout: float = _DEFAULT_TIMEOUT,
                  disable_grpc_compression: bool = False,
-                 middleware: list = None):
+                 middleware: list = None,
+                 query_cache: QueryCache = None,
+                 stream_workers: int = None,
+                 channel_pool_size: int = None,
+                 channel_pool_strategy: str = None,
+                 coalesce_queries: bool = False,
+                 schema_cache: SchemaCache = None):
         """
         Initialize a set of QueryApiOptions
 
@@ -49,6 +83,16 @@ class QueryApiOptions(object):
         :param timeout: timeout in seconds to wait for a response.
         :param disable_grpc_compression: disable gRPC compression for query responses.
         :param middleware: list of middleware functions to be applied to Flight calls.
+        :param query_cache: cache of the query results, the results are not cached by default.
+        :param stream_workers: number of threads reading the streams of asynchronous streaming queries,
+               the number of concurrently read streams is bounded by this value.
+        :param channel_pool_size: maximum number of Flight clients, each with its own gRPC channel,
+               the concurrent queries are spread over the channels. Defaults to 1.
+        :param channel_pool_strategy: selection of the Flight client for a query,
+               "least_loaded" (default) or "round_robin".
+        :param coalesce_queries: share the result of a query in flight with the identical concurrent queries
+               instead of executing them again.
+        :param schema_cache: cache of the schemas of query results, the schemas are not cached by default.
         """
         if root_certs_path:
             self.tls_root_certs = self._read_certs(root_certs_path)
@@ -58,6 +102,12 @@ class QueryApiOptions(object):
         self.timeout = timeout
         self.disable_grpc_compression = disable_grpc_compression
         self.middleware = middleware
+        self.query_cache = query_cache
+        self.stream_workers = stream_workers or self._DEFAULT_STREAM_WORKERS
+        self.channel_pool_size = channel_pool_size or 1
+        self.channel_pool_strategy = channel_pool_strategy or "least_loaded"
+        self.coalesce_queries = coalesce_queries
+        self.schema_cache = schema_cache
 
     def _read_certs(self, path: str) -> bytes:
         with open(path, "rb") as certs_file:
@@ -89,6 +139,12 @@ class QueryApiOptionsBuilder(object):
     _timeout: float = None
     _disable_grpc_compression: bool = False
     _middleware: list = None
+    _query_cache: QueryCache = None
+    _stream_workers: int = None
+    _channel_pool_size: int = None
+    _channel_pool_strategy: str = None
+    _coalesce_queries: bool = False
+    _schema_cache: SchemaCache = None
 
     def root_certs(self, path: str):
         self._root_certs_path = path
@@ -119,6 +175,32 @@ class QueryApiOptionsBuilder(object):
         self._middleware = middleware
         return self
 
+    def query_cache(self, query_cache: QueryCache):
+        """Cache the query results in the given cache."""
+        self._query_cache = query_cache
+        return self
+
+    def stream_workers(self, workers: int):
+        """Set the number of threads reading the streams of asynchronous streaming queries."""
+        self._stream_workers = workers
+        return self
+
+    def channel_pool(self, size: int, strategy: str = None):
+        """Spread the queries over the pool of ``size`` Flight clients selected by the ``strategy``."""
+        self._channel_pool_size = size
+        self._channel_pool_strategy = strategy
+        return self
+
+    def coalesce_queries(self, coalesce: bool):
+        """Share the result of a query in flight with the identical concurrent queries."""
+        self._coalesce_queries = coalesce
+        return self
+
+    def schema_cache(self, schema_cache: SchemaCache):
+        """Cache the schemas of query results in the given cache."""
+        self._schema_cache = schema_cache
+        return self
+
     def build(self) -> QueryApiOptions:
         """Build a QueryApiOptions object with previously set values"""
         return QueryApiOptions(
@@ -128,10 +210,34 @@ class QueryApiOptionsBuilder(object):
             flight_client_options=self._flight_client_options,
             timeout=self._timeout,
             disable_grpc_compression=self._disable_grpc_compression,
-            middleware=self._middleware
+            middleware=self._middleware,
+            query_cache=self._query_cache,
+            stream_workers=self._stream_workers,
+            channel_pool_size=self._channel_pool_size,
+            channel_pool_strategy=self._channel_pool_strategy,
+            coalesce_queries=self._coalesce_queries,
+            schema_cache=self._schema_cache
         )
 
 
+class QueryResult(NamedTuple):
+    """Result of one query executed by ``query_many``."""
+
+    index: int
+    """The index of the query in the submitted queries."""
+    query: str
+    """The query text."""
+    result: Any = None
+    """The query result in the requested mode, ``None`` if the query failed."""
+    error: Optional[BaseException] = None
+    """The error of the failed query."""
+
+    @property
+    def ok(self) -> bool:
+        """Return ``True`` if the query succeeded."""
+        return self.error is None
+
+
 class QueryApi(object):
     """
     Implementation for '/api/v2/query' endpoint.
@@ -170,6 +276,13 @@ class QueryApi(object):
         else:
             self._flight_client_options["generic_options"] = [default_user_agent]
         self._proxy = proxy
+        self._query_cache = None
+        self._stream_workers = QueryApiOptions._DEFAULT_STREAM_WORKERS
+        self._stream_executor = None
+        self._stream_executor_lock = threading.Lock()
+        self._single_flight = None
+        self._schema_cache = None
+        pool_size, pool_strategy = 1, "least_loaded"
         from influxdb_client_3 import _merge_options as merge_options
         if options:
             if options.flight_client_options:
@@ -196,9 +309,19 @@ class QueryApi(object):
                 )
             if options.middleware:
                 self._flight_client_options["middleware"] = options.middleware
+            self._query_cache = options.query_cache
+            self._stream_workers = options.stream_workers
+            pool_size, pool_strategy = options.channel_pool_size, options.channel_pool_strategy
+            if options.coalesce_queries:
+                self._single_flight = SingleFlight()
+            self._schema_cache = options.schema_cache
         if self._proxy:
             self._flight_client_options["generic_options"].append(("grpc.http_proxy", self._proxy))
-        self._flight_client = FlightClient(connection_string, **self._flight_client_options)
+        if pool_size > 1:
+            # gRPC shares the connections of the channels with the same arguments, use a connection per channel
+            self._flight_client_options["generic_options"].append(("grpc.use_local_subchannel_pool", 1))
+        self._flight_pool = FlightClientPool(lambda: FlightClient(connection_string, **self._flight_client_options),
+                                             size=pool_size, strategy=pool_strategy)
 
     def query(self, query: str, language: str, mode: str, database: str, **kwargs):
         """Query data from InfluxDB.
@@ -206,19 +329,47 @@ class QueryApi(object):
         :param query: The query to execute on the database.
         :param language: The query language.
         :param mode: The mode to use for the query.
-                     It should be one of "all", "pandas", "polars", "chunk", "reader" or "schema".
+                     It should be one of "all", "pandas", "polars", "chunk", "reader", "schema", "batches",
+                     "pandas_batches" or "polars_batches".
         :param database: The database to query from.
         :param kwargs: Additional arguments to pass to the ``FlightCallOptions headers``.
                        For example, it can be used to set up per request headers.
         :keyword query_parameters: The query parameters to use in the query.
                                    It should be a ``dictionary`` of key-value pairs.
+        :keyword use_cache: Set to ``False`` to bypass the query cache for this call.
+        :keyword cache_ttl: The time-to-live in seconds of the cached result, defaults to the ``ttl`` of the cache.
+        :keyword coalesce: Set to ``False`` to not share the result with the identical concurrent queries.
+        :keyword batch_rows: The number of rows of the batches yielded by the ``*batches`` modes,
+                             defaults to the batches as received from the server.
+        :keyword pandas_options: The :class:`PandasOptions` of the ``pandas`` and ``pandas_batches`` modes.
         :return: The query result in the specified mode.
         """
+        use_cache = kwargs.get("use_cache", True)
+        schema_ttl = kwargs.get("cache_ttl")
+        batch_rows = kwargs.pop("batch_rows", None)
+        pandas_options = kwargs.pop("pandas_options", None)
+        cache_key, cache_ttl = self._cache_key(query, language, database, kwargs)
+        flight_key = self._flight_key(query, language, mode, database, kwargs)
+        table = self._query_cache.get(cache_key) if cache_key is not None else None
+        if table is None and mode == "schema":
+            return self.query_schema(query, language, database, use_cache=use_cache, cache_ttl=schema_ttl,
+                                     limit_zero=False, **kwargs)
+        if cache_key is not None or flight_key is not None:
+            if table is None:
+                def read_all():
+                    ticket, _options = self._prepare_query(query, language, database, **kwargs)
+                    return self._do_get(ticket, _options).read_all()
+
+                table = read_all() if flight_key is None else self._single_flight.do(flight_key, read_all)
+                if cache_key is not None:
+                    self._query_cache.put(cache_key, table, cache_ttl)
+            return self._translate_table(table, mode, batch_rows, pandas_options)
+
         ticket, _options = self._prepare_query(query, language, database, **kwargs)
 
         flight_reader = self._do_get(ticket, _options)
 
-        return self._translate_stream_reader(flight_reader, mode)
+        return self._translate_stream_reader(flight_reader, mode, batch_rows, pandas_options)
 
     async def query_async(self, query: str, language: str, mode: str, database: str, **kwargs):
         """Query data from InfluxDB asynchronously.
@@ -228,24 +379,361 @@ class QueryApi(object):
         :param query: The query to execute on the database.
         :param language: The query language.
         :param mode: The mode to use for the query.
-             It should be one of "all", "pandas", "polars", "chunk", "reader" or "schema".
+             It should be one of "all", "pandas", "polars", "chunk", "reader", "schema", "batches",
+             "pandas_batches" or "polars_batches".
         :param database: The database to query from.
         :param kwargs: Additional arguments to pass to the ``FlightCallOptions headers``.
                For example, it can be used to set up per request headers.
         :keyword query_parameters: The query parameters to use in the query.
                            It should be a ``dictionary`` of key-value pairs.
+        :keyword use_cache: Set to ``False`` to bypass the query cache for this call.
+        :keyword cache_ttl: The time-to-live in seconds of the cached result, defaults to the ``ttl`` of the cache.
+        :keyword coalesce: Set to ``False`` to not share the result with the identical concurrent queries.
+        :keyword batch_rows: The number of rows of the batches yielded by the ``*batches`` modes,
+                             defaults to the batches as received from the server.
+        :keyword pandas_options: The :class:`PandasOptions` of the ``pandas`` and ``pandas_batches`` modes.
         :return: The query result in the specified mode.
         """
-        ticket, options = self._prepare_query(query, language, database, **kwargs)
+        use_cache = kwargs.get("use_cache", True)
+        schema_ttl = kwargs.get("cache_ttl")
+        batch_rows = kwargs.pop("batch_rows", None)
+        pandas_options = kwargs.pop("pandas_options", None)
+        cache_key, cache_ttl = self._cache_key(query, language, database, kwargs)
+        flight_key = self._flight_key(query, language, mode, database, kwargs)
         loop = asyncio.get_running_loop()
+        table = self._query_cache.get(cache_key) if cache_key is not None else None
+        if table is None and mode == "schema":
+            return await loop.run_in_executor(None, functools.partial(self.query_schema, query, language, database,
+                                                                      use_cache=use_cache, cache_ttl=schema_ttl,
+                                                                      limit_zero=False, **kwargs))
+        if cache_key is not None or flight_key is not None:
+            if table is None:
+                async def read_all():
+                    ticket, options = self._prepare_query(query, language, database, **kwargs)
+                    _flight_reader = await loop.run_in_executor(None, self._do_get, ticket, options)
+                    return await loop.run_in_executor(None, _flight_reader.read_all)
+
+                if flight_key is None:
+                    table = await read_all()
+                else:
+                    table = await self._single_flight.do_async(flight_key, read_all)
+                if cache_key is not None:
+                    self._query_cache.put(cache_key, table, cache_ttl)
+            return await loop.run_in_executor(None, self._translate_table, table, mode, batch_rows, pandas_options)
+
+        ticket, options = self._prepare_query(query, language, database, **kwargs)
         _flight_reader = await loop.run_in_executor(None,
-                                                    self._flight_client.do_get, ticket, options)
+                                                    self._do_get, ticket, options)
         return await loop.run_in_executor(None, self._translate_stream_reader,
                                           _flight_reader,
-                                          mode)
+                                          mode,
+                                          batch_rows,
+                                          pandas_options)
 
-    def _translate_stream_reader(self, reader: FlightStreamReader, mode: str):
+    def query_schema(self, query: str, language: str, database: str, **kwargs) -> pa.Schema:
+        """Return the schema of the query result without reading the result.
+
+        The SQL ``SELECT`` query is executed as ``SELECT * FROM (query) LIMIT 0``, so the server only plans it.
+        The query is wrapped on its own lines, so it can end with a ``--`` comment. Of the other queries,
+        and of all queries with ``limit_zero=False``, only the schema is read from the stream and the rest
+        of the stream is cancelled.
+        With the ``schema_cache`` of the client the schemas are cached by the database, language and query text.
+
+        :param query: The query to execute on the database.
+        :param language: The query language.
+        :param database: The database to query from.
+        :param kwargs: Additional arguments to pass to the ``FlightCallOptions headers``.
+        :keyword query_parameters: The query parameters to use in the query.
+        :keyword use_cache: Set to ``False`` to bypass the schema cache for this call.
+        :keyword cache_ttl: The time-to-live in seconds of the cached schema, defaults to the ``ttl`` of the cache.
+        :keyword limit_zero: Set to ``False`` to execute the query as is, e.g. if the query can't be a subquery
+                             because of the duplicate output column names of a join. Used by ``mode="schema"``.
+        :return: The schema of the query result.
+        """
+        use_cache = kwargs.pop("use_cache", True) and self._schema_cache is not None
+        cache_ttl = kwargs.pop("cache_ttl", None)
+        limit_zero = kwargs.pop("limit_zero", True)
+        key = QueryCache.key(database, language, query)
+        if use_cache:
+            schema = self._schema_cache.get(key)
+            if schema is not None:
+                return schema
+
+        if limit_zero and language == "sql" and _SELECT_QUERY.match(query):
+            query = f"SELECT * FROM (\n{query.strip().rstrip(';')}\n) AS schema_query LIMIT 0"
+        ticket, _options = self._prepare_query(query, language, database, **kwargs)
+        reader = self._do_get(ticket, _options)
+        try:
+            schema = reader.schema
+        finally:
+            reader.cancel()
+
+        if use_cache:
+            self._schema_cache.put(key, schema, cache_ttl)
+        return schema
+
+    def query_stream_async(self, query: str, language: str, mode: str, database: str, max_buffered: int = 2,
+                           **kwargs) -> AsyncRecordBatchIterator:
+        """Query data from InfluxDB and iterate over the result asynchronously batch by batch.
+
+        The stream is read by a dedicated bounded pool of threads, the batches are handed over to the event loop
+        through a queue of ``max_buffered`` batches, so the first batch is available as soon as it is received
+        and a slow consumer pauses the reading.
+
+        :param query: The query to execute on the database.
+        :param language: The query language.
+        :param mode: The mode to use for the query. It should be one of "batches", "pandas_batches" or
+                     "polars_batches".
+        :param database: The database to query from.
+        :param max_buffered: The maximum number of batches read ahead of the consumer.
+        :param kwargs: Additional arguments to pass to the ``FlightCallOptions headers``.
+        :keyword query_parameters: The query parameters to use in the query.
+        :keyword batch_rows: The number of rows of the batches, defaults to the batches as received from the server.
+        :keyword use_cache: Set to ``False`` to bypass the query cache for this call.
+        :return: The asynchronous iterator, the query is executed by its first iteration.
+        """
+        if mode not in BATCH_MODES:
+            raise ValueError(f"Unsupported mode '{mode}' of streaming query, use one of {BATCH_MODES}")
+
+        def open_iterator():
+            return self.query(query, language, mode, database, **kwargs)
+
+        return AsyncRecordBatchIterator(open_iterator, self._get_stream_executor(), max_buffered)
+
+    def _get_stream_executor(self) -> ThreadPoolExecutor:
+        with self._stream_executor_lock:
+            if self._stream_executor is None:
+                self._stream_executor = ThreadPoolExecutor(max_workers=self._stream_workers,
+                                                           thread_name_prefix="influxdb-query-stream")
+            return self._stream_executor
+
+    def query_many(self, queries: Iterable[Union[str, dict]], language: str, mode: str, database: str,
+                   max_concurrency: int = 8, timeout: float = None, as_completed: bool = False,
+                   **kwargs) -> Union[List[QueryResult], Iterator[QueryResult]]:
+        """Execute the queries concurrently over the Flight connection of the client.
+
+        The failure of one query doesn't affect the others, the error is captured in its :class:`QueryResult`.
+
+        :param queries: The queries as ``str`` or ``dict`` of the :meth:`query` arguments overriding the defaults,
+                        e.g. ``{"query": "SELECT * FROM cpu WHERE host=$host", "query_parameters": {"host": "a"}}``.
+        :param language: The default query language.
+        :param mode: The default mode of the results.
+        :param database: The default database.
+        :param max_concurrency: The maximum number of queries executed at the same time.
+        :param timeout: The timeout of each query in seconds, defaults to the timeout of the client.
+        :param as_completed: Return the iterator of results in the order of completion instead of the list of
+                             results in the order of ``queries``.
+        :param kwargs: Additional arguments of all queries passed to the ``FlightCallOptions headers``.
+        :return: The results of the queries.
+        """
+        if max_concurrency <= 0:
+            raise ValueError(f"max_concurrency must be positive, not {max_concurrency}")
+        specs = [self._query_spec(query, language, mode, database, timeout, kwargs) for query in queries]
+
+        def run(index, spec):
+            try:
+                return QueryResult(index, spec["query"], self.query(**spec))
+            except Exception as e:
+                return QueryResult(index, spec["query"], error=e)
+
+        if not specs:
+            return iter(()) if as_completed else []
+        executor = ThreadPoolExecutor(max_workers=min(max_concurrency, len(specs)),
+                                      thread_name_prefix="influxdb-query-many")
+        futures = [executor.submit(run, index, spec) for index, spec in enumerate(specs)]
+        # the submitted queries are executed, the threads exit when done
+        executor.shutdown(wait=False)
+        if as_completed:
+            return (future.result() for future in futures_as_completed(futures))
+        return [future.result() for future in futures]
+
+    async def query_many_async(self, queries: Iterable[Union[str, dict]], language: str, mode: str, database: str,
+                               max_concurrency: int = 8, timeout: float = None, as_completed: bool = False,
+                               **kwargs) -> AsyncIterator[QueryResult]:
+        """Execute the queries concurrently and yield the results asynchronously.
+
+        The arguments are the same as of :meth:`query_many`. The results are yielded in the order of ``queries``
+        as soon as all previous queries are completed or in the order of completion if ``as_completed`` is ``True``.
+        """
+        if max_concurrency <= 0:
+            raise ValueError(f"max_concurrency must be positive, not {max_concurrency}")
+        specs = [self._query_spec(query, language, mode, database, timeout, kwargs) for query in queries]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(index, spec):
+            async with semaphore:
+                try:
+                    return QueryResult(index, spec["query"], await self.query_async(**spec))
+                except Exception as e:
+                    return QueryResult(index, spec["query"], error=e)
+
+        tasks = [asyncio.ensure_future(run(index, spec)) for index, spec in enumerate(specs)]
+        try:
+            for task in (asyncio.as_completed(tasks) if as_completed else tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _query_spec(query: Union[str, dict], language: str, mode: str, database: str, timeout: Optional[float],
+                    kwargs: dict) -> dict:
+        spec = {**kwargs, "language": language, "mode": mode, "database": database}
+        if timeout is not None:
+            spec["timeout"] = timeout
+        spec.update({"query": query} if isinstance(query, str) else query)
+        if "query" not in spec:
+            raise ValueError(f"The query is missing in {query}")
+        return spec
+
+    def query_time_range(self, query: str, language: str, mode: str, database: str,
+                         start: Union[datetime, int], end: Union[datetime, int, None] = None,
+                         bucket_size: Union[timedelta, int] = timedelta(minutes=5), time_column: str = "time",
+                         start_parameter: str = "start", end_parameter: str = "end", **kwargs):
+        """Query data from InfluxDB for the time range, the closed time buckets are cached and fetched only once.
+
+        The time range is passed to the query as the ``$start`` and ``$end`` query parameters formatted as RFC3339,
+        e.g. ``SELECT * FROM cpu WHERE time >= $start AND time < $end``. The range is split into the epoch aligned
+        buckets of ``bucket_size``, only the buckets which are not in the query cache are fetched - consecutive
+        buckets by one query. The newest bucket which is still open is always fetched again and never cached.
+        The result is stitched from the buckets and trimmed to the range by the ``time_column``.
+
+        :param query: The query to execute on the database, it has to select the rows of the ``$start``, ``$end``
+                      range including the ``time_column``.
+        :param language: The query language.
+        :param mode: The mode to use for the query.
+                     It should be one of "all", "pandas", "polars", "chunk", "reader" or "schema".
+        :param database: The database to query from.
+        :param start: The inclusive start of the range as ``datetime`` (naive is UTC) or nanoseconds since epoch.
+        :param end: The exclusive end of the range, defaults to now.
+        :param bucket_size: The size of cached time buckets as ``timedelta`` or nanoseconds.
+        :param time_column: The column containing the time of the rows.
+        :param start_parameter: The name of the query parameter with the start of the range.
+        :param end_parameter: The name of the query parameter with the end of the range.
+        :param kwargs: Additional arguments to pass to the ``FlightCallOptions headers``.
+        :keyword query_parameters: The additional query parameters to use in the query.
+        :keyword use_cache: Set to ``False`` to bypass the query cache for this call.
+        :keyword cache_ttl: The time-to-live in seconds of the cached buckets, defaults to the ``ttl`` of the cache.
+        :keyword pandas_options: The :class:`PandasOptions` of the ``pandas`` and ``pandas_batches`` modes.
+        :return: The query result in the specified mode.
+        """
+        now = _to_nanoseconds(self._now())
+        start = _to_nanoseconds(start)
+        end = now if end is None else _to_nanoseconds(end)
+        size = _to_nanoseconds(bucket_size)
+        if size <= 0:
+            raise ValueError(f"bucket_size must be positive, not {bucket_size}")
+        if end <= start:
+            raise ValueError(f"The end of the time range {end} has to be after its start {start}")
+
+        batch_rows = kwargs.pop("batch_rows", None)
+        pandas_options = kwargs.pop("pandas_options", None)
+        cache_key, cache_ttl = self._cache_key(query, language, database, kwargs)
+        parameters = dict(kwargs.pop("query_parameters", None) or {})
+
+        def fetch(range_start, range_end):
+            range_parameters = {**parameters, start_parameter: _to_rfc3339(range_start),
+                                end_parameter: _to_rfc3339(range_end)}
+            ticket, _options = self._prepare_query(query, language, database, query_parameters=range_parameters,
+                                                   **kwargs)
+            return self._do_get(ticket, _options).read_all()
+
+        if cache_key is None:
+            return self._translate_table(fetch(start, end), mode, batch_rows, pandas_options, owned=True)
+
+        buckets = _time_buckets(start, end, size)
+        tables = [None] * len(buckets)
+        runs = []
+        for index, (bucket_start, bucket_end) in enumerate(buckets):
+            if bucket_end <= now:
+                tables[index] = self._query_cache.get((cache_key, size, bucket_start))
+            if tables[index] is not None:
+                continue
+            if runs and runs[-1][-1] == index - 1:
+                runs[-1].append(index)
+            else:
+                runs.append([index])
+
+        for run in runs:
+            table = fetch(buckets[run[0]][0], buckets[run[-1]][1])
+            for index in run:
+                bucket_start, bucket_end = buckets[index]
+                tables[index] = table if len(run) == 1 else _slice_time(table, time_column, bucket_start, bucket_end)
+                if bucket_end <= now:
+                    self._query_cache.put((cache_key, size, bucket_start), tables[index], cache_ttl)
+
+        return self._translate_table(_slice_time(_concat_tables(tables), time_column, start, end), mode, batch_rows,
+                                     pandas_options)
+
+    def query_partitioned(self, query: str, language: str, mode: str, database: str,
+                          start: Union[datetime, int, None] = None, end: Union[datetime, int, None] = None,
+                          partitions: int = 4, partition_parameters: Optional[List[dict]] = None,
+                          time_column: str = "time", order_by_time: bool = False, start_parameter: str = "start",
+                          end_parameter: str = "end", max_concurrency: Optional[int] = None, **kwargs):
+        """Split the query into disjoint partitions, execute them concurrently and merge the results.
+
+        By default the ``[start, end)`` time range is split into ``partitions`` equal sub-ranges passed to the query
+        as the ``$start`` and ``$end`` query parameters, e.g. ``SELECT * FROM cpu WHERE time >= $start AND
+        time < $end``. Alternatively each of ``partition_parameters`` defines the query parameters of one partition,
+        e.g. disjoint sets of tag values. The partitions have to select disjoint rows.
+
+        :param query: The query to execute on the database.
+        :param language: The query language.
+        :param mode: The mode to use for the query.
+                     It should be one of "all", "pandas", "polars", "chunk", "reader" or "schema".
+        :param database: The database to query from.
+        :param start: The inclusive start of the range as ``datetime`` (naive is UTC) or nanoseconds since epoch.
+        :param end: The exclusive end of the range, defaults to now.
+        :param partitions: The number of the time sub-ranges.
+        :param partition_parameters: The query parameters of each partition, the time range is not split if set.
+        :param time_column: The column containing the time of the rows.
+        :param order_by_time: Merge the results ordered by the ``time_column`` instead of concatenating them
+                              in the order of the partitions.
+        :param start_parameter: The name of the query parameter with the start of the sub-range.
+        :param end_parameter: The name of the query parameter with the end of the sub-range.
+        :param max_concurrency: The maximum number of partitions executed at the same time, defaults to all.
+        :param kwargs: Additional arguments to pass to the ``FlightCallOptions headers``.
+        :keyword query_parameters: The query parameters common to all partitions.
+        :keyword pandas_options: The :class:`PandasOptions` of the ``pandas`` and ``pandas_batches`` modes.
+        :return: The query result in the specified mode.
+        """
+        batch_rows = kwargs.pop("batch_rows", None)
+        pandas_options = kwargs.pop("pandas_options", None)
+        parameters = dict(kwargs.pop("query_parameters", None) or {})
+        if partition_parameters is None:
+            if start is None:
+                raise ValueError("The start of the time range is required to partition the query by time")
+            if partitions <= 0:
+                raise ValueError(f"partitions must be positive, not {partitions}")
+            start = _to_nanoseconds(start)
+            end = _to_nanoseconds(self._now() if end is None else end)
+            if end <= start:
+                raise ValueError(f"The end of the time range {end} has to be after its start {start}")
+            bounds = [start + (end - start) * index // partitions for index in range(partitions + 1)]
+            partition_parameters = [{start_parameter: _to_rfc3339(range_start), end_parameter: _to_rfc3339(range_end)}
+                                    for range_start, range_end in zip(bounds, bounds[1:]) if range_start < range_end]
+        if not partition_parameters:
+            raise ValueError("partition_parameters must not be empty")
+
+        specs = [{"query": query, "query_parameters": {**parameters, **partition}}
+                 for partition in partition_parameters]
+        results = self.query_many(specs, language=language, mode="all", database=database,
+                                  max_concurrency=max_concurrency or len(specs), **kwargs)
+        for result in results:
+            if not result.ok:
+                raise result.error
+
+        tables = [result.result for result in results]
+        table = _merge_by_time(tables, time_column) if order_by_time else _concat_tables(tables)
+        # the partitions can be shared with the query cache or the coalesced queries
+        owned = self._query_cache is None and self._single_flight is None
+        return self._translate_table(table, mode, batch_rows, pandas_options, owned)
+
+    def _translate_stream_reader(self, reader: FlightStreamReader, mode: str, batch_rows: Optional[int] = None,
+                                 pandas_options: Optional[PandasOptions] = None):
         from influxdb_client_3 import polars as has_polars
+        if mode in BATCH_MODES:
+            return to_batch_iterator(reader, mode, batch_rows, pandas_options)
         try:
             mode_funcs = {
                 "all": reader.read_all,
@@ -257,12 +745,56 @@ class QueryApi(object):
             if has_polars:
                 import polars as pl
                 mode_funcs["polars"] = lambda: pl.from_arrow(reader.read_all())
+            if pandas_options is not None:
+                mode_funcs["pandas"] = lambda: pandas_options.to_pandas(reader.read_all())
             mode_func = mode_funcs.get(mode, reader.read_all)
 
             return mode_func() if callable(mode_func) else mode_func
         except Exception as e:
             raise e
 
+    @staticmethod
+    def _translate_table(table: pa.Table, mode: str, batch_rows: Optional[int] = None,
+                         pandas_options: Optional[PandasOptions] = None, owned: bool = False):
+        """Translate the cached table into the query result in the specified mode.
+
+        The table which is not ``owned`` can be shared, its buffers are not released by the pandas conversion.
+        """
+        if mode in BATCH_MODES:
+            return to_batch_iterator(_TableStreamReader(table), mode, batch_rows, pandas_options)
+        if mode == "pandas":
+            return table.to_pandas() if pandas_options is None else pandas_options.to_pandas(table, owned)
+        if mode == "polars":
+            from influxdb_client_3 import polars as has_polars
+            if has_polars:
+                import polars as pl
+                return pl.from_arrow(table)
+        if mode == "chunk":
+            return _TableStreamReader(table)
+        if mode == "reader":
+            return pa.RecordBatchReader.from_batches(table.schema, table.to_batches())
+        if mode == "schema":
+            return table.schema
+        return table
+
+    def _cache_key(self, query: str, language: str, database: str, kwargs: dict):
+        """Pop the cache arguments from ``kwargs``, return the cache key (``None`` if not cached) and ttl."""
+        use_cache = kwargs.pop("use_cache", True)
+        cache_ttl = kwargs.pop("cache_ttl", None)
+        if self._query_cache is None or not use_cache:
+            return None, None
+        return QueryCache.key(database, language, query, kwargs.get("query_parameters")), cache_ttl
+
+    def _flight_key(self, query: str, language: str, mode: str, database: str, kwargs: dict):
+        """Pop the coalesce argument from ``kwargs``, return the key of the coalesced query or ``None``."""
+        coalesce = kwargs.pop("coalesce", True)
+        # the batch modes stream the result, it is not read into one table
+        if self._single_flight is None or not coalesce or mode in BATCH_MODES:
+            return None
+        call_options = {key: value for key, value in kwargs.items() if key != "query_parameters"}
+        return (QueryCache.key(database, language, query, kwargs.get("query_parameters")),
+                json.dumps(call_options, sort_keys=True, default=str))
+
     def _prepare_query(self, query: str, language: str, database: str, **kwargs):
         from influxdb_client_3 import _merge_options as merge_options
         # Create an authorization header
@@ -290,9 +822,50 @@ class QueryApi(object):
 
         return ticket, _options
 
+    @staticmethod
+    def _now() -> datetime:
+        return datetime.now(timezone.utc)
+
     def _do_get(self, ticket: Ticket, options: FlightCallOptions = None) -> FlightStreamReader:
-        return self._flight_client.do_get(ticket, options)
+        return self._flight_pool.do_get(ticket, options)
 
     def close(self):
-        """Close the Flight client."""
-        self._flight_client.close()
+        """Close the Flight clients."""
+        if self._stream_executor is not None:
+            self._stream_executor.shutdown(wait=False)
+        self._flight_pool.close()
+
+
+class _TableStreamChunk(NamedTuple):
+    data: pa.RecordBatch
+    app_metadata: Optional[pa.Buffer] = None
+
+
+class _TableStreamReader(object):
+    """Reader of the cached table with the interface of :class:`pyarrow.flight.FlightStreamReader`."""
+
+    def __init__(self, table: pa.Table):
+        self._table = table
+        self._batches = iter(table.to_batches())
+
+    @property
+    def schema(self) -> pa.Schema:
+        return self._table.schema
+
+    def read_chunk(self) -> _TableStreamChunk:
+        return _TableStreamChunk(next(self._batches))
+
+    def __iter__(self):
+        return (_TableStreamChunk(batch) for batch in self._batches)
+
+    def read_all(self) -> pa.Table:
+        return pa.Table.from_batches(list(self._batches), schema=self._table.schema)
+
+    def read_pandas(self, **options):
+        return self.read_all().to_pandas(**options)
+
+    def to_reader(self) -> pa.RecordBatchReader:
+        return pa.RecordBatchReader.from_batches(self._table.schema, self._batches)
+
+    def cancel(self):
+        self._batches = iter(())
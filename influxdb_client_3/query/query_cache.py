@@ -0,0 +1,319 @@
+"""Cache of query results stored as Arrow tables."""
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Hashable, List, NamedTuple, Optional, Tuple, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class QueryCacheStats(NamedTuple):
+    """Statistics of the :class:`QueryCache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    size_bytes: int
+
+
+class SchemaCacheStats(NamedTuple):
+    """Statistics of the :class:`SchemaCache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+
+
+class _CacheEntry(NamedTuple):
+    value: object
+    size: int
+    expires_at: float
+
+
+class _LruCache(object):
+    """Thread-safe LRU cache of the entries expiring after ``ttl`` seconds, bounded by the total size of the entries."""
+
+    def __init__(self, max_size: int, ttl: float):
+        if ttl is None or ttl <= 0:
+            raise ValueError(f"ttl must be positive, not {ttl}")
+        self.ttl = ttl
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(database: str, language: str, query: str, query_parameters: Optional[dict] = None) -> Hashable:
+        """Return the cache key of the query."""
+        parameters = json.dumps(query_parameters, sort_keys=True, default=str) if query_parameters else None
+        return database, language, query, parameters
+
+    def _get(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self._clock():
+                self._remove(key)
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def _put(self, key: Hashable, value, size: int, ttl: Optional[float]) -> bool:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self._max_size:
+                return False
+            while self._entries and self._size + size > self._max_size:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+            self._entries[key] = _CacheEntry(value, size, self._clock() + (ttl or self.ttl))
+            self._size += size
+            return True
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove the entry from the cache."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all entries, the statistics are kept."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._size -= entry.size
+
+    @staticmethod
+    def _clock():
+        return time.monotonic()
+
+
+class QueryCache(_LruCache):
+    """
+    Thread-safe LRU cache of query results.
+
+    The results are stored as immutable :class:`pyarrow.Table` and every query mode is served from the cached table.
+    The entries are evicted in least-recently-used order when the total size of the tables exceeds ``max_bytes``
+    and they expire ``ttl`` seconds after they were stored.
+
+    Example:
+        .. code-block:: python
+
+            from influxdb_client_3 import InfluxDBClient3, QueryCache
+
+            cache = QueryCache(max_bytes=256 * 1024 * 1024, ttl=10)
+            client = InfluxDBClient3(host="http://localhost:8181", token="my-token", database="my-db",
+                                     query_cache=cache)
+
+            df = client.query("SELECT * FROM cpu WHERE time > now() - INTERVAL '1 hour'", mode="pandas")
+            df = client.query("SELECT * FROM cpu", mode="pandas", use_cache=False)  # bypass the cache
+            print(cache.stats())
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 60.0):
+        """
+        Initialize the cache.
+
+        :param max_bytes: the maximum total size of the cached Arrow tables in bytes,
+                          a larger result is not cached at all
+        :param ttl: the default time-to-live of an entry in seconds
+        """
+        if max_bytes is None or max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, not {max_bytes}")
+        super().__init__(max_size=max_bytes, ttl=ttl)
+        self.max_bytes = max_bytes
+
+    def get(self, key: Hashable) -> Optional[pa.Table]:
+        """
+        Return the cached table and mark it as recently used.
+
+        :return: the table or ``None`` if the key is not cached or the entry expired
+        """
+        return self._get(key)
+
+    def put(self, key: Hashable, table: pa.Table, ttl: Optional[float] = None) -> bool:
+        """
+        Store the table.
+
+        :param key: the cache key, see :meth:`key`
+        :param table: the query result
+        :param ttl: the time-to-live of the entry in seconds, defaults to the ``ttl`` of the cache
+        :return: ``True`` if the table was stored, ``False`` if it is larger than ``max_bytes``
+        """
+        return self._put(key, table, table.nbytes, ttl)
+
+    def stats(self) -> QueryCacheStats:
+        """Return the statistics of the cache."""
+        with self._lock:
+            return QueryCacheStats(hits=self._hits, misses=self._misses, evictions=self._evictions,
+                                   expirations=self._expirations, entries=len(self._entries), size_bytes=self._size)
+
+
+class SchemaCache(_LruCache):
+    """
+    Thread-safe LRU cache of the schemas of query results.
+
+    The entries are evicted in least-recently-used order when the cache holds ``max_entries`` schemas.
+    The schema of a measurement changes when a new field or tag is written, the entries expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 60.0):
+        """
+        Initialize the cache.
+
+        :param max_entries: the maximum number of cached schemas
+        :param ttl: the default time-to-live of an entry in seconds
+        """
+        if max_entries is None or max_entries <= 0:
+            raise ValueError(f"max_entries must be positive, not {max_entries}")
+        super().__init__(max_size=max_entries, ttl=ttl)
+        self.max_entries = max_entries
+
+    def get(self, key: Hashable) -> Optional[pa.Schema]:
+        """
+        Return the cached schema and mark it as recently used.
+
+        :return: the schema or ``None`` if the key is not cached or the entry expired
+        """
+        return self._get(key)
+
+    def put(self, key: Hashable, schema: pa.Schema, ttl: Optional[float] = None) -> None:
+        """
+        Store the schema.
+
+        :param key: the cache key, see :meth:`key`
+        :param schema: the schema of the query result
+        :param ttl: the time-to-live of the entry in seconds, defaults to the ``ttl`` of the cache
+        """
+        self._put(key, schema, 1, ttl)
+
+    def stats(self) -> SchemaCacheStats:
+        """Return the statistics of the cache."""
+        with self._lock:
+            return SchemaCacheStats(hits=self._hits, misses=self._misses, evictions=self._evictions,
+                                    expirations=self._expirations, entries=len(self._entries))
+
+
+def _to_nanoseconds(value: Union[datetime, timedelta, int]) -> int:
+    """Convert the datetime (naive is UTC), timedelta or integer nanoseconds into nanoseconds."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        value = value - _EPOCH
+    if isinstance(value, timedelta):
+        return (value.days * 86_400 + value.seconds) * 1_000_000_000 + value.microseconds * 1_000
+    return int(value)
+
+
+def _to_rfc3339(nanoseconds: int) -> str:
+    """Format the nanoseconds since epoch as RFC3339 string used as query parameter."""
+    value = _EPOCH + timedelta(microseconds=nanoseconds // 1_000)
+    fraction = nanoseconds % 1_000_000_000
+    text = value.strftime('%Y-%m-%dT%H:%M:%S')
+    return f"{text}.{fraction:09d}Z" if fraction else f"{text}Z"
+
+
+def _time_buckets(start: int, end: int, size: int) -> List[Tuple[int, int]]:
+    """Return the ``[start, end)`` boundaries of the epoch aligned buckets covering ``[start, end)``."""
+    first = start - start % size
+    return [(bucket, bucket + size) for bucket in range(first, end, size)]
+
+
+def _time_values(table: pa.Table, time_column: str) -> pa.ChunkedArray:
+    """Return the values of the time column as nanoseconds."""
+    column = table.column(time_column)
+    if pa.types.is_timestamp(column.type):
+        column = pc.cast(column, pa.timestamp('ns', column.type.tz))
+    return pc.cast(column, pa.int64())
+
+
+def _slice_time(table: pa.Table, time_column: str, start: int, end: int) -> pa.Table:
+    """Return the rows of the table with time in ``[start, end)``."""
+    if table.num_rows == 0:
+        return table
+    values = _time_values(table, time_column)
+    return table.filter(pc.and_(pc.greater_equal(values, start), pc.less(values, end)))
+
+
+def _concat_tables(tables: List[pa.Table]) -> pa.Table:
+    """
+    Concatenate the tables, the empty tables can have a different schema.
+
+    The schemas are unified by the column names, e.g. a field missing in one of the tables is filled with nulls.
+    """
+    non_empty = [table for table in tables if table.num_rows > 0]
+    if not non_empty:
+        return tables[0]
+    if len(non_empty) == 1:
+        return non_empty[0]
+    try:
+        return pa.concat_tables(non_empty, promote_options="default")
+    except TypeError:
+        # pyarrow < 14
+        return pa.concat_tables(non_empty, promote=True)
+
+
+def _merge_by_time(tables: List[pa.Table], time_column: str) -> pa.Table:
+    """
+    Merge the tables into one ordered by time, the rows of the same time keep the order of the tables.
+
+    The tables are grouped into the runs of the overlapping time ranges and the runs are concatenated in time order.
+    Only the rows of the run of several tables or of an unordered table are sorted, so the disjoint time partitions
+    are merged without sorting, whatever their order.
+    """
+    ranges = []
+    for index, table in enumerate(tables):
+        if table.num_rows > 0:
+            values = _time_values(table, time_column)
+            bounds = pc.min_max(values)
+            ranges.append((bounds["min"].as_py(), bounds["max"].as_py(), index, values))
+    if not ranges:
+        return _concat_tables(tables)
+
+    runs = []
+    for range_min, range_max, index, values in sorted(ranges, key=lambda item: (item[0], item[2])):
+        if runs and range_min <= runs[-1][0]:
+            runs[-1][0] = max(runs[-1][0], range_max)
+            runs[-1][1].append((index, values))
+        else:
+            runs.append([range_max, [(index, values)]])
+
+    merged = []
+    for _, members in runs:
+        members.sort(key=lambda member: member[0])
+        table = _concat_tables([tables[index] for index, _ in members])
+        values = members[0][1] if len(members) == 1 else _time_values(table, time_column)
+        if not _is_ordered(values):
+            # the sort is stable, the rows of the same time keep the order of the tables
+            table = table.take(pc.sort_indices(values))
+        merged.append(table)
+    return _concat_tables(merged)
+
+
+def _is_ordered(values: pa.ChunkedArray) -> bool:
+    return len(values) < 2 or pc.all(pc.greater_equal(values[1:], values[:-1])).as_py()
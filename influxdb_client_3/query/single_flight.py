@@ -0,0 +1,96 @@
+"""Coalescing of identical concurrent calls."""
+import asyncio
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, Hashable, Set, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight(object):
+    """
+    Execute only one call of the same key at a time, the concurrent callers of the key wait and share its result.
+
+    The synchronous and asynchronous callers of the same key share the same call. A result is shared only while
+    the call is in flight, the next call of the key after its completion is executed again.
+    """
+
+    def __init__(self):
+        """Initialize the group of calls."""
+        self._calls: Dict[Hashable, Future] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self.shared = 0
+        """The number of calls served by the result of another call."""
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Execute ``fn`` or wait for the result of the call of the same ``key`` in flight.
+
+        :param key: the identity of the call
+        :param fn: the function executing the call
+        :return: the result of the call, the error of the call is raised by all waiting callers
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        with self._complete(key, future):
+            result = fn()
+            if not future.done():
+                future.set_result(result)
+        return result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await ``fn`` or the result of the call of the same ``key`` in flight.
+
+        The call runs in its own task, the cancellation of a waiting caller, including the one which started
+        the call, doesn't cancel the call for the others.
+
+        :param key: the identity of the call
+        :param fn: the coroutine function executing the call
+        :return: the result of the call, the error of the call is raised by all waiting callers
+        """
+        future, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(self._run(key, future, fn))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def __len__(self):
+        """Return the number of calls in flight."""
+        return len(self._calls)
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = self._calls[key] = Future()
+            return future, True
+
+    async def _run(self, key: Hashable, future: Future, fn: Callable[[], Awaitable[T]]):
+        """Await the call and pass its outcome to the waiting callers, the outcome is not raised by the task."""
+        try:
+            future.set_result(await fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    @contextmanager
+    def _complete(self, key: Hashable, future: Future):
+        """Pass the error of the call to the waiting callers and remove the call from the calls in flight."""
+        try:
+            yield
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
@@ -1,3 +1,5 @@
+import glob
+import gzip
 import os
 import pyarrow.csv as csv
 import pyarrow.feather as feather
@@ -8,6 +10,93 @@ if os.name != 'nt':
     import pyarrow.orc as orc
 
 
+LINE_PROTOCOL_FILE_EXTENSIONS = (".lp", ".txt", ".lp.gz")
+SUPPORTED_FILE_EXTENSIONS = (".feather", ".parquet", ".csv", ".json", ".orc") + LINE_PROTOCOL_FILE_EXTENSIONS
+# a .txt file is line protocol only if it is named explicitly, directories often contain notes or READMEs
+DISCOVERED_FILE_EXTENSIONS = tuple(extension for extension in SUPPORTED_FILE_EXTENSIONS if extension != ".txt")
+DEFAULT_MAX_BODY_BYTES = 8 * 1024 * 1024
+
+
+def resolve_files(file, exclude=()):
+    """
+    Resolve files to upload.
+
+    :param file: A file path, a glob pattern, a directory or a list of them. Directories are searched recursively
+                 for files with supported extensions, the directories and the glob patterns don't select
+                 ``.txt`` files, a ``.txt`` file is treated as line protocol only if its path is given.
+    :param exclude: The paths which are never uploaded, e.g. the manifest of the upload.
+    :return: The sorted list of file paths without duplicates.
+    :raises ValueError: If no file is found.
+    """
+    sources = [file] if isinstance(file, (str, os.PathLike)) else list(file)
+    excluded = {os.path.abspath(path) for path in exclude}
+    files = []
+    for source in sources:
+        source = os.fspath(source)
+        if os.path.isdir(source):
+            for root, _, names in os.walk(source):
+                files.extend(os.path.join(root, name) for name in names if name.endswith(DISCOVERED_FILE_EXTENSIONS))
+        elif glob.has_magic(source):
+            files.extend(path for path in glob.glob(source, recursive=True)
+                         if os.path.isfile(path) and path.endswith(DISCOVERED_FILE_EXTENSIONS))
+        else:
+            files.append(source)
+
+    files = [path for path in files if os.path.abspath(path) not in excluded]
+    if not files:
+        raise ValueError(f"No files found: {file}")
+    return sorted(set(files))
+
+
+def _gzip_larger_than(path, size) -> bool:
+    """
+    Return True if the decompressed content of the gzip file is larger than ``size``.
+
+    At most ``size + 1`` bytes are decompressed. The size in the gzip trailer is not used,
+    it is the size of the last member only and it overflows at 4 GiB.
+    """
+    remaining = size + 1
+    with gzip.open(path, "rb") as file:
+        while remaining > 0:
+            block = file.read(min(remaining, 1024 * 1024))
+            if not block:
+                return False
+            remaining -= len(block)
+    return True
+
+
+class UploadManifest:
+    """
+    Record of successfully uploaded files, used to resume an interrupted upload.
+
+    The manifest is a text file with the absolute path of one uploaded file per line.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize an UploadManifest instance and load the already uploaded files.
+
+        :param path: The path of the manifest file. The file is created if it doesn't exist.
+        :type path: str
+        """
+        self._path = path
+        self._completed = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as manifest:
+                self._completed = {line.rstrip("\n") for line in manifest if line.strip()}
+
+    def is_completed(self, file) -> bool:
+        """Return True if the file was already uploaded."""
+        return os.path.abspath(file) in self._completed
+
+    def mark_completed(self, file):
+        """Append the uploaded file to the manifest."""
+        path = os.path.abspath(file)
+        with open(self._path, "a", encoding="utf-8") as manifest:
+            manifest.write(path + "\n")
+        self._completed.add(path)
+
+
 class UploadFile:
     """
     Class for uploading and reading different types of files.
@@ -45,6 +134,94 @@ class UploadFile:
         else:
             raise ValueError("Unsupported file type")
 
+    def is_line_protocol(self) -> bool:
+        """Return True if the file contains line protocol."""
+        return self._file.endswith(LINE_PROTOCOL_FILE_EXTENSIONS)
+
+    def iter_line_protocol(self, max_body_bytes=DEFAULT_MAX_BODY_BYTES):
+        """
+        Read a line protocol file as a stream of request bodies.
+
+        The file is read in large blocks which are split on line boundaries, so every body has at most
+        ``max_body_bytes`` bytes (unless a single line is longer). A gzipped file whose decompressed content
+        is not larger than ``max_body_bytes`` is returned as is, the server decompresses it.
+
+        :param max_body_bytes: The maximum size of a body in bytes.
+        :type max_body_bytes: int
+        :return: An iterator of tuples ``(body, content_encoding)``, where ``content_encoding`` is ``'gzip'``
+                 for a compressed body and ``None`` otherwise.
+        :raises ValueError: If the file is not a line protocol file.
+        """
+        if not self.is_line_protocol():
+            raise ValueError("Unsupported file type")
+
+        if self._file.endswith(".gz"):
+            if os.path.getsize(self._file) <= max_body_bytes and not _gzip_larger_than(self._file, max_body_bytes):
+                with open(self._file, "rb") as file:
+                    yield file.read(), 'gzip'
+                return
+            opener = gzip.open
+        else:
+            opener = open
+
+        with opener(self._file, "rb") as file:
+            buffer = b''
+            while True:
+                # read the rest of a line longer than max_body_bytes by blocks of max_body_bytes
+                block = file.read(max_body_bytes - len(buffer) if len(buffer) < max_body_bytes else max_body_bytes)
+                if not block:
+                    if buffer.strip():
+                        yield buffer, None
+                    return
+                buffer += block
+                end = buffer.rfind(b'\n')
+                if end < 0:
+                    # a line longer than max_body_bytes
+                    continue
+                if buffer[:end].strip():
+                    yield buffer[:end], None
+                buffer = buffer[end + 1:]
+
+    def iter_batches(self, columns=None, row_filter=None, batch_size=None):
+        """
+        Read a file as a stream of record batches.
+
+        The file is scanned by :mod:`pyarrow.dataset`, so only one record batch at a time is held in memory.
+        The column projection and the row filter are pushed down to the file reader.
+        The ``file_parser_options`` are passed into the corresponding ``pyarrow.dataset.FileFormat``.
+
+        :param columns: The columns to read. If not specified, all columns are read.
+        :type columns: list
+        :param row_filter: The filter which selects the rows to read, e.g. ``pyarrow.dataset.field("temp") > 10``.
+        :type row_filter: pyarrow.dataset.Expression
+        :param batch_size: The maximum number of rows in a record batch.
+        :type batch_size: int
+        :return: An iterator of record batches.
+        :raises ValueError: If the file type is not supported.
+        """
+        import pyarrow.dataset as ds
+
+        if self._file.endswith(".feather"):
+            file_format = ds.IpcFileFormat(**self._kwargs)
+        elif self._file.endswith(".parquet"):
+            file_format = ds.ParquetFileFormat(**self._kwargs)
+        elif self._file.endswith(".csv"):
+            file_format = ds.CsvFileFormat(**self._kwargs)
+        elif self._file.endswith(".orc"):
+            if os.name == 'nt':
+                raise ValueError("Unsupported file type for this OS")
+            file_format = ds.OrcFileFormat(**self._kwargs)
+        elif self._file.endswith(".json"):
+            raise ValueError("Streaming is not supported for JSON files")
+        else:
+            raise ValueError("Unsupported file type")
+
+        scanner_options = {'columns': columns, 'filter': row_filter}
+        if batch_size is not None:
+            scanner_options['batch_size'] = batch_size
+
+        return ds.dataset(self._file, format=file_format).to_batches(**scanner_options)
+
     def load_feather(self, file):
         """
         Load a Feather file.
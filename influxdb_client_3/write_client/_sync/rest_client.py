@@ -10,6 +10,7 @@ import sys
 from typing import Dict
 from urllib.parse import urlencode
 
+from influxdb_client_3.write_client._sync.transport import Transport, Urllib3Transport
 from influxdb_client_3.write_client.write_exceptions import ApiException
 
 try:
@@ -56,8 +57,14 @@ class RestClient(object):
                  retries=False,
                  debug=False,
                  connection_pool_maxsize=multiprocessing.cpu_count() * 5,
+                 transport: Transport = None,
                  ):
-        """Initialize REST client."""
+        """
+        Initialize REST client.
+
+        :param transport: the transport which performs the HTTP requests,
+                          defaults to :class:`Urllib3Transport` configured by the other arguments
+        """
         # urllib3.PoolManager will pass all kw parameters to connectionpool
         # https://github.com/shazow/urllib3/blob/f9409436f83aeb79fbaf090181cd81b784f1b8ce/urllib3/poolmanager.py#L75  # noqa: E501
         # https://github.com/shazow/urllib3/blob/f9409436f83aeb79fbaf090181cd81b784f1b8ce/urllib3/connectionpool.py#L680  # noqa: E501
@@ -80,6 +87,8 @@ class RestClient(object):
         self.cert_key_password = cert_key_password
         self.debug = debug
         self.connection_pool_maxsize = connection_pool_maxsize
+        # URLs of requests with immutable (tuple) query parameters
+        self._urls = {}
 
         # cert_reqs
         if verify_ssl:
@@ -101,23 +110,10 @@ class RestClient(object):
             else:
                 maxsize = 4
 
-        # https pool manager
-        if proxy:
-            self.pool_manager = urllib3.ProxyManager(
-                num_pools=pools_size,
-                maxsize=maxsize,
-                cert_reqs=cert_reqs,
-                ca_certs=ca_certs,
-                cert_file=cert_file,
-                key_file=cert_key_file,
-                key_password=cert_key_password,
-                proxy_url=proxy,
+        if transport is None:
+            transport = Urllib3Transport(
+                proxy=proxy,
                 proxy_headers=proxy_headers,
-                ssl_context=ssl_context,
-                **addition_pool_args
-            )
-        else:
-            self.pool_manager = urllib3.PoolManager(
                 num_pools=pools_size,
                 maxsize=maxsize,
                 cert_reqs=cert_reqs,
@@ -128,6 +124,12 @@ class RestClient(object):
                 ssl_context=ssl_context,
                 **addition_pool_args
             )
+        self.transport = transport
+
+    @property
+    def pool_manager(self):
+        """The pool manager of the default transport."""
+        return getattr(self.transport, 'pool_manager', None)
 
     def request(self, method, path, query_params=None, headers=None,
                 body=None, timeout=None, **urlopen_kw):
@@ -146,9 +148,7 @@ class RestClient(object):
                            :meth:`urllib3.request.RequestMethods.request`
         """
 
-        url = self.base_url + path
-        if query_params:
-            url = url + '?' + urlencode(query_params)
+        url = self._url(path, query_params)
         merged_headers = {}
         if self.default_header:
             merged_headers.update(self.default_header)
@@ -163,7 +163,7 @@ class RestClient(object):
             RestClient.log_body(body, '>>>')
 
         try:
-            r = self.pool_manager.request(
+            r = self.transport.request(
                 method, url=url,
                 body=body,
                 headers=merged_headers,
@@ -175,7 +175,8 @@ class RestClient(object):
             raise ApiException(status=0, reason=msg)
 
         r = RESTResponse(r)
-        r.data = r.data.decode('utf8')
+        # 204 No Content - nothing to decode
+        r.data = r.data.decode('utf8') if r.status != 204 else ''
 
         if self.debug:
             RestClient.log_response(r.status)
@@ -190,6 +191,19 @@ class RestClient(object):
 
         return r
 
+    def _url(self, path, query_params):
+        if not query_params:
+            return self.base_url + path
+        if not isinstance(query_params, tuple):
+            return self.base_url + path + '?' + urlencode(query_params)
+        key = (path, query_params)
+        url = self._urls.get(key)
+        if url is None:
+            if len(self._urls) >= 128:
+                self._urls.clear()
+            url = self._urls[key] = self.base_url + path + '?' + urlencode(query_params)
+        return url
+
     @property
     def debug(self):
         """Debug status.
@@ -243,13 +257,14 @@ class RestClient(object):
             RestClient.logger.debug(f"{prefix} {key}: {value}")
 
     def close(self):
-        self.pool_manager.clear()
+        self.transport.close()
 
     def __getstate__(self):
         """Return a dict of attributes that you want to pickle."""
         state = self.__dict__.copy()
-        # Remove Pool manager
-        del state['pool_manager']
+        # Remove Pool manager, the default transport is created again
+        if isinstance(self.transport, Urllib3Transport):
+            del state['transport']
         return state
 
     def __setstate__(self, state):
@@ -272,5 +287,6 @@ class RestClient(object):
             cert_key_file=self.cert_key_file,
             cert_key_password=self.cert_key_password,
             debug=self.debug,
-            connection_pool_maxsize=self.connection_pool_maxsize
+            connection_pool_maxsize=self.connection_pool_maxsize,
+            transport=state.get('transport')
         )
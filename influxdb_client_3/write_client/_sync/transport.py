@@ -0,0 +1,165 @@
+# coding: utf-8
+"""
+HTTP transports used by the :class:`RestClient`.
+
+The transport performs the HTTP request, the :class:`RestClient` takes care about the URL, headers,
+logging and error handling. The default transport is based on ``urllib3``, the :class:`LoopbackTransport`
+keeps the requests in memory and can be used to benchmark and profile the write path without sockets.
+"""
+
+import abc
+import threading
+from typing import Callable, List, NamedTuple, Optional, Union
+
+import urllib3
+
+try:
+    from urllib3 import HTTPHeaderDict
+except ImportError:
+    # urllib3 1.26 has no public export of the case-insensitive dictionary
+    from urllib3._collections import HTTPHeaderDict
+
+
+class Transport(abc.ABC):
+    """Interface of the HTTP transport."""
+
+    @abc.abstractmethod
+    def request(self, method, url, body=None, headers=None, timeout=None, **urlopen_kw):
+        """
+        Perform the HTTP request.
+
+        :param method: http request method
+        :param url: absolute url of the request including the query string
+        :param body: request body
+        :param headers: http request headers
+        :param timeout: timeout setting for this request as :class:`urllib3.Timeout`
+        :param urlopen_kw: additional parameters, e.g. ``retries``
+        :return: response with the ``status``, ``reason``, ``data`` (``bytes``) and ``headers`` attributes
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """Release resources of the transport."""
+        pass
+
+
+class Urllib3Transport(Transport):
+    """The default transport based on :class:`urllib3.PoolManager` or :class:`urllib3.ProxyManager`."""
+
+    def __init__(self, proxy=None, proxy_headers=None, **pool_kwargs):
+        """
+        Initialize the pool manager.
+
+        :param proxy: the url of the http proxy
+        :param proxy_headers: headers sent to the proxy
+        :param pool_kwargs: arguments passed to the pool manager
+        """
+        if proxy:
+            self.pool_manager = urllib3.ProxyManager(proxy_url=proxy, proxy_headers=proxy_headers, **pool_kwargs)
+        else:
+            self.pool_manager = urllib3.PoolManager(**pool_kwargs)
+
+    def request(self, method, url, body=None, headers=None, timeout=None, **urlopen_kw):
+        """Perform the HTTP request by the pool manager."""
+        return self.pool_manager.request(method, url=url, body=body, headers=headers, timeout=timeout, **urlopen_kw)
+
+    def close(self):
+        """Close all pooled connections."""
+        self.pool_manager.clear()
+
+
+class LoopbackRequest(NamedTuple):
+    """The request recorded by the :class:`LoopbackTransport`."""
+
+    method: str
+    url: str
+    headers: dict
+    body: Optional[Union[bytes, str]]
+    timeout: Optional[urllib3.Timeout]
+
+
+class LoopbackResponse(object):
+    """The response returned by the :class:`LoopbackTransport`."""
+
+    def __init__(self, status=204, reason=None, data=b'', headers=None):
+        """Initialize the response."""
+        self.status = status
+        self.reason = reason if reason is not None else ('No Content' if status == 204 else '')
+        self.data = data if isinstance(data, bytes) else data.encode('utf-8')
+        self.headers = HTTPHeaderDict(headers or {})
+
+    def getheader(self, name, default=None):
+        """Return a given response header."""
+        return self.headers.get(name, default)
+
+    def getheaders(self):
+        """Return the response headers."""
+        return self.headers
+
+
+class LoopbackTransport(Transport):
+    """
+    In-memory transport which records the requests and returns the configured responses.
+
+    Example:
+        .. code-block:: python
+
+            from influxdb_client_3 import InfluxDBClient3
+            from influxdb_client_3.write_client._sync.transport import LoopbackTransport
+
+            transport = LoopbackTransport()
+            with InfluxDBClient3(host="http://localhost:8181", token="my-token", database="my-db",
+                                 transport=transport) as client:
+                client.write("mem,tag=a value=1i")
+
+            print(transport.requests[0].body)
+    """
+
+    def __init__(self,
+                 responses: Union[None, LoopbackResponse, List[LoopbackResponse],
+                                  Callable[[LoopbackRequest], LoopbackResponse]] = None,
+                 record: bool = True):
+        """
+        Initialize the transport.
+
+        :param responses: the response returned for every request, the list of responses returned in order
+                          (the last one is repeated) or the function which creates the response for the request.
+                          Defaults to ``204 No Content``.
+        :param record: if ``False`` the requests are only counted, useful for long running benchmarks
+        """
+        self.responses = responses if responses is not None else LoopbackResponse()
+        self.record = record
+        self.requests: List[LoopbackRequest] = []
+        self.request_count = 0
+        self._lock = threading.Lock()
+
+    def request(self, method, url, body=None, headers=None, timeout=None, **urlopen_kw):
+        """Record the request and return the configured response."""
+        request = LoopbackRequest(method=method, url=url, headers=dict(headers or {}), body=body, timeout=timeout)
+        with self._lock:
+            index = self.request_count
+            self.request_count += 1
+            if self.record:
+                self.requests.append(request)
+        if callable(self.responses):
+            return self.responses(request)
+        if isinstance(self.responses, list):
+            return self.responses[min(index, len(self.responses) - 1)]
+        return self.responses
+
+    def clear(self):
+        """Forget all recorded requests."""
+        with self._lock:
+            self.requests = []
+            self.request_count = 0
+
+    def __getstate__(self):
+        """Return a dict of attributes that you want to pickle."""
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        """Set your object with the provided dict."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
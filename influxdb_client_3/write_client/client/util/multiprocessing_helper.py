@@ -4,9 +4,14 @@ Helpers classes to make easier use the client in multiprocessing environment.
 For more information how the multiprocessing works see Python's
 `reference docs <https://docs.python.org/3/library/multiprocessing.html>`_.
 """
+import glob
 import logging
 import multiprocessing
+import os
 import queue
+import tempfile
+import uuid
+import zlib
 
 from influxdb_client_3 import write_client_options
 from influxdb_client_3.exceptions import InfluxDBError
@@ -37,6 +42,110 @@ class _PoisonPill:
     pass
 
 
+def _shared_memory_dir() -> str:
+    """Directory backed by shared memory if available, otherwise the temporary directory."""
+    return '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+
+
+class _SharedArrowRecord:
+    """
+    Handle to a polars DataFrame or Arrow Table stored as an Arrow IPC file in the shared memory.
+
+    Only the handle is pickled into the queue, the worker process memory-maps the file and passes the mapped
+    buffers to the polars serializer. The file is removed as soon as it is mapped.
+    """
+
+    def __init__(self, path: str, kind: str):
+        self.path = path
+        self.kind = kind
+
+    @classmethod
+    def create(cls, record, directory: str, prefix: str = 'influxdb_client_3'):
+        """
+        Store the record into the shared memory.
+
+        :return: the handle or ``None`` if the record is not a polars DataFrame or an Arrow Table
+        """
+        import pyarrow as pa
+
+        if isinstance(record, pa.Table):
+            kind, table = 'arrow', record
+        elif 'polars' in str(type(record)):
+            kind, table = 'polars', record.to_arrow()
+        else:
+            return None
+
+        path = os.path.join(directory, f'{prefix}-{uuid.uuid4().hex}.arrow')
+        try:
+            with pa.OSFile(path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as ipc_writer:
+                    ipc_writer.write_table(table)
+        except BaseException:
+            cls(path, kind).unlink()
+            raise
+        return cls(path, kind)
+
+    def load(self):
+        """Map the record from the shared memory into a polars DataFrame without copying the buffers."""
+        import polars as pl
+        import pyarrow as pa
+
+        try:
+            table = pa.ipc.open_file(pa.memory_map(self.path)).read_all()
+        finally:
+            self.unlink()
+        return pl.from_arrow(table)
+
+    def unlink(self):
+        try:
+            os.unlink(self.path)
+        except OSError:
+            # the mapped file can't be removed on Windows, it is removed by the writer on close
+            pass
+
+    @staticmethod
+    def unlink_all(directory: str, prefix: str):
+        """Remove the files left by the workers which didn't write their records, e.g. after a crash."""
+        for path in glob.glob(os.path.join(glob.escape(directory), f'{prefix}-*.arrow')):
+            _SharedArrowRecord(path, None).unlink()
+
+
+def _worker(queue_, write_api: WriteApi, exited, index: int, process_ttl, on_shutdown) -> None:
+    """
+    Consume and write data from the queue, see :meth:`MultiprocessingWriter.run`.
+
+    :param exited: A shared ``multiprocessing.Array`` of flags of the workers which exited after ``process_ttl``.
+    :param index: The index of the worker in ``exited``.
+    """
+    # Infinite loop - until poison pill or `process_ttl`
+    while True:
+        try:
+            next_record = queue_.get(timeout=process_ttl)
+        except queue.Empty:
+            # only this worker exits, the writer restarts it by the next write into its queue
+            with exited.get_lock():
+                exited[index] = 1
+            write_api.close()
+            if on_shutdown is not None:
+                on_shutdown()
+            break
+
+        if type(next_record) is _PoisonPill:
+            # Poison pill means break the loop
+            logger.info("flushing data...")
+            write_api.close()
+            logger.info("closed")
+            queue_.task_done()
+            break
+        try:
+            record = next_record.get('record')
+            if isinstance(record, _SharedArrowRecord):
+                next_record = dict(next_record, record=record.load())
+            write_api.write(**next_record)
+        finally:
+            queue_.task_done()
+
+
 class MultiprocessingWriter:
     """
     The Helper class to write data into InfluxDB in an independent OS process.
@@ -81,6 +190,27 @@ class MultiprocessingWriter:
                 main()
 
 
+    How to use multiple worker processes:
+        .. code-block:: python
+
+            from influxdb_client import WriteOptions
+            from influxdb_client.client.util.multiprocessing_helper import MultiprocessingWriter
+
+
+            def main():
+                # polars DataFrames are passed to the workers through the shared memory
+                with MultiprocessingWriter(url="http://localhost:8086", token="my-token", org="my-org",
+                                           workers=4, sharding='round_robin', shared_memory=True,
+                                           write_options=WriteOptions(batch_size=100)) as writer:
+                    for df in data_frames:
+                        writer.write(bucket="my-bucket", record=df, data_frame_measurement_name="mem",
+                                     data_frame_timestamp_column="time")
+
+
+            if __name__ == '__main__':
+                main()
+
+
     How to handle batch events:
         .. code-block:: python
 
@@ -124,6 +254,10 @@ class MultiprocessingWriter:
                  start_method='spawn',
                  process_ttl=300,
                  on_shutdown=None,
+                 workers=1,
+                 sharding='round_robin',
+                 shared_memory=False,
+                 shared_memory_dir=None,
                  **kwargs
                  ) -> None:
         """
@@ -134,12 +268,28 @@ class MultiprocessingWriter:
         :param start_method: The method used to start the subprocess.
             See :func:`multiprocessing.get_context` for more information.
         :param process_ttl: The timeout in seconds for waiting for data in the underlying queue.
+            The idle worker process exits and it is started again by the next write into its queue.
         :param on_shutdown: The callback function called when the worker process is shut down
                or when `MultiprocessingWriter` class start closing.
+        :param workers: The number of worker processes.
+        :param sharding: How the writes are distributed between the workers:
+            ``round_robin`` - cycle through the workers,
+            ``database`` - all writes into the same database are handled by the same worker.
+        :param shared_memory: If ``True`` the polars DataFrames and Arrow Tables are passed to the workers
+            as Arrow IPC files in the shared memory and only the handle is sent through the queue instead of
+            pickling the data. The data are copied once into the file, the worker maps the file and serializes
+            the mapped buffers as a polars DataFrame. The Arrow Tables are written like polars DataFrames,
+            ``data_frame_timestamp_column`` is required. The pandas DataFrames are pickled.
+        :param shared_memory_dir: The directory for the shared memory files,
+            defaults to ``/dev/shm`` or to the temporary directory if ``/dev/shm`` is not available.
         :param kwargs: Arguments are passed into the ``WriteApi`` and ``write_client_options``.
             Common arguments include: `host`, `token`, `database`, `org`, `write_options`, `success_callback`,
             `error_callback`, `retry_callback`, `default_header`, and `rest_client`.
         """
+        if workers < 1:
+            raise ValueError(f"workers must be a positive number, got: {workers}")
+        if sharding not in ('round_robin', 'database'):
+            raise ValueError(f"Unsupported sharding: '{sharding}', expected: 'round_robin' or 'database'")
 
         wco = write_client_options(write_options=kwargs.get('write_options', WriteOptions()),
                                    success_callback=kwargs.get('success_callback', _success_callback),
@@ -168,9 +318,19 @@ class MultiprocessingWriter:
         self.ctx = multiprocessing.get_context(start_method)
         self.on_shutdown = on_shutdown
         self.disposed = self.ctx.Value('i', 0)
-        self.process = self.ctx.Process(target=self.run, args=(write_api, self.disposed, process_ttl, self.on_shutdown))
+        self.exited = self.ctx.Array('i', workers)
+        self.queues = [self.ctx.JoinableQueue() for _ in range(workers)]
+        self._write_api = write_api
+        self._process_ttl = process_ttl
+        self.processes = [self._new_process(index) for index in range(workers)]
+        self.process = self.processes[0]
+        self.queue_ = self.queues[0]
         self.kwargs = kwargs
-        self.queue_ = self.ctx.JoinableQueue()
+        self.sharding = sharding
+        self.shared_memory = shared_memory
+        self.shared_memory_dir = shared_memory_dir or _shared_memory_dir()
+        self._shared_memory_prefix = f'influxdb_client_3-{uuid.uuid4().hex}'
+        self._next_worker = 0
 
     def write(self, **kwargs) -> None:
         """
@@ -182,10 +342,50 @@ class MultiprocessingWriter:
         :return: None
         """
         assert self.__started__ is True, 'Cannot write data: the writer is not started.'
-        if self.disposed.value == 0:
-            self.queue_.put(kwargs)
-        else:
+        if self.disposed.value != 0:
             raise Exception('Cannot write data: the writer is closed.')
+        shared = None
+        if self.shared_memory and kwargs.get('record') is not None:
+            shared = _SharedArrowRecord.create(kwargs['record'], self.shared_memory_dir,
+                                               self._shared_memory_prefix)
+            if shared is not None:
+                kwargs = dict(kwargs, record=shared)
+        try:
+            index = self._select_worker(kwargs)
+            with self.exited.get_lock():
+                if self.exited[index]:
+                    self._restart(index)
+                self.queues[index].put(kwargs)
+        except BaseException:
+            if shared is not None:
+                shared.unlink()
+            raise
+
+    def _select_worker(self, kwargs) -> int:
+        if len(self.queues) == 1:
+            return 0
+        if self.sharding == 'database':
+            database = kwargs.get('bucket') or self.kwargs.get('database') or ''
+            return zlib.crc32(str(database).encode('utf-8')) % len(self.queues)
+        index = self._next_worker
+        self._next_worker = (self._next_worker + 1) % len(self.queues)
+        return index
+
+    def _select_queue(self, kwargs):
+        return self.queues[self._select_worker(kwargs)]
+
+    def _new_process(self, index: int):
+        return self.ctx.Process(target=_worker, args=(self.queues[index], self._write_api, self.exited, index,
+                                                      self._process_ttl, self.on_shutdown))
+
+    def _restart(self, index: int) -> None:
+        """Start again the worker which exited after ``process_ttl``, must be called with the ``exited`` lock."""
+        self.processes[index].join()
+        self.processes[index] = self._new_process(index)
+        self.processes[index].start()
+        self.exited[index] = 0
+        if index == 0:
+            self.process = self.processes[0]
 
     def run(self, write_api: WriteApi, disposed, process_ttl, on_shutdown) -> None:
         """
@@ -199,37 +399,18 @@ class MultiprocessingWriter:
             - The queue remains empty for longer than ``process_ttl`` seconds.
 
         :param write_api: The ``WriteApi`` instance used to perform the actual write operations.
-        :param disposed: A ``multiprocessing.Value`` indicating if the writer has been disposed.
+        :param disposed: Not used, the idle exit of the worker is tracked in ``exited`` of the writer.
         :param process_ttl: The timeout in seconds to wait for new data before terminating the process.
         :param on_shutdown: The callback function called when the worker process is shut down.
         :return: None
         """
 
-        # Infinite loop - until poison pill or `process_ttl`
-        while True:
-            try:
-                next_record = self.queue_.get(timeout=process_ttl)
-            except queue.Empty:
-                if disposed.value == 0:
-                    write_api.close()
-                    disposed.value = 1
-                    if on_shutdown is not None:
-                        on_shutdown()
-                    break
-
-            if type(next_record) is _PoisonPill:
-                # Poison pill means break the loop
-                logger.info("flushing data...")
-                write_api.close()
-                logger.info("closed")
-                self.queue_.task_done()
-                break
-            write_api.write(**next_record)
-            self.queue_.task_done()
+        _worker(self.queue_, write_api, self.exited, 0, process_ttl, on_shutdown)
 
     def start(self) -> None:
-        """Start an independent process for writing data into InfluxDB."""
-        self.process.start()
+        """Start independent processes for writing data into InfluxDB."""
+        for process in self.processes:
+            process.start()
         self.__started__ = True
 
     def get_start_processing_method(self):
@@ -246,11 +427,33 @@ class MultiprocessingWriter:
 
     def __del__(self):
         """Dispose of the client and write_api."""
+        if not hasattr(self, 'disposed'):
+            return
         if self.__started__ and self.disposed.value == 0:
-            self.queue_.put(_PoisonPill())
-            self.queue_.join()
-            self.process.join()
+            with self.exited.get_lock():
+                for index, queue_ in enumerate(self.queues):
+                    # the data written just before the idle exit of the worker are flushed by a new worker
+                    if self.exited[index] and not queue_.empty():
+                        self._restart(index)
+                live = [index for index in range(len(self.queues)) if not self.exited[index]]
+            # the lock is released, the worker exiting after process_ttl needs it to record its exit
+            for index in live:
+                self.queues[index].put(_PoisonPill())
+            while live:
+                for index in live:
+                    self.processes[index].join()
+                # the worker which exited after process_ttl just before its pill was put didn't read it,
+                # the pill and the data written before are read by a new worker
+                with self.exited.get_lock():
+                    live = [index for index in live if self.exited[index]]
+                    for index in live:
+                        self._restart(index)
+            for process in self.processes:
+                process.join()
+            if self.shared_memory:
+                _SharedArrowRecord.unlink_all(self.shared_memory_dir, self._shared_memory_prefix)
             self.queue_ = None
+            self.queues = []
         self.__started__ = False
         self.disposed.value = 1
         if self.on_shutdown is not None:
@@ -9,6 +9,7 @@ import math
 import re
 
 from influxdb_client_3.write_client.domain import WritePrecision
+from influxdb_client_3.write_client.client.write.line_protocol import coarsest_precision
 from influxdb_client_3.write_client.client.write.point import _ESCAPE_KEY, _ESCAPE_STRING, _ESCAPE_MEASUREMENT, \
     DEFAULT_WRITE_PRECISION, ordered_tag_keys
 
@@ -20,6 +21,14 @@ def _not_nan(x):
     return not pd.isna(x)
 
 
+def _nanoseconds(timestamps):
+    import pandas as pd
+    index = pd.DatetimeIndex(timestamps)
+    if hasattr(index, 'as_unit'):
+        index = index.as_unit('ns')
+    return index.asi8[~index.isna()]
+
+
 def _itertuples(data_frame):
     cols = [data_frame.iloc[:, k] for k in range(len(data_frame.columns))]
     return zip(data_frame.index, *cols)
@@ -40,8 +49,12 @@ class DataframeSerializer:
         :param data_frame: Pandas DataFrame to serialize
         :param point_settings: Default Tags
         :param precision: The precision for the unix timestamps within the body line-protocol.
+                          The ``WritePrecision.AUTO`` selects the coarsest precision which doesn't lose information,
+                          the selected precision is available as ``precision`` attribute.
         :param chunk_size: The size of chunk for serializing into chunks.
         :key data_frame_measurement_name: name of measurement for writing Pandas DataFrame
+        :key data_frame_measurement_column: name of DataFrame column which contains the measurement of each row,
+                                            used instead of ``data_frame_measurement_name``
         :key data_frame_tag_columns: list of DataFrame columns which are tags, rest columns will be fields
         :key data_frame_timestamp_column: name of DataFrame column which contains a timestamp. The column can be defined as a :class:`~str` value
                                           formatted as `2018-10-26`, `2018-10-26 12:00`, `2018-10-26 12:00:00-05:00`
@@ -95,7 +108,8 @@ class DataframeSerializer:
                             .format(type(data_frame)))
 
         data_frame_measurement_name = kwargs.get('data_frame_measurement_name')
-        if data_frame_measurement_name is None:
+        measurement_column = kwargs.get('data_frame_measurement_column')
+        if data_frame_measurement_name is None and measurement_column is None:
             raise TypeError('"data_frame_measurement_name" is a Required Argument')
 
         timestamp_column = kwargs.get('data_frame_timestamp_column', None)
@@ -110,7 +124,8 @@ class DataframeSerializer:
             # Instead, it would probably be better to leave
             # out the timestamp unless a time column is explicitly
             # enabled.
-            data_frame_timestamp = pd.to_datetime(data_frame_timestamp, unit=precision)
+            data_frame_timestamp = pd.to_datetime(
+                data_frame_timestamp, unit=WritePrecision.NS if precision == WritePrecision.AUTO else precision)
 
         if timestamp_timezone:
             if isinstance(data_frame_timestamp, pd.DatetimeIndex):
@@ -125,6 +140,10 @@ class DataframeSerializer:
         else:
             data_frame[timestamp_column] = data_frame_timestamp
 
+        if precision == WritePrecision.AUTO:
+            precision = coarsest_precision(_nanoseconds(data_frame_timestamp))
+        self.precision = precision
+
         data_frame_tag_columns = kwargs.get('data_frame_tag_columns')
         data_frame_tag_columns = set(data_frame_tag_columns or [])
 
@@ -166,6 +185,7 @@ class DataframeSerializer:
         inf_columns = data_frame.isin([np.inf, -np.inf]).any()
 
         timestamp_index = 0
+        measurement_format = '{measurement_name}'
 
         # Iterate through the columns building up the expression for each column.
         for index, (key, value) in columns:
@@ -193,6 +213,9 @@ class DataframeSerializer:
             elif timestamp_column is not None and key in timestamp_column:
                 timestamp_index = field_index
                 continue
+            elif key == measurement_column:
+                measurement_format = f'{{str({val_format}).translate(_ESCAPE_MEASUREMENT)}}'
+                continue
 
             # This column is a field column.
             # Note: no comma separator is needed for the first field.
@@ -230,14 +253,15 @@ class DataframeSerializer:
         fields = ''.join(fields)
         timestamp = '{p[%s].value}' % timestamp_index
         if precision == WritePrecision.US:
-            timestamp = '{int(p[%s].value / 1e3)}' % timestamp_index
+            timestamp = '{p[%s].value // 1000}' % timestamp_index
         elif precision == WritePrecision.MS:
-            timestamp = '{int(p[%s].value / 1e6)}' % timestamp_index
+            timestamp = '{p[%s].value // 1000000}' % timestamp_index
         elif precision == WritePrecision.S:
-            timestamp = '{int(p[%s].value / 1e9)}' % timestamp_index
+            timestamp = '{p[%s].value // 1000000000}' % timestamp_index
 
-        f = eval(f'lambda p: f"""{{measurement_name}}{tag_string} {fields} {timestamp}"""', {
+        f = eval(f'lambda p: f"""{measurement_format}{tag_string} {fields} {timestamp}"""', {
             'measurement_name': measurement_name,
+            '_ESCAPE_MEASUREMENT': _ESCAPE_MEASUREMENT,
             '_ESCAPE_KEY': _ESCAPE_KEY,
             '_ESCAPE_STRING': _ESCAPE_STRING,
             'keys': keys,
@@ -0,0 +1,170 @@
+"""Helpers for working with already serialized LineProtocol."""
+
+from influxdb_client_3.write_client.domain.write_precision import WritePrecision
+
+_BACKSLASH = 0x5c
+_NEWLINE = b'\n'
+
+# precisions coarser than nanoseconds with the number of trailing zeros of nanosecond timestamp
+_PRECISION_ZEROS = ((WritePrecision.S, 9), (WritePrecision.MS, 6), (WritePrecision.US, 3))
+
+
+def split_lines(body: bytes) -> list:
+    """
+    Split LineProtocol body into lines.
+
+    Empty lines are omitted.
+
+    :param body: LineProtocol encoded as ``bytes``
+    :return: list of lines without the line separator
+    """
+    return [line for line in body.split(_NEWLINE) if line]
+
+
+def split_body(body: bytes, max_bytes: int) -> list:
+    """
+    Split LineProtocol body on line boundaries into pieces of at most ``max_bytes``.
+
+    A line longer than ``max_bytes`` is returned as a separate piece. Empty pieces are omitted.
+
+    :param body: LineProtocol encoded as ``bytes``
+    :param max_bytes: the maximum size of a piece
+    :return: list of pieces without the trailing line separator
+    """
+    pieces = []
+    start, length = 0, len(body)
+    while start < length:
+        if body[start] == _NEWLINE[0]:
+            start += 1
+            continue
+        if length - start <= max_bytes:
+            pieces.append(body[start:].rstrip(_NEWLINE))
+            break
+        else:
+            end = body.rfind(_NEWLINE, start, start + max_bytes + 1)
+            if end < 0:
+                # the line is longer than max_bytes
+                end = body.find(_NEWLINE, start + max_bytes)
+                end = length if end < 0 else end
+        pieces.append(body[start:end])
+        start = end + 1
+    return pieces
+
+
+def bisect_body(body: bytes):
+    """
+    Split LineProtocol body into two halves on the line boundary closest to the middle.
+
+    :return: tuple of the halves or ``None`` if the body contains only one line
+    """
+    body = body.strip(_NEWLINE)
+    middle = len(body) // 2
+    left = body.rfind(_NEWLINE, 0, middle + 1)
+    right = body.find(_NEWLINE, middle)
+    if left < 0 and right < 0:
+        return None
+    index = right if left < 0 or (0 <= right and right - middle < middle - left) else left
+    return body[:index].rstrip(_NEWLINE), body[index + 1:].lstrip(_NEWLINE)
+
+
+def _is_escaped(line: bytes, index: int) -> bool:
+    backslashes = 0
+    while index > 0 and line[index - 1] == _BACKSLASH:
+        backslashes += 1
+        index -= 1
+    return backslashes % 2 == 1
+
+
+def _find_unescaped(line: bytes, char: bytes, start: int = 0, end: int = None) -> int:
+    index = line.find(char, start, len(line) if end is None else end)
+    while index > 0 and _is_escaped(line, index):
+        index = line.find(char, index + 1, len(line) if end is None else end)
+    return index
+
+
+def series_key_end(line: bytes) -> int:
+    """Return the index of the space which terminates the series key (measurement and tag set) of the line."""
+    end = _find_unescaped(line, b' ')
+    return len(line) if end < 0 else end
+
+
+def measurement(line: bytes) -> bytes:
+    """Return the escaped measurement name of the line."""
+    end = series_key_end(line)
+    comma = _find_unescaped(line, b',', 0, end)
+    return line[:end if comma < 0 else comma]
+
+
+def timestamp(line: bytes):
+    """
+    Return the timestamp of the line.
+
+    :return: timestamp as ``int`` or ``None`` if the line doesn't contain a timestamp
+    """
+    line = line.rstrip()
+    start = line.rfind(b' ')
+    if start < 0 or start <= series_key_end(line):
+        return None
+    value = line[start + 1:]
+    if value.isdigit() or (value[:1] == b'-' and value[1:].isdigit()):
+        return int(value)
+    return None
+
+
+def series_sort_key(line: bytes) -> tuple:
+    """
+    Sort key ordering lines by measurement, tag set and time.
+
+    Lines without timestamp are ordered before lines of the same series with timestamp.
+    """
+    end = series_key_end(line)
+    comma = _find_unescaped(line, b',', 0, end)
+    if comma < 0:
+        comma = end
+    _timestamp = timestamp(line)
+    return line[:comma], line[comma:end], _timestamp is not None, _timestamp or 0
+
+
+def coarsest_precision(timestamps) -> str:
+    """
+    Return the coarsest precision which represents the nanosecond timestamps without loss of information.
+
+    :param timestamps: nanosecond timestamps as ``numpy.ndarray`` or ``polars.Series`` of integers
+    :return: the :class:`WritePrecision`
+    """
+    for precision, zeros in _PRECISION_ZEROS:
+        if bool((timestamps % 10 ** zeros == 0).all()):
+            return precision
+    return WritePrecision.NS
+
+
+def rescale_body(body: bytes):
+    """
+    Rescale nanosecond timestamps of LineProtocol body to the coarsest precision which loses no information.
+
+    The body is returned unchanged if some line doesn't contain a timestamp - the server assigns
+    the time of such line according to the precision of the request.
+
+    :param body: LineProtocol with timestamps in nanoseconds
+    :return: tuple of the rescaled body and its :class:`WritePrecision`
+    """
+    lines = split_lines(body)
+    starts = []
+    zeros = _PRECISION_ZEROS[0][1]
+    for line in lines:
+        start = line.rfind(b' ')
+        if start < 0 or start <= series_key_end(line):
+            return body, WritePrecision.NS
+        value = line[start + 1:]
+        if not value.lstrip(b'-').isdigit():
+            return body, WritePrecision.NS
+        digits = value.lstrip(b'-0')
+        if digits:
+            zeros = min(zeros, len(value) - len(value.rstrip(b'0')))
+            if zeros < _PRECISION_ZEROS[-1][1]:
+                return body, WritePrecision.NS
+        starts.append(start if digits else -1)
+
+    precision, zeros = next(item for item in _PRECISION_ZEROS if item[1] <= zeros)
+    # zero timestamp stays zero
+    return _NEWLINE.join(line[:-zeros] if start >= 0 else line for line, start in zip(lines, starts)), precision
@@ -216,12 +216,14 @@ class Point(object):
         self._fields[field] = value
         return self
 
-    def to_line_protocol(self, precision=None, tag_order=None):
+    def to_line_protocol(self, precision=None, tag_order=None, default_tags=None):
         """
         Create LineProtocol.
 
          :param precision: required precision of LineProtocol. If it's not set then use the precision from ``Point``.
          :param tag_order: optional list of tag names to prioritize in serialized output
+         :param default_tags: optional pre-escaped default tags produced by :func:`render_default_tags`.
+                              They are merged into the serialized tag set without modifying the ``Point``.
         """
         _measurement = _escape_key(self._name, _ESCAPE_MEASUREMENT)
         if _measurement.startswith("#"):
@@ -231,7 +233,7 @@ The output Line protocol will be interpret as a comment by InfluxDB. For more in
     - https://docs.influxdata.com/influxdb/latest/reference/syntax/line-protocol/#comments
 """
             warnings.warn(message, SyntaxWarning)
-        _tags = _append_tags(self._tags, tag_order)
+        _tags = _append_tags(self._tags, tag_order, default_tags)
         _fields = _append_fields(self._fields, self._field_types)
         if not _fields:
             return ""
@@ -254,9 +256,21 @@ The output Line protocol will be interpret as a comment by InfluxDB. For more in
         return self.to_line_protocol()
 
 
-def _append_tags(tags, tag_order=None):
+def _append_tags(tags, tag_order=None, default_tags=None):
+    if default_tags:
+        if not tags and not tag_order:
+            # Fast path - default tags are already escaped and sorted
+            return f",{','.join(default_tags.values())} "
+        tag_keys = sorted(tags.keys() | default_tags.keys())
+    else:
+        tag_keys = sorted(tags.keys())
+
     _return = []
-    for tag_key in ordered_tag_keys(sorted(tags.keys()), tag_order):
+    for tag_key in ordered_tag_keys(tag_keys, tag_order):
+        if default_tags and tag_key in default_tags:
+            _return.append(default_tags[tag_key])
+            continue
+
         tag_value = tags.get(tag_key)
 
         if tag_value is None:
@@ -270,6 +284,32 @@ def _append_tags(tags, tag_order=None):
     return f"{',' if _return else ''}{','.join(_return)} "
 
 
+def render_default_tags(default_tags):
+    """
+    Pre-escape default tags into LineProtocol ``key=value`` fragments.
+
+    The result is ordered by tag key, so it can be merged into the tags of each serialized record
+    without escaping the default tags again.
+
+    :param default_tags: dictionary of default tags, typically ``PointSettings.defaultTags``
+    :return: dictionary of tag key -> escaped ``key=value`` fragment, empty tags are omitted
+    """
+    rendered = {}
+    if not default_tags:
+        return rendered
+
+    for tag_key in sorted(default_tags.keys()):
+        tag_value = default_tags[tag_key]
+        if tag_value is None:
+            continue
+        tag = _escape_key(tag_key)
+        value = _escape_tag_value(tag_value)
+        if tag != '' and value != '':
+            rendered[tag_key] = f'{tag}={value}'
+
+    return rendered
+
+
 def sanitize_tag_order(tag_order):
     if tag_order is None:
         return []
@@ -7,8 +7,10 @@ Much of the code here is inspired by that in the aioinflux packet found here: ht
 import logging
 import math
 
+from influxdb_client_3.write_client.client.write.line_protocol import coarsest_precision
 from influxdb_client_3.write_client.client.write.point import _ESCAPE_KEY, _ESCAPE_STRING, DEFAULT_WRITE_PRECISION, \
     ordered_tag_keys
+from influxdb_client_3.write_client.domain import WritePrecision
 
 logger = logging.getLogger('influxdb_client.client.write.polars_dataframe_serializer')
 
@@ -24,6 +26,8 @@ class PolarsDataframeSerializer:
         :param data_frame: Polars DataFrame to serialize
         :param point_settings: Default Tags
         :param precision: The precision for the unix timestamps within the body line-protocol.
+                          The ``WritePrecision.AUTO`` selects the coarsest precision which doesn't lose information,
+                          the selected precision is available as ``precision`` attribute.
         :param chunk_size: The size of chunk for serializing into chunks.
         :key data_frame_measurement_name: name of measurement for writing Polars DataFrame
         :key data_frame_tag_columns: list of DataFrame columns which are tags, rest columns will be fields
@@ -48,6 +52,13 @@ class PolarsDataframeSerializer:
                 f"Timestamp column {self.timestamp_column} not found in DataFrame. Please define a valid timestamp "
                 f"column.")
 
+        # integer timestamps are already in the target precision, except AUTO where they are nanoseconds
+        self._rescale = 1
+        if precision == WritePrecision.AUTO:
+            self.precision = coarsest_precision(self._nanoseconds())
+            self._rescale = {WritePrecision.S: 10 ** 9, WritePrecision.MS: 10 ** 6,
+                             WritePrecision.US: 10 ** 3}.get(self.precision, 1)
+
         #
         # prepare chunks
         #
@@ -57,6 +68,14 @@ class PolarsDataframeSerializer:
         else:
             self.number_of_chunks = None
 
+    def _nanoseconds(self):
+        import polars as pl
+
+        column = self.data_frame[self.timestamp_column].drop_nulls()
+        if column.dtype in [pl.Int32, pl.Int64]:
+            return column
+        return column.dt.epoch(time_unit="ns")
+
     def escape_key(self, value):
         return str(value).translate(_ESCAPE_KEY)
 
@@ -123,7 +142,8 @@ class PolarsDataframeSerializer:
         # Check if the timestamp column is already an integer
         if df[self.timestamp_column].dtype in [pl.Int32, pl.Int64]:
             # The timestamp column is already an integer, assuming it's in Unix format
-            pass
+            if self._rescale != 1:
+                df = df.with_columns(pl.col(self.timestamp_column) // self._rescale)
         else:
             # Convert timestamp to Unix timestamp based on specified precision
             if self.precision in [None, 'ns']:
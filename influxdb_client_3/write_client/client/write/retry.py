@@ -1,6 +1,9 @@
 """Implementation for Retry strategy during HTTP requests."""
 
 import logging
+import threading
+import time
+from collections import deque
 from datetime import datetime, timedelta
 from itertools import takewhile
 from random import random
@@ -14,6 +17,98 @@ from influxdb_client_3.exceptions import InfluxDBError
 logger = logging.getLogger('influxdb_client.client.write.retry')
 
 
+class RetryBudget(object):
+    """
+    Retry budget shared by all requests of the client.
+
+    Within the sliding window of ``ttl`` seconds, a retry is allowed only while the number of retries
+    stays below ``min_retries_per_second * ttl + percent_can_retry * successful requests``.
+    Once the budget is spent, the failed requests are not retried, so a recovering server
+    isn't overloaded by retries of all pending batches.
+
+    Example:
+        .. code-block:: python
+
+            # retry at most 20% of successful requests, but at least 5 retries per second
+            WriteOptions(retry_budget=RetryBudget(ttl=10, min_retries_per_second=5, percent_can_retry=0.2))
+    """
+
+    def __init__(self, ttl=10, min_retries_per_second=10, percent_can_retry=0.2):
+        """
+        Initialize the budget.
+
+        :param int ttl: the length of the sliding window in seconds
+        :param num min_retries_per_second: the retries allowed regardless of successful requests
+        :param float percent_can_retry: the allowed retries as a ratio of successful requests, 0.2 means 20%
+        """
+        if ttl < 1:
+            raise ValueError(f"ttl must be at least 1 second, got: {ttl}")
+        if min_retries_per_second < 0 or percent_can_retry < 0:
+            raise ValueError("min_retries_per_second and percent_can_retry must not be negative")
+        self.ttl = int(ttl)
+        self.min_retries_per_second = min_retries_per_second
+        self.percent_can_retry = percent_can_retry
+        self.rejected = 0
+        self._buckets = deque()
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Record a successful request."""
+        with self._lock:
+            self._bucket()[1] += 1
+
+    def try_withdraw(self) -> bool:
+        """
+        Spend one retry from the budget.
+
+        :return: ``True`` if the retry is allowed, ``False`` if the budget is spent
+        """
+        with self._lock:
+            bucket = self._bucket()
+            if self._retries() >= self._limit():
+                self.rejected += 1
+                return False
+            bucket[2] += 1
+            return True
+
+    def balance(self) -> int:
+        """Return the number of retries currently available."""
+        with self._lock:
+            self._bucket()
+            return max(0, int(self._limit() - self._retries()))
+
+    def _limit(self):
+        successes = sum(bucket[1] for bucket in self._buckets)
+        return self.min_retries_per_second * self.ttl + self.percent_can_retry * successes
+
+    def _retries(self):
+        return sum(bucket[2] for bucket in self._buckets)
+
+    def _bucket(self):
+        """Return the [second, successes, retries] bucket of the current second and drop the expired ones."""
+        now = int(self._clock())
+        while self._buckets and self._buckets[0][0] <= now - self.ttl:
+            self._buckets.popleft()
+        if not self._buckets or self._buckets[-1][0] != now:
+            self._buckets.append([now, 0, 0])
+        return self._buckets[-1]
+
+    @staticmethod
+    def _clock():
+        return time.monotonic()
+
+    def __getstate__(self):
+        """Return a dict of attributes that you want to pickle."""
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        """Set your object with the provided dict."""
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
 class WritesRetry(Retry):
     """
     Writes retry configuration.
@@ -28,7 +123,8 @@ class WritesRetry(Retry):
     """
 
     def __init__(self, jitter_interval=0, max_retry_delay=125, exponential_base=2, max_retry_time=180, total=5,
-                 retry_interval=5, retry_callback: Callable[[Exception], int] = None, **kw):
+                 retry_interval=5, retry_callback: Callable[[Exception], int] = None,
+                 retry_budget: RetryBudget = None, **kw):
         """
         Initialize defaults.
 
@@ -43,6 +139,8 @@ class WritesRetry(Retry):
                                                           error occurred.
                                                           The callable must accept one argument:
                                                                 - `Exception`: an retryable error
+        :param RetryBudget retry_budget: the budget shared by all requests, a retry is not performed
+                                         if the budget is spent
         """
         super().__init__(**kw)
         self.jitter_interval = jitter_interval
@@ -53,6 +151,7 @@ class WritesRetry(Retry):
         self.exponential_base = exponential_base
         self.retry_timeout = datetime.now() + timedelta(seconds=max_retry_time)
         self.retry_callback = retry_callback
+        self.retry_budget = retry_budget
 
     def new(self, **kw):
         """Initialize defaults."""
@@ -68,6 +167,8 @@ class WritesRetry(Retry):
             kw['exponential_base'] = self.exponential_base
         if 'retry_callback' not in kw:
             kw['retry_callback'] = self.retry_callback
+        if 'retry_budget' not in kw:
+            kw['retry_budget'] = self.retry_budget
 
         new = super().new(**kw)
         new.retry_timeout = self.retry_timeout
@@ -123,6 +224,9 @@ class WritesRetry(Retry):
 
         new_retry = super().increment(method, url, response, error, _pool, _stacktrace)
 
+        if self.retry_budget is not None and not self.retry_budget.try_withdraw():
+            raise MaxRetryError(_pool, url, error or ResponseError("retry budget exhausted"))
+
         if response is not None:
             parsed_error = InfluxDBError(response=response)
         elif error is not None:
@@ -0,0 +1,146 @@
+"""Acknowledgements of the data written in batching mode."""
+
+import logging
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger('influxdb_client_3.write_client.client.write.write_handle')
+
+
+class WriteHandle(object):
+    """
+    Handle to the records passed into one ``write`` call in batching mode.
+
+    The handle is completed when all batches containing the records are acknowledged by InfluxDB
+    or when one of them definitely fails (after retries).
+
+    Example:
+        .. code-block:: python
+
+            handle = client.write(record="mem,tag=a value=1i")
+            ...
+            handle.result(timeout=10)  # raises the exception of the failed batch
+    """
+
+    __slots__ = ('_lock', '_event', '_pending', '_exception', '_callbacks')
+
+    def __init__(self):
+        """Initialize the handle, one pending reference is held until all records are submitted."""
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._pending = 1
+        self._exception = None
+        self._callbacks = []
+
+    def _retain(self, count=1) -> None:
+        """Register ``count`` more pending batches. The ``count`` can be negative if the batches were merged."""
+        with self._lock:
+            self._pending += count
+            completed = self._pending <= 0 and not self._event.is_set()
+        if completed:
+            self._complete()
+
+    def _release(self, exception: Optional[BaseException] = None) -> None:
+        """Acknowledge one pending batch."""
+        with self._lock:
+            if exception is not None and self._exception is None:
+                self._exception = exception
+            self._pending -= 1
+            completed = self._pending <= 0 and not self._event.is_set()
+        if completed:
+            self._complete()
+
+    def _fail(self, exception: BaseException) -> None:
+        """Complete the handle with ``exception`` regardless of its pending batches."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            if self._exception is None:
+                self._exception = exception
+        self._complete()
+
+    def _complete(self):
+        with self._lock:
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback(self)
+            except Exception as e:
+                logger.error("The write handle callback threw an exception: %s", e)
+
+    def done(self) -> bool:
+        """Return ``True`` if all records were acknowledged or failed."""
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the handle is completed.
+
+        :param timeout: the maximum time to wait in seconds, ``None`` means wait forever
+        :return: ``True`` if the handle is completed, ``False`` if the timeout expired
+        """
+        return self._event.wait(timeout)
+
+    def exception(self, timeout: Optional[float] = None) -> Optional[BaseException]:
+        """
+        Return the exception of the failed batch or ``None`` if all records were written.
+
+        :param timeout: the maximum time to wait in seconds, ``None`` means wait forever
+        :raise TimeoutError: if the handle is not completed before the timeout
+        """
+        if not self._event.wait(timeout):
+            raise TimeoutError("The write was not acknowledged in time.")
+        return self._exception
+
+    def result(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait until the records are written.
+
+        :param timeout: the maximum time to wait in seconds, ``None`` means wait forever
+        :raise TimeoutError: if the handle is not completed before the timeout
+        :raise Exception: the exception of the failed batch
+        """
+        exception = self.exception(timeout)
+        if exception is not None:
+            raise exception
+
+    def add_done_callback(self, fn: Callable[['WriteHandle'], None]) -> None:
+        """
+        Call ``fn`` with the handle when it is completed.
+
+        If the handle is already completed, ``fn`` is called immediately.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def __repr__(self) -> str:
+        """Return the state of the handle."""
+        if not self.done():
+            state = 'pending'
+        else:
+            state = 'failed' if self._exception is not None else 'written'
+        return f'WriteHandle[{state}]'
+
+
+def wait_all(handles: Iterable[WriteHandle], timeout: Optional[float] = None) -> None:
+    """
+    Wait until all handles are completed.
+
+    :param handles: the handles returned by batching writes, ``None`` items are ignored
+    :param timeout: the maximum time to wait in seconds for all handles, ``None`` means wait forever
+    :raise TimeoutError: if some handle is not completed before the timeout
+    :raise Exception: the exception of the first failed handle
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    handles = [handle for handle in handles if handle is not None]
+    for handle in handles:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if not handle.wait(remaining):
+            raise TimeoutError(f"The writes were not acknowledged in {timeout} seconds.")
+    for handle in handles:
+        handle.result(0)
@@ -8,27 +8,32 @@ import asyncio
 import datetime
 import logging
 import os
+import threading
 import warnings
 from collections import defaultdict
 from enum import Enum
 from http import HTTPStatus
 from multiprocessing.pool import ThreadPool
 from random import random
-from time import sleep
 from typing import Union, Any, Iterable, NamedTuple
 
 import reactivex as rx
 import urllib3
 from reactivex import operators as ops, Observable
-from reactivex.scheduler import ThreadPoolScheduler
+from reactivex.disposable import CompositeDisposable, RefCountDisposable, SerialDisposable
+from reactivex.scheduler import ThreadPoolScheduler, TimeoutScheduler
 from reactivex.subject import Subject
 
-from influxdb_client_3.exceptions import InfluxDBPartialWriteError
+from influxdb_client_3.exceptions import InfluxDBPartialWriteError, InfluxDBShardedWriteError
 from influxdb_client_3.write_client._sync.rest_client import RestClient
 # from influxdb_client_3.write_client.client._base import _HAS_DATACLASS
 from influxdb_client_3.write_client.client.write.dataframe_serializer import DataframeSerializer
-from influxdb_client_3.write_client.client.write.point import Point, DEFAULT_WRITE_PRECISION, sanitize_tag_order
-from influxdb_client_3.write_client.client.write.retry import WritesRetry
+from influxdb_client_3.write_client.client.write.line_protocol import split_lines, series_sort_key, measurement, \
+    split_body, bisect_body, rescale_body
+from influxdb_client_3.write_client.client.write.point import Point, DEFAULT_WRITE_PRECISION, sanitize_tag_order, \
+    render_default_tags
+from influxdb_client_3.write_client.client.write.retry import WritesRetry, RetryBudget
+from influxdb_client_3.write_client.client.write.write_handle import WriteHandle, wait_all
 from influxdb_client_3.write_client.domain import WritePrecision
 from influxdb_client_3.write_client.domain.write_precision_converter import WritePrecisionConverter
 from influxdb_client_3.write_client.write_exceptions import _UTF_8_encoding, ApiException
@@ -50,6 +55,7 @@ DEFAULT_WRITE_USE_V2_API = _DEFAULT_WRITE_USE_V2_API
 SERIALIZER_KWARGS = {
     # DataFrame-specific kwargs
     'data_frame_measurement_name',
+    'data_frame_measurement_column',
     'data_frame_tag_columns',
     'data_frame_timestamp_column',
     'data_frame_timestamp_timezone',
@@ -61,8 +67,13 @@ SERIALIZER_KWARGS = {
     'record_field_keys',
     # Point serialization-specific kwargs
     'tag_order',
+    'default_tags',
 }
 
+# Kwargs of _post_write which can be served by a prepared write request
+_PREPARED_WRITE_KWARGS = {'precision', 'no_sync', 'accept_partial', 'use_v2_api', 'urlopen_kw', '_request_timeout'}
+_PREPARED_WRITES_LIMIT = 128
+
 logger = logging.getLogger('influxdb_client_3.write_client.client.write_api')
 
 try:
@@ -102,12 +113,18 @@ class WriteOptions(object):
                  max_retry_time=180_000,
                  exponential_base=2,
                  max_close_wait=300_000,
+                 max_flush_wait=300_000,
                  write_precision=DEFAULT_WRITE_PRECISION,
                  no_sync=DEFAULT_WRITE_NO_SYNC,
                  tag_order=None,
                  accept_partial=DEFAULT_WRITE_ACCEPT_PARTIAL,
                  use_v2_api=DEFAULT_WRITE_USE_V2_API,
                  timeout=DEFAULT_WRITE_TIMEOUT,
+                 sort_batch=False,
+                 group_by_measurement=False,
+                 retry_budget: RetryBudget = None,
+                 max_request_bytes=None,
+                 write_shards=1,
                  write_scheduler=ThreadPoolScheduler(max_workers=1)) -> None:
         """
         Create write api configuration.
@@ -124,12 +141,26 @@ class WriteOptions(object):
         :param max_retry_time: total timeout for all retry attempts in milliseconds, if 0 retry is disabled
         :param exponential_base: base for the exponential retry delay
         :param max_close_wait: the maximum time to wait for writes to be flushed if close() is called
-        :param write_precision: precision to use when writing points to InfluxDB
+        :param max_flush_wait: the maximum time to wait for the batches flushed by flush() (milliseconds)
+        :param write_precision: precision to use when writing points to InfluxDB. The ``WritePrecision.AUTO``
+                                sends each request in the coarsest precision which doesn't lose information,
+                                the time of line protocol, dictionaries and ``Point`` without precision is expected
+                                in nanoseconds.
         :param no_sync: skip waiting for WAL persistence on write
         :param accept_partial: allow partial writes when some lines fail
         :param tag_order: optional list of tag names used to prioritize tag serialization order
         :param use_v2_api: use /api/v2/write compatibility endpoint
         :param timeout: timeout to use when writing to the database in milliseconds. Default is 10_000
+        :param sort_batch: sort lines of each batch by measurement, tag set and time before sending (batching only)
+        :param group_by_measurement: split each batch into one request per measurement (batching only)
+        :param retry_budget: the :class:`RetryBudget` limiting retries of all batches to a share of recent
+               successful requests, the same instance can be shared by several clients
+        :param max_request_bytes: the maximum size of the request body, larger bodies are split on line
+               boundaries and the pieces are sent concurrently. The size of the uncompressed line protocol
+               is compared, with ``enable_gzip`` the requests are smaller. Bodies rejected by the server
+               with ``413 Payload Too Large`` are split into halves and sent again.
+        :param write_shards: the number of line-bounded shards a synchronous write is split into,
+               the shards are serialized, compressed and sent concurrently (synchronous only)
         :param write_scheduler:
         """
         self.write_type = write_type
@@ -143,12 +174,18 @@ class WriteOptions(object):
         self.exponential_base = exponential_base
         self.write_scheduler = write_scheduler
         self.max_close_wait = max_close_wait
+        self.max_flush_wait = max_flush_wait
         self.write_precision = write_precision
         self.timeout = timeout
         self.no_sync = no_sync
         self.accept_partial = accept_partial
         self.use_v2_api = use_v2_api
         self.tag_order = sanitize_tag_order(tag_order)
+        self.sort_batch = sort_batch
+        self.group_by_measurement = group_by_measurement
+        self.retry_budget = retry_budget
+        self.max_request_bytes = max_request_bytes
+        self.write_shards = write_shards
 
     def validate(self):
         if self.use_v2_api and self.no_sync:
@@ -170,6 +207,7 @@ class WriteOptions(object):
             max_retry_time=self.max_retry_time / 1_000,
             exponential_base=self.exponential_base,
             retry_callback=kwargs.get("retry_callback", None),
+            retry_budget=self.retry_budget,
             allowed_methods=["POST"])
 
     def __getstate__(self):
@@ -217,6 +255,14 @@ class PointSettings(object):
         self.defaultTags[key] = self._get_value(value)
 
 
+class _PreparedWrite(NamedTuple):
+    """Pre-built path, query parameters and headers of a write request."""
+
+    path: str
+    query_params: tuple
+    header_params: dict
+
+
 class _BatchItemKey(object):
     def __init__(self, bucket, org, precision=DEFAULT_WRITE_PRECISION, **kwargs) -> None:
         self.bucket = bucket
@@ -246,10 +292,11 @@ class _BatchItemKey(object):
 
 
 class _BatchItem(object):
-    def __init__(self, key: _BatchItemKey, data, size=1) -> None:
+    def __init__(self, key: _BatchItemKey, data, size=1, handles=()) -> None:
         self.key = key
         self.data = data
         self.size = size
+        self.handles = handles
         pass
 
     def to_key_tuple(self) -> (str, str, str):
@@ -271,10 +318,149 @@ class _BatchResponse(object):
             .format("failed" if self.exception else "success", str(self.data))
 
 
+def _time_precision(precision):
+    """Return the precision of the time values, the ``WritePrecision.AUTO`` expects nanoseconds."""
+    return WritePrecision.NS if precision == WritePrecision.AUTO else precision
+
+
 def _body_reduce(batch_items):
     return b'\n'.join(map(lambda batch_item: batch_item.data, batch_items))
 
 
+def _batch_reduce(key, batch_items, sort_batch=False, group_by_measurement=False):
+    """Create the batches to send from items of one window, optionally sorted and split by measurement."""
+    if not sort_batch and not group_by_measurement:
+        batches = [_BatchItem(key=key, data=_body_reduce(batch_items), size=len(batch_items),
+                              handles=_merge_handles(batch_item.handles for batch_item in batch_items))]
+    else:
+        lines = [(line, batch_item.handles) for batch_item in batch_items for line in split_lines(batch_item.data)]
+        if group_by_measurement:
+            groups = defaultdict(list)
+            for line in lines:
+                groups[measurement(line[0])].append(line)
+            groups = groups.values()
+        else:
+            groups = [lines]
+
+        if sort_batch:
+            groups = [sorted(group, key=lambda line: series_sort_key(line[0])) for group in groups]
+
+        batches = [_BatchItem(key=key, data=b'\n'.join(line for line, _ in group), size=len(group),
+                              handles=_merge_handles(handles for _, handles in group))
+                   for group in groups]
+
+    # every item holds one reference to its handles, every created batch holds one reference
+    references = defaultdict(int)
+    for batch_item in batch_items:
+        for handle in batch_item.handles:
+            references[handle] -= 1
+    for batch in batches:
+        for handle in batch.handles:
+            references[handle] += 1
+    for handle, count in references.items():
+        if count != 0:
+            handle._retain(count)
+    return batches
+
+
+class _FlushBarrier(object):
+    """Marker which closes the currently buffered window, the ``handle`` is completed when its batches are written."""
+
+    def __init__(self, handle: WriteHandle = None):
+        self.handle = handle
+
+
+_FLUSH = _FlushBarrier()
+
+
+def _window_with_time_count_or_flush(timespan: datetime.timedelta, count: int, scheduler=None):
+    """
+    Split the items into windows by count or time like :func:`reactivex.operators.window_with_time_or_count`.
+
+    Additionally, the window is closed when a :class:`_FlushBarrier` like :data:`_FLUSH` is received,
+    the marker itself is not emitted. The items of the closed window hold a reference to the ``handle``
+    of the marker.
+    """
+
+    def _window(source: Observable) -> Observable:
+        def subscribe(observer, scheduler_=None):
+            _scheduler = scheduler or scheduler_ or TimeoutScheduler.singleton()
+            lock = threading.RLock()
+            timer = SerialDisposable()
+            group_disposable = CompositeDisposable(timer)
+            ref_count_disposable = RefCountDisposable(group_disposable)
+            state = {'n': 0, 'window': Subject(), 'id': 0, 'items': []}
+
+            def open_window():
+                state['n'] = 0
+                state['items'] = []
+                state['id'] += 1
+                state['window'].on_completed()
+                state['window'] = Subject()
+                observer.on_next(_add_ref(state['window'], ref_count_disposable))
+                create_timer(state['id'])
+
+            def create_timer(window_id):
+                def action(_scheduler, _state=None):
+                    with lock:
+                        if window_id == state['id']:
+                            open_window()
+
+                timer.disposable = _scheduler.schedule_relative(timespan, action)
+
+            def on_next(item):
+                with lock:
+                    if isinstance(item, _FlushBarrier):
+                        handle = item.handle
+                        if state['n'] > 0:
+                            if handle is not None:
+                                # the window is not reduced into batches yet, so its items can still be marked
+                                for batch_item in state['items']:
+                                    batch_item.handles = batch_item.handles + (handle,)
+                                handle._retain(len(state['items']))
+                            open_window()
+                        if handle is not None:
+                            handle._release()
+                        return
+                    state['window'].on_next(item)
+                    state['items'].append(item)
+                    state['n'] += 1
+                    if state['n'] == count:
+                        open_window()
+
+            def on_error(e):
+                with lock:
+                    state['window'].on_error(e)
+                    observer.on_error(e)
+
+            def on_completed():
+                with lock:
+                    state['window'].on_completed()
+                    observer.on_completed()
+
+            observer.on_next(_add_ref(state['window'], ref_count_disposable))
+            create_timer(state['id'])
+            group_disposable.add(source.subscribe(on_next, on_error, on_completed, scheduler=scheduler_))
+            return ref_count_disposable
+
+        return Observable(subscribe)
+
+    return _window
+
+
+def _add_ref(source: Observable, ref_count_disposable: RefCountDisposable) -> Observable:
+    """Keep ``ref_count_disposable`` referenced while the window is subscribed, ``reactivex.internal.add_ref``."""
+    def subscribe(observer, scheduler_=None):
+        return CompositeDisposable(ref_count_disposable.disposable, source.subscribe(observer))
+
+    return Observable(subscribe)
+
+
+def _merge_handles(handle_tuples):
+    """Distinct handles in order of appearance."""
+    return tuple(dict.fromkeys(handle for handles in handle_tuples for handle in handles))
+
+
 class WriteApi:
     PRIMITIVE_TYPES = (float, bool, bytes, str, int)
     _pool = None
@@ -329,6 +515,11 @@ class WriteApi:
         self.pool_threads = pool_threads
         self._pool = None
         self.default_header = default_header
+        self._prepared_writes = {}
+        # pending handles of batching writes
+        self._handles = set()
+        self._handles_lock = threading.Lock()
+        self._pipeline_error = None
         self._point_settings = point_settings if point_settings is not None else PointSettings()
         self._write_options = write_options if write_options is not None else WriteOptions()
 
@@ -385,43 +576,58 @@ class WriteApi:
                        Iterable[dataclass]]
         :param write_precision: Optional precision for writing data. If not specified, the
                                 default precision defined in the write options will be used.
+                                Use ``WritePrecision.AUTO`` to select the coarsest lossless precision of each request.
         :type write_precision: WritePrecision
         :param kwargs: Additional options to customize the write process such as tag order,
                        synchronization preference, API version, etc.
         :return: Depending on the configuration:
                  - None: When using synchronous writes and no additional response is needed.
+                 - WriteHandle: When using batching writes, the handle is completed when the batches
+                   containing the records are written.
                  - Any: The result of the write operation based on asynchronous or other modes.
         """  # noqa: E501
 
         org = org if org is not None else self.org
         bucket = bucket if bucket is not None else self.bucket
 
-        self._append_default_tags(record)
-
         if write_precision is None:
             write_precision = self._write_options.write_precision
 
         self._write_options.validate()
         kwargs = dict(kwargs)
         no_sync, accept_partial, use_v2_api = self._resolve_write_request_options(kwargs)
+        write_shards = kwargs.pop('write_shards', self._write_options.write_shards) or 1
 
         if 'tag_order' in kwargs:
             kwargs['tag_order'] = sanitize_tag_order(kwargs.get('tag_order'))
         else:
             kwargs['tag_order'] = self._write_options.tag_order
+        kwargs['default_tags'] = render_default_tags(self._point_settings.defaultTags)
 
         if self._write_options.write_type is WriteType.batching:
             kwargs['no_sync'] = no_sync
             kwargs['accept_partial'] = accept_partial
             kwargs['use_v2_api'] = use_v2_api
-            return self._write_batching(bucket, org, record,
-                                        write_precision, **kwargs)
+            handle = self._create_handle()
+            try:
+                self._write_batching(bucket, org, record,
+                                     write_precision, handle=handle, **kwargs)
+            except Exception as e:
+                handle._release(e)
+                raise
+            handle._release()
+            return handle
+
+        _async_req = True if self._write_options.write_type == WriteType.asynchronous else False
+
+        if write_shards > 1 and not _async_req:
+            self._write_sharded(bucket, org, record, write_precision, write_shards, no_sync, accept_partial,
+                                use_v2_api, **kwargs)
+            return None
 
         payloads = defaultdict(list)
         self._serialize(record, write_precision, payloads, **kwargs)
 
-        _async_req = True if self._write_options.write_type == WriteType.asynchronous else False
-
         def write_payload(payload):
             final_string = b'\n'.join(payload[1])
             return self._post_write(_async_req, bucket, org, final_string, payload[0], no_sync,
@@ -434,6 +640,39 @@ class WriteApi:
             return results[0]
         return results
 
+    def write_body(self, body: bytes, bucket=None, org=None, write_precision: WritePrecision = None,
+                   content_encoding: str = None, **kwargs) -> Any:
+        """
+        Write an already serialized LineProtocol body in one synchronous request.
+
+        The body is neither parsed nor batched, so it can be used to forward large blocks of LineProtocol
+        with minimal overhead regardless of the configured write type.
+
+        :param body: LineProtocol encoded as ``bytes``, lines are separated by ``\\n``.
+        :param bucket: Optional target bucket name. If not specified, the default bucket is used.
+        :param org: Optional target organization. If not specified, the default organization is used.
+        :param write_precision: Optional precision of the timestamps in the body. If not specified, the
+                                precision defined in the write options is used. With ``WritePrecision.AUTO``
+                                the timestamps are expected in nanoseconds and rescaled to the coarsest lossless
+                                precision, the compressed body is sent in nanoseconds as is.
+        :param content_encoding: Set to ``'gzip'`` if the body is already compressed.
+        :param kwargs: Additional options such as ``no_sync``, ``accept_partial`` or ``use_v2_api``.
+        :return: The HTTP response.
+        """
+        org = org if org is not None else self.org
+        bucket = bucket if bucket is not None else self.bucket
+        if write_precision is None:
+            write_precision = self._write_options.write_precision
+
+        self._write_options.validate()
+        kwargs = dict(kwargs)
+        no_sync, accept_partial, use_v2_api = self._resolve_write_request_options(kwargs)
+        if content_encoding is not None:
+            kwargs['content_encoding'] = content_encoding
+
+        return self._post_write(False, bucket, org, body, write_precision, no_sync, accept_partial, use_v2_api,
+                                **kwargs)
+
     async def post_write_async(self, org, bucket, body, **kwargs):  # noqa: E501,D401,D403
         """
         Writes data to a bucket. Use this endpoint to send data in [line protocol](https://docs.influxdata.com/influxdb/latest/reference/syntax/line-protocol/) format to InfluxDB. InfluxDB Cloud - Does the following when you send a writing request:
@@ -463,6 +702,9 @@ class WriteApi:
                  If the method is called asynchronously,
                  returns the request thread.
         """  # noqa: E501
+        if kwargs.get('precision') == WritePrecision.AUTO:
+            body, kwargs['precision'] = self._resolve_auto_precision(body, kwargs['precision'],
+                                                                     kwargs.get('content_encoding'))
         local_var_params, path, path_params, query_params, header_params, body_params = \
             self._post_write_prepare(org, bucket, body, self.default_header, **kwargs)  # noqa: E501
         use_v2_api = local_var_params['use_v2_api']
@@ -485,7 +727,7 @@ class WriteApi:
 
     def call_api(self, resource_path, method,
                  query_params=None, header_params=None,
-                 body=None, async_req=None, _request_timeout=None, urlopen_kw=None):
+                 body=None, async_req=None, _request_timeout=None, urlopen_kw=None, prepared=False):
         """Make the HTTP request (synchronous) and Return deserialized data.
 
         To make an async_req request, set the async_req parameter.
@@ -502,6 +744,7 @@ class WriteApi:
                                  (connection, read) timeouts.
         :param urlopen_kw: Additional parameters are passed to
                            :meth:`urllib3.request.RequestMethods.request`
+        :param prepared: ``True`` if the query and header parameters are already sanitized
         :return:
             If async_req parameter is True,
             the request will be called asynchronously.
@@ -512,12 +755,13 @@ class WriteApi:
         if not async_req:
             return self._call_api(resource_path, method,
                                   query_params, header_params,
-                                  body, _request_timeout, urlopen_kw)
+                                  body, _request_timeout, urlopen_kw, prepared)
 
         else:
             thread = self.pool.apply_async(self._call_api, (resource_path,
                                                             method, query_params,
-                                                            header_params, body, _request_timeout, urlopen_kw))
+                                                            header_params, body, _request_timeout, urlopen_kw,
+                                                            prepared))
         return thread
 
     def flush(self):
@@ -525,71 +769,73 @@ class WriteApi:
         Flush any buffered writes to InfluxDB without closing the client.
 
         This method immediately sends all buffered data points to the server
-        when using batching write mode. After flushing, the client remains
-        open and ready for more writes.
+        when using batching write mode and waits until the batches of the buffered
+        data points are written or ``max_flush_wait`` expires. The batches sent
+        before the flush, e.g. waiting for a retry, are not awaited. The batching
+        pipeline stays open and accepts writes also during the flush.
 
         For synchronous or asynchronous write modes, this is a no-op since
         data is written immediately.
         """
         if self._write_options.write_type is not WriteType.batching:
             return  # Nothing to flush for synchronous/asynchronous writes
+        subject = self._subject
+        if subject is None:
+            return  # Already closed
 
-        self.close()  # Close existing batching pipeline
+        # Close the buffered window, the handle is completed when its batches are written
+        handle = self._create_handle()
+        subject.on_next(_FlushBarrier(handle))
 
-        # Recreate the batching pipeline for continued use
-        self._subject, self._disposable = self._create_batching_pipeline()
+        max_wait_time = self._write_options.max_flush_wait / 1000
+        if not handle.wait(max_wait_time):
+            logger.warning("Reached max_flush_wait (%s seconds) waiting for batches to finish writing.",
+                           max_wait_time)
 
     def close(self):
         """Flush data and dispose a batching buffer."""
+        completed = self._close_batching() if self._subject is not None else True
+        # the pool is closed after the batches are written, the batches post the split bodies by the pool
         if self._pool is not None:
             self._pool.close()
-            self._pool.join()
+            if completed:
+                self._pool.join()
             self._pool = None
-        if self._subject is None:
-            return  # Already closed
 
+    def _close_batching(self) -> bool:
+        """Complete the batching pipeline and wait for the batches, return ``False`` if the wait expired."""
         self._subject.on_completed()
         self._subject.dispose()
         self._subject = None
 
-        """
-        We impose a maximum wait time to ensure that we do not cause a deadlock if the
-        background thread has exited abnormally
-
-        Each iteration waits 100ms, but sleep expects the unit to be seconds so convert
-        the maximum wait time to seconds.
-
-        We keep a counter of how long we've waited
-        """
+        # We impose a maximum wait time to ensure that we do not cause a deadlock if the
+        # background thread has exited abnormally
         max_wait_time = self._write_options.max_close_wait / 1000
-        waited = 0
-        sleep_period = 0.1
 
         # Wait for writing to finish
-        while not self._disposable.is_disposed:
-            sleep(sleep_period)
-            waited += sleep_period
-
-            # Have we reached the upper limit?
-            if waited >= max_wait_time:
-                logger.warning(
-                    "Reached max_close_wait (%s seconds) waiting for batches to finish writing. Force closing",
-                    max_wait_time
-                )
-                break
+        completed = self._completed.wait(max_wait_time)
+        if not completed:
+            logger.warning(
+                "Reached max_close_wait (%s seconds) waiting for batches to finish writing. Force closing",
+                max_wait_time
+            )
 
         if self._disposable:
             self._disposable = None
+        return completed
 
     def _create_batching_pipeline(self) -> tuple[Subject[Any], rx.abc.DisposableBase]:
         """Create the batching pipeline for collecting and writing data."""
         # Define Subject that listen incoming data and produces writes into InfluxDB
         subject = Subject()
+        # Set when all batches are written after the subject is completed
+        self._completed = threading.Event()
 
         disposable = subject.pipe(
-            # Split incoming data to windows by batch_size or flush_interval
-            ops.window_with_time_or_count(count=self._write_options.batch_size,
-                                          timespan=datetime.timedelta(milliseconds=self._write_options.flush_interval)),
+            # Split incoming data to windows by batch_size, flush_interval or flush()
+            _window_with_time_count_or_flush(count=self._write_options.batch_size,
+                                             timespan=datetime.timedelta(
+                                                 milliseconds=self._write_options.flush_interval)),
             # Map  window into groups defined by 'organization', 'bucket' and 'precision'
             ops.flat_map(lambda window: window.pipe(    # type: ignore
                 # Group window by 'organization', 'bucket' and 'precision'
@@ -597,7 +843,10 @@ class WriteApi:
                 # Create batch (concatenation line protocols by \n)
                 ops.map(lambda group: group.pipe(   # type: ignore
                     ops.to_iterable(),
-                    ops.map(lambda xs: _BatchItem(key=group.key, data=_body_reduce(xs), size=len(xs))))),
+                    ops.flat_map(lambda xs: rx.from_iterable(_batch_reduce(  # type: ignore
+                        group.key, xs,
+                        sort_batch=self._write_options.sort_batch,
+                        group_by_measurement=self._write_options.group_by_measurement))))),
                 # type: ignore
                 ops.merge_all())),
             # Write data into InfluxDB (possibility to retry if its fail)
@@ -610,26 +859,34 @@ class WriteApi:
 
     def _write_batching(self, bucket, org, data,
                         precision=None,
+                        handle: WriteHandle = None,
                         **kwargs):
         if precision is None:
             precision = self._write_options.write_precision
 
         if isinstance(data, bytes):
             _key = _BatchItemKey(bucket, org, precision, **kwargs)
-            self._subject.on_next(_BatchItem(key=_key, data=data))
+            if handle is not None:
+                handle._retain()
+            self._subject.on_next(_BatchItem(key=_key, data=data, handles=(handle,) if handle is not None else ()))
 
         elif isinstance(data, str):
             self._write_batching(bucket, org, data.encode(_UTF_8_encoding),
-                                 precision, **kwargs)
+                                 precision, handle=handle, **kwargs)
 
         elif isinstance(data, Point):
+            point_precision = data.write_precision
+            if precision == WritePrecision.AUTO and point_precision == WritePrecision.NS:
+                point_precision = WritePrecision.AUTO
             self._write_batching(bucket, org,
-                                 data.to_line_protocol(tag_order=kwargs.get('tag_order')),
-                                 data.write_precision, **kwargs)
+                                 data.to_line_protocol(tag_order=kwargs.get('tag_order'),
+                                                       default_tags=kwargs.get('default_tags')),
+                                 point_precision, handle=handle, **kwargs)
 
         elif isinstance(data, dict):
-            self._write_batching(bucket, org, Point.from_dict(data, write_precision=precision, **kwargs),
-                                 precision, **kwargs)
+            self._write_batching(bucket, org,
+                                 Point.from_dict(data, write_precision=_time_precision(precision), **kwargs),
+                                 precision, handle=handle, **kwargs)
 
         elif 'polars' in str(type(data)):
             from influxdb_client_3.write_client.client.write.polars_dataframe_serializer \
@@ -640,7 +897,7 @@ class WriteApi:
             for chunk_idx in range(serializer.number_of_chunks):
                 self._write_batching(bucket, org,
                                      serializer.serialize(chunk_idx),
-                                     precision, **kwargs)
+                                     serializer.precision, handle=handle, **kwargs)
 
         elif 'pandas' in str(type(data)):
             serializer = DataframeSerializer(data, self._point_settings, precision, self._write_options.batch_size,
@@ -648,21 +905,25 @@ class WriteApi:
             for chunk_idx in range(serializer.number_of_chunks):
                 self._write_batching(bucket, org,
                                      serializer.serialize(chunk_idx),
-                                     precision, **kwargs)
+                                     serializer.precision, handle=handle, **kwargs)
 
         elif hasattr(data, "_asdict"):
             # noinspection PyProtectedMember
-            self._write_batching(bucket, org, data._asdict(), precision, **kwargs)
+            self._write_batching(bucket, org, data._asdict(), precision, handle=handle, **kwargs)
 
         elif _HAS_DATACLASS and dataclasses.is_dataclass(data):
-            self._write_batching(bucket, org, dataclasses.asdict(data), precision, **kwargs)
+            self._write_batching(bucket, org, dataclasses.asdict(data), precision, handle=handle, **kwargs)
 
         elif isinstance(data, Iterable):
             for item in data:
-                self._write_batching(bucket, org, item, precision, **kwargs)
+                self._write_batching(bucket, org, item, precision, handle=handle, **kwargs)
 
         elif isinstance(data, Observable):
-            data.subscribe(lambda it: self._write_batching(bucket, org, it, precision, **kwargs))
+            if handle is not None:
+                handle._retain()
+            data.subscribe(lambda it: self._write_batching(bucket, org, it, precision, handle=handle, **kwargs),
+                           on_error=lambda e: handle._release(e) if handle is not None else None,
+                           on_completed=lambda: handle._release() if handle is not None else None)
             pass
 
         return None
@@ -689,7 +950,134 @@ class WriteApi:
 
         return _BatchResponse(data=batch_item)
 
+    def _write_sharded(self, bucket, org, record, write_precision, write_shards, no_sync, accept_partial,
+                       use_v2_api, **kwargs):
+        """Split the write into shards which are serialized, compressed and posted concurrently."""
+
+        def post(body, precision):
+            body, precision = self._resolve_auto_precision(body, precision)
+            # already running concurrently - the pieces over max_request_bytes are sent sequentially
+            for piece in self._split_body(body):
+                self._post_write_bisect(bucket, org, piece, precision, no_sync, accept_partial, use_v2_api,
+                                        **kwargs)
+
+        # a NamedTuple is a single record, not a sequence of records
+        if isinstance(record, (list, tuple)) and not hasattr(record, "_asdict") and len(record) > 1:
+            # serialize shards of records concurrently
+            size = -(-len(record) // write_shards)
+
+            def post_records(records):
+                payloads = defaultdict(list)
+                self._serialize(records, write_precision, payloads, **kwargs)
+                for precision, lines in payloads.items():
+                    post(b'\n'.join(lines), precision)
+
+            self._post_write_concurrently(post_records, [record[i:i + size] for i in range(0, len(record), size)])
+            return
+
+        payloads = defaultdict(list)
+        self._serialize(record, write_precision, payloads, **kwargs)
+        shards = []
+        for precision, lines in payloads.items():
+            body = b'\n'.join(lines)
+            shards.extend((piece, precision) for piece in split_body(body, max(1, -(-len(body) // write_shards))))
+        self._post_write_concurrently(lambda shard: post(*shard), shards)
+
     def _post_write(self, _async_req, bucket, org, body, precision, no_sync, accept_partial, use_v2_api, **kwargs):
+        body, precision = self._resolve_auto_precision(body, precision, kwargs.get('content_encoding'))
+        if _async_req or not isinstance(body, bytes) or kwargs.get('content_encoding') is not None:
+            return self._post_write_request(_async_req, bucket, org, body, precision, no_sync, accept_partial,
+                                            use_v2_api, **kwargs)
+
+        def post(piece, concurrent=False):
+            return self._post_write_bisect(bucket, org, piece, precision, no_sync, accept_partial, use_v2_api,
+                                           concurrent, **kwargs)
+
+        pieces = self._split_body(body)
+        if len(pieces) == 1:
+            return post(pieces[0], concurrent=True)
+
+        logger.debug("Splitting body of %s bytes into %s requests", len(body), len(pieces))
+        self._post_write_concurrently(post, pieces)
+        return None
+
+    @staticmethod
+    def _resolve_auto_precision(body, precision, content_encoding=None):
+        """
+        Rescale the nanosecond timestamps of the ``WritePrecision.AUTO`` body to the coarsest lossless precision.
+
+        The compressed body is not rescaled, it is sent in nanoseconds.
+        """
+        if precision != WritePrecision.AUTO:
+            return body, precision
+        if content_encoding is not None:
+            return body, WritePrecision.NS
+        if isinstance(body, str):
+            body = body.encode(_UTF_8_encoding)
+        if isinstance(body, bytes):
+            return rescale_body(body)
+        return body, WritePrecision.NS
+
+    def _split_body(self, body: bytes) -> list:
+        """Split the body by ``max_request_bytes``."""
+        max_request_bytes = self._write_options.max_request_bytes
+        if not max_request_bytes or len(body) <= max_request_bytes:
+            return [body]
+        return split_body(body, max_request_bytes)
+
+    def _post_write_concurrently(self, post, shards):
+        """Post the shards concurrently and wait for all of them, the failures are reported together."""
+        if len(shards) == 1:
+            post(shards[0])
+            return
+        results = [self.pool.apply_async(post, (shard,)) for shard in shards]
+        errors = {}
+        for index, result in enumerate(results):
+            try:
+                result.get()
+            except Exception as e:
+                errors[index] = e
+        if errors:
+            raise InfluxDBShardedWriteError(errors, len(shards))
+
+    def _post_write_bisect(self, bucket, org, body, precision, no_sync, accept_partial, use_v2_api,
+                           concurrent=False, **kwargs):
+        """
+        Post the body, if it is rejected as too large, split it into halves and post them.
+
+        If ``concurrent`` the second half is posted by the thread pool while the first one is posted by the calling
+        thread. The pool threads post the halves of the halves sequentially, so the pool never waits for itself.
+        The error of the first failed half is raised after both halves are done.
+        """
+        try:
+            return self._post_write_request(False, bucket, org, body, precision, no_sync, accept_partial,
+                                            use_v2_api, **kwargs)
+        except ApiException as e:
+            if e.status != HTTPStatus.REQUEST_ENTITY_TOO_LARGE:
+                raise
+            halves = bisect_body(body)
+            if halves is None:
+                raise
+            logger.debug("Request body of %s bytes is too large, splitting into halves", len(body))
+
+            def post(half):
+                return self._post_write_bisect(bucket, org, half, precision, no_sync, accept_partial, use_v2_api,
+                                               **kwargs)
+
+            if not concurrent:
+                for half in halves:
+                    post(half)
+                return None
+            second = self.pool.apply_async(post, (halves[1],))
+            try:
+                post(halves[0])
+            finally:
+                second.wait()
+            second.get()
+            return None
+
+    def _post_write_request(self, _async_req, bucket, org, body, precision, no_sync, accept_partial, use_v2_api,
+                            **kwargs):
         # Filter out serializer-specific kwargs before passing to _post_write
         http_kwargs = {k: v for k, v in kwargs.items() if k not in SERIALIZER_KWARGS}
         http_kwargs['precision'] = precision
@@ -697,19 +1085,31 @@ class WriteApi:
         http_kwargs['accept_partial'] = accept_partial
         http_kwargs['use_v2_api'] = use_v2_api
 
-        local_var_params, path, path_params, query_params, header_params, body_params = \
-            self._post_write_prepare(org, bucket, body, self.default_header, **http_kwargs)  # noqa: E501
+        if http_kwargs.keys() <= _PREPARED_WRITE_KWARGS:
+            if body is None:
+                raise ValueError("Missing the required parameter `body` when calling `_post_write`")  # noqa: E501
+            path, query_params, header_params = \
+                self._prepare_write(bucket, org, precision, no_sync, accept_partial, use_v2_api)
+            # the default headers can change between the requests, e.g. a refreshed token, they are not prepared
+            if self.default_header:
+                header_params = {**header_params, **self._sanitize_for_serialization(self.default_header)}
+            prepared = True
+        else:
+            local_var_params, path, path_params, query_params, header_params, body = \
+                self._post_write_prepare(org, bucket, body, self.default_header, **http_kwargs)  # noqa: E501
+            use_v2_api = local_var_params['use_v2_api']
+            prepared = False
 
-        use_v2_api = local_var_params['use_v2_api']
         try:
             result = self.call_api(
                 path, 'POST',
                 query_params,
                 header_params,
-                body=body_params,
+                body=body,
                 async_req=_async_req,
-                _request_timeout=local_var_params.get('_request_timeout'),
-                urlopen_kw=http_kwargs.get('urlopen_kw', None))
+                _request_timeout=http_kwargs.get('_request_timeout'),
+                urlopen_kw=http_kwargs.get('urlopen_kw', None),
+                prepared=prepared)
             if _async_req:
                 original_get = result.get
 
@@ -724,26 +1124,51 @@ class WriteApi:
         except ApiException as e:
             raise self._translate_write_exception(e, use_v2_api)
 
+    def _prepare_write(self, bucket, org, precision, no_sync, accept_partial, use_v2_api) -> _PreparedWrite:
+        """
+        Return the prepared write request for the target and options.
+
+        The path, query parameters and headers are built and sanitized once and cached,
+        the ``default_header`` is not cached, it is added to each request.
+        """
+        key = (bucket, org, precision, no_sync, accept_partial, use_v2_api)
+        prepared = self._prepared_writes.get(key)
+        if prepared is None:
+            _, path, _, query_params, header_params, _ = self._post_write_prepare(
+                org, bucket, b'', None, precision=precision, no_sync=no_sync,
+                accept_partial=accept_partial, use_v2_api=use_v2_api)
+            prepared = _PreparedWrite(path=path,
+                                      query_params=tuple(self._sanitize_for_serialization(query_params)),
+                                      header_params=self._sanitize_for_serialization(header_params))
+            if len(self._prepared_writes) >= _PREPARED_WRITES_LIMIT:
+                self._prepared_writes.clear()
+            self._prepared_writes[key] = prepared
+        return prepared
+
     def _call_api(
             self, resource_path, method,
             query_params=None, header_params=None, body=None,
-            _request_timeout=None, urlopen_kw=None):
+            _request_timeout=None, urlopen_kw=None, prepared=False):
 
         # body
         should_gzip = False
-        if body:
+        # body with the Content-Encoding header is already compressed
+        if body and 'Content-Encoding' not in (header_params or {}):
             should_gzip = self._should_gzip(body, self.enable_gzip, self.gzip_threshold)
             body = self._sanitize_for_serialization(body)
             body = self._update_request_body(resource_path, body, should_gzip)
 
         # header parameters
         header_params = header_params or {}
-        self._update_request_header_params(resource_path, header_params, should_gzip)
-        if header_params:
+        if should_gzip:
+            header_params = dict(header_params)
+            self._update_request_header_params(resource_path, header_params, should_gzip)
+        # prepared requests are already sanitized
+        if header_params and not prepared:
             header_params = self._sanitize_for_serialization(header_params)
 
         # query parameters
-        if query_params:
+        if query_params and not prepared:
             query_params = self._sanitize_for_serialization(query_params)
 
         urlopen_kw = urlopen_kw or {}
@@ -770,6 +1195,8 @@ class WriteApi:
         )
 
         self.last_response = response_data
+        if self._write_options.retry_budget is not None:
+            self._write_options.retry_budget.deposit()
 
         return response_data
 
@@ -981,9 +1408,15 @@ class WriteApi:
 
         return False
 
-    @staticmethod
-    def _on_error(ex):
+    def _on_error(self, ex):
         logger.error("unexpected error during batching: %s", ex)
+        # the pipeline is stopped, the pending and the following writes are never acknowledged
+        with self._handles_lock:
+            self._pipeline_error = ex
+            handles = list(self._handles)
+        for handle in handles:
+            handle._fail(ex)
+        self._completed.set()
 
     def _to_response(self, data: _BatchItem, delay: datetime.timedelta):
         return rx.of(data).pipe(
@@ -997,6 +1430,13 @@ class WriteApi:
         )
 
     def _on_next(self, response: _BatchResponse):
+        try:
+            self._on_batch_response(response)
+        finally:
+            for handle in response.data.handles:
+                handle._release(response.exception)
+
+    def _on_batch_response(self, response: _BatchResponse):
         if response.exception:
             logger.error("The batch item wasn't processed successfully because: %s", response.exception)
             if self._error_callback:
@@ -1020,28 +1460,39 @@ class WriteApi:
                 except Exception as e:
                     logger.error("The configured success callback threw an exception: %s", e)
 
+    def _create_handle(self) -> WriteHandle:
+        handle = WriteHandle()
+        with self._handles_lock:
+            self._handles.add(handle)
+            pipeline_error = self._pipeline_error
+        handle.add_done_callback(self._discard_handle)
+        if pipeline_error is not None:
+            handle._fail(pipeline_error)
+        return handle
+
+    def _discard_handle(self, handle: WriteHandle):
+        with self._handles_lock:
+            self._handles.discard(handle)
+
+    def wait_all(self, timeout: float = None) -> None:
+        """
+        Wait until all records written in batching mode are acknowledged.
+
+        The records written after this method is called are not awaited.
+
+        :param timeout: the maximum time to wait in seconds, ``None`` means wait forever
+        :raise TimeoutError: if some records are not acknowledged before the timeout
+        :raise Exception: the exception of the first failed batch
+        """
+        with self._handles_lock:
+            handles = list(self._handles)
+        wait_all(handles, timeout=timeout)
+
     def _on_complete(self):
         self._disposable.dispose()
+        self._completed.set()
         logger.debug("the batching processor was disposed")
 
-    def _append_default_tag(self, key, val, record):
-        from influxdb_client_3.write_client import Point
-        if isinstance(record, bytes) or isinstance(record, str):
-            pass
-        elif isinstance(record, Point):
-            record.tag(key, val)
-        elif isinstance(record, dict):
-            record.setdefault("tags", {})
-            record.get("tags")[key] = val
-        elif isinstance(record, Iterable):
-            for item in record:
-                self._append_default_tag(key, val, item)
-
-    def _append_default_tags(self, record):
-        if self._point_settings.defaultTags and record is not None:
-            for key, val in self._point_settings.defaultTags.items():
-                self._append_default_tag(key, val, record)
-
     def _resolve_write_request_options(self, kwargs):
         no_sync = kwargs.pop('no_sync', self._write_options.no_sync)
         accept_partial = kwargs.pop('accept_partial', self._write_options.accept_partial)
@@ -1064,21 +1515,25 @@ class WriteApi:
         elif isinstance(record, Point):
             precision_from_point = kwargs.get('precision_from_point', True)
             precision = record.write_precision if precision_from_point else write_precision
-            self._serialize(record.to_line_protocol(precision=precision, tag_order=kwargs.get('tag_order')),
-                            precision, payload, **kwargs)
+            key = precision
+            if write_precision == WritePrecision.AUTO and precision in (WritePrecision.NS, WritePrecision.AUTO):
+                precision, key = WritePrecision.NS, WritePrecision.AUTO
+            self._serialize(record.to_line_protocol(precision=precision, tag_order=kwargs.get('tag_order'),
+                                                    default_tags=kwargs.get('default_tags')),
+                            key, payload, **kwargs)
 
         elif isinstance(record, dict):
-            self._serialize(Point.from_dict(record, write_precision=write_precision, **kwargs),
+            self._serialize(Point.from_dict(record, write_precision=_time_precision(write_precision), **kwargs),
                             write_precision, payload, **kwargs)
         elif 'polars' in str(type(record)):
             from influxdb_client_3.write_client.client.write.polars_dataframe_serializer import \
                 PolarsDataframeSerializer
             serializer = PolarsDataframeSerializer(record, self._point_settings, write_precision, **kwargs)
-            self._serialize(serializer.serialize(), write_precision, payload, **kwargs)
+            self._serialize(serializer.serialize(), serializer.precision, payload, **kwargs)
 
         elif 'pandas' in str(type(record)):
             serializer = DataframeSerializer(record, self._point_settings, write_precision, **kwargs)
-            self._serialize(serializer.serialize(), write_precision, payload, **kwargs)
+            self._serialize(serializer.serialize(), serializer.precision, payload, **kwargs)
 
         elif hasattr(record, "_asdict"):
             # noinspection PyProtectedMember
@@ -1106,6 +1561,10 @@ class WriteApi:
         # Remove rx
         del state['_subject']
         del state['_disposable']
+        del state['_handles']
+        del state['_handles_lock']
+        state.pop('_pipeline_error', None)
+        state.pop('_completed', None)
         return state
 
     def __setstate__(self, state):
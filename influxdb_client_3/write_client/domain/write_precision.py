@@ -13,6 +13,8 @@ class WritePrecision(object):
     S = "s"
     US = "us"
     NS = "ns"
+    # client side only: the coarsest precision which doesn't lose information is selected for each write
+    AUTO = "auto"
 
     """
     Attributes:
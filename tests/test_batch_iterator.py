@@ -0,0 +1,159 @@
+import asyncio
+import gc
+import importlib.util
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pyarrow as pa
+
+from influxdb_client_3 import InfluxDBClient3
+from influxdb_client_3.query.batch_iterator import AsyncRecordBatchIterator, RecordBatchIterator, \
+    to_batch_iterator
+from influxdb_client_3.query.query_api import _TableStreamReader
+from tests.util import asyncio_run
+from tests.util.mocks import ConstantFlightServer
+
+
+def _reader(*sizes):
+    batches = []
+    start = 0
+    for size in sizes:
+        batches.append(pa.record_batch([pa.array(range(start, start + size))], names=['value']))
+        start += size
+    reader = _TableStreamReader(pa.Table.from_batches(batches))
+    reader.cancel = Mock(wraps=reader.cancel)
+    return reader
+
+
+class TestRecordBatchIterator(unittest.TestCase):
+
+    def test_batches(self):
+        batches = list(RecordBatchIterator(_reader(3, 4)))
+
+        self.assertEqual([3, 4], [batch.num_rows for batch in batches])
+
+    def test_rechunk(self):
+        batches = list(RecordBatchIterator(_reader(3, 4, 1, 5), batch_rows=4))
+
+        self.assertEqual([4, 4, 4, 1], [batch.num_rows for batch in batches])
+        self.assertEqual(list(range(13)), [value for batch in batches for value in batch.column(0).to_pylist()])
+
+    def test_convert(self):
+        frames = list(to_batch_iterator(_reader(2, 2), 'pandas_batches', batch_rows=3))
+
+        self.assertEqual([[0, 1, 2], [3]], [frame['value'].tolist() for frame in frames])
+
+    @unittest.skipIf(importlib.util.find_spec("polars") is None, 'Polars package not installed')
+    def test_convert_polars(self):
+        frames = list(to_batch_iterator(_reader(2, 2), 'polars_batches'))
+
+        self.assertEqual([[0, 1], [2, 3]], [frame['value'].to_list() for frame in frames])
+
+    def test_close_cancels_stream(self):
+        reader = _reader(2, 2, 2)
+        with RecordBatchIterator(reader) as batches:
+            self.assertEqual(pa.schema([('value', pa.int64())]), batches.schema)
+            next(batches)
+        reader.cancel.assert_called_once()
+        self.assertEqual([], list(batches))
+
+    def test_exhausted_stream_is_not_cancelled(self):
+        reader = _reader(2)
+        with RecordBatchIterator(reader) as batches:
+            list(batches)
+        reader.cancel.assert_not_called()
+
+    def test_invalid_batch_rows(self):
+        with self.assertRaises(ValueError):
+            RecordBatchIterator(_reader(1), batch_rows=0)
+
+
+class TestQueryBatches(unittest.TestCase):
+
+    def test_query_batches(self):
+        with ConstantFlightServer() as server:
+            client = InfluxDBClient3(host=f"http://localhost:{server.port}", org="my_org", database="my_db",
+                                     token="my_token")
+            table = client.query('SELECT * FROM data')
+            with client.query('SELECT * FROM data', mode='batches', batch_rows=2) as batches:
+                rows = [batch.num_rows for batch in batches]
+            frames = list(client.query('SELECT * FROM data', mode='pandas_batches'))
+            client.close()
+
+        self.assertEqual(table.num_rows, sum(rows))
+        self.assertTrue(all(size == 2 for size in rows[:-1]))
+        self.assertEqual(table.num_rows, sum(len(frame) for frame in frames))
+
+
+class TestAsyncRecordBatchIterator(unittest.TestCase):
+
+    @asyncio_run
+    async def test_iterate(self):
+        batches = AsyncRecordBatchIterator(lambda: RecordBatchIterator(_reader(1, 2, 3)))
+
+        self.assertEqual([1, 2, 3], [batch.num_rows async for batch in batches])
+
+    @asyncio_run
+    async def test_back_pressure(self):
+        reader = _reader(*([1] * 20))
+        reads = []
+        read_chunk = reader.read_chunk
+
+        def counting_read_chunk():
+            reads.append(1)
+            return read_chunk()
+
+        reader.read_chunk = counting_read_chunk
+        async with AsyncRecordBatchIterator(lambda: RecordBatchIterator(reader), max_buffered=2) as batches:
+            await batches.__anext__()
+            await asyncio.sleep(0.2)
+            # one consumed, two in the queue and one waiting for the space in the queue
+            self.assertLessEqual(len(reads), 4)
+        reader.cancel.assert_called_once()
+
+    @asyncio_run
+    async def test_error(self):
+        def open_iterator():
+            raise ValueError("failed query")
+
+        with self.assertRaisesRegex(ValueError, "failed query"):
+            async for _ in AsyncRecordBatchIterator(open_iterator):
+                pass
+
+    @asyncio_run
+    async def test_break_without_close(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        readers = [_reader(*([1] * 20)) for _ in range(3)]
+        for reader in readers:
+            async for _ in AsyncRecordBatchIterator(lambda r=reader: RecordBatchIterator(r), executor, max_buffered=1):
+                break
+            gc.collect()
+
+        # the single reading thread is released by each abandoned iterator
+        batches = AsyncRecordBatchIterator(lambda: RecordBatchIterator(_reader(1, 2)), executor)
+        self.assertEqual([1, 2], await asyncio.wait_for(self._collect(batches), timeout=5))
+        for reader in readers:
+            reader.cancel.assert_called_once()
+        executor.shutdown()
+
+    @staticmethod
+    async def _collect(batches):
+        return [batch.num_rows async for batch in batches]
+
+    @asyncio_run
+    async def test_query_stream_async(self):
+        with ConstantFlightServer() as server:
+            client = InfluxDBClient3(host=f"http://localhost:{server.port}", org="my_org", database="my_db",
+                                     token="my_token")
+            table = client.query('SELECT * FROM data')
+            async with client.query_stream_async('SELECT * FROM data', batch_rows=2) as batches:
+                rows = [batch.num_rows async for batch in batches]
+            frames = [frame async for frame in client.query_stream_async('SELECT * FROM data',
+                                                                         mode='pandas_batches')]
+            with self.assertRaises(ValueError):
+                client.query_stream_async('SELECT * FROM data', mode='pandas')
+            client.close()
+
+        self.assertEqual(table.num_rows, sum(rows))
+        self.assertEqual(table.num_rows, sum(len(frame) for frame in frames))
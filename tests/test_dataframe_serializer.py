@@ -91,6 +91,25 @@ class TestDataFrameSerializer(unittest.TestCase):
         ]
         self.assertEqual(expected, actual)
 
+    def test_auto_precision(self):
+        df = pd.DataFrame({
+            "temperature": [72.3, 72.1],
+            "time": pd.to_datetime(["2022-10-01T12:01:00.000Z", "2022-10-01T12:01:00.250Z"]),
+        })
+        serializer = DataframeSerializer(df, PointSettings(), WritePrecision.AUTO,
+                                         data_frame_measurement_name='iot-devices',
+                                         data_frame_timestamp_column='time')
+
+        self.assertEqual(WritePrecision.MS, serializer.precision)
+        self.assertEqual(['iot-devices temperature=72.3 1664625660000',
+                          'iot-devices temperature=72.1 1664625660250'], serializer.serialize())
+
+        df = pd.DataFrame({"temperature": [72.3]}, index=[1664625660000000000])
+        serializer = DataframeSerializer(df, PointSettings(), WritePrecision.AUTO,
+                                         data_frame_measurement_name='iot-devices')
+        self.assertEqual(WritePrecision.S, serializer.precision)
+        self.assertEqual(['iot-devices temperature=72.3 1664625660'], serializer.serialize())
+
     def test_write_nan(self):
         now = pd.Timestamp('2020-04-05 00:00+00:00')
 
@@ -537,3 +556,17 @@ Date;Entry Type;Value;Currencs;Category;Person;Account;Counter Account;Group;Not
                                               data_frame_measurement_name='test')
         self.assertEqual(1, len(points))
         self.assertEqual('test avalue=30.0,bvalue=30.0 1590314400000000000', points[0])
+
+    def test_measurement_column(self):
+        data_frame = pd.DataFrame(data={
+            'measurement': pd.Categorical(['cpu', 'disk usage', 'cpu']),
+            'host': ['a', 'b', 'c'],
+            'value': [1, 2, 3],
+        }, index=pd.to_datetime([1, 2, 3], unit='s'))
+
+        points = data_frame_to_list_of_points(data_frame, PointSettings(), WritePrecision.S,
+                                              data_frame_measurement_column='measurement',
+                                              data_frame_tag_columns=['host'])
+
+        self.assertEqual(['cpu,host=a value=1i 1', 'disk\\ usage,host=b value=2i 2', 'cpu,host=c value=3i 3'],
+                         points)
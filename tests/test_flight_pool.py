@@ -0,0 +1,110 @@
+import gc
+import unittest
+from unittest.mock import Mock
+
+from pyarrow.flight import FlightUnavailableError
+
+from influxdb_client_3 import InfluxDBClient3
+from influxdb_client_3.query.flight_pool import FlightClientPool
+from tests.util.mocks import ConstantFlightServer
+
+
+class _Reader(object):
+    pass
+
+
+class TestFlightClientPool(unittest.TestCase):
+
+    def setUp(self):
+        self.clients = []
+
+    def _factory(self):
+        client = Mock()
+        client.do_get.side_effect = lambda ticket, options: _Reader()
+        self.clients.append(client)
+        return client
+
+    def test_least_loaded_opens_clients_lazily(self):
+        pool = FlightClientPool(self._factory, size=3)
+        self.assertEqual(1, len(self.clients))
+
+        # released streams don't need another client
+        pool.do_get('ticket')
+        pool.do_get('ticket')
+        self.assertEqual([0], pool.loads())
+
+        readers = [pool.do_get('ticket') for _ in range(4)]
+        self.assertEqual([2, 1, 1], pool.loads())
+        self.assertEqual(3, len(self.clients))
+
+        del readers[1:3]
+        gc.collect()
+        self.assertEqual([2, 0, 0], pool.loads())
+        pool.do_get('ticket')
+        self.assertEqual(3, len(self.clients))
+
+    def test_round_robin(self):
+        pool = FlightClientPool(self._factory, size=2, strategy='round_robin')
+        for _ in range(5):
+            pool.do_get('ticket')
+
+        self.assertEqual([3, 2], [client.do_get.call_count for client in self.clients])
+
+    def test_unavailable_client_is_evicted(self):
+        pool = FlightClientPool(self._factory, size=1)
+        reader = pool.do_get('ticket')
+        self.clients[0].do_get.side_effect = FlightUnavailableError("connection reset")
+
+        with self.assertRaises(FlightUnavailableError):
+            pool.do_get('ticket')
+        self.assertEqual([], pool.loads())
+        # the evicted client is closed after its last stream is released
+        self.clients[0].close.assert_not_called()
+        del reader
+        gc.collect()
+        self.clients[0].close.assert_called_once()
+
+        pool.do_get('ticket')
+        self.assertEqual(2, len(self.clients))
+        self.assertEqual([0], pool.loads())
+        self.clients[1].close.assert_not_called()
+
+    def test_failed_call_releases_client(self):
+        pool = FlightClientPool(self._factory)
+        self.clients[0].do_get.side_effect = ValueError("invalid ticket")
+
+        with self.assertRaises(ValueError):
+            pool.do_get('ticket')
+        self.assertEqual([0], pool.loads())
+
+    def test_close(self):
+        pool = FlightClientPool(self._factory, size=2, strategy='round_robin')
+        pool.do_get('ticket')
+        pool.do_get('ticket')
+        pool.close()
+
+        self.assertTrue(all(client.close.called for client in self.clients))
+        self.assertEqual([], pool.loads())
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            FlightClientPool(self._factory, size=0)
+        with self.assertRaises(ValueError):
+            FlightClientPool(self._factory, strategy='random')
+
+
+class TestQueryChannelPool(unittest.TestCase):
+
+    def test_query_many(self):
+        with ConstantFlightServer() as server:
+            client = InfluxDBClient3(host=f"http://localhost:{server.port}", org="my_org", database="my_db",
+                                     token="my_token", query_channel_pool_size=3,
+                                     query_channel_pool_strategy='round_robin')
+            pool = client._query_api._flight_pool
+            results = client.query_many([f"SELECT {i}" for i in range(6)], max_concurrency=3)
+            loads = pool.loads()
+            client.close()
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual([0, 0, 0], loads)
+        self.assertEqual((3, 'round_robin'), (pool.size, pool.strategy))
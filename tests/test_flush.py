@@ -1,8 +1,16 @@
 """Tests for the flush() method in InfluxDBClient3 and WriteApi."""
+import datetime
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
+from reactivex import operators as ops
+from reactivex.scheduler import ThreadPoolScheduler
+from reactivex.subject import Subject
+
 from influxdb_client_3 import InfluxDBClient3, WriteOptions, write_client_options, WriteType
+from influxdb_client_3.write_client.client.write_api import _FLUSH, _window_with_time_count_or_flush
 
 
 class TestFlushMethod(unittest.TestCase):
@@ -81,6 +89,99 @@ class TestFlushMethod(unittest.TestCase):
             client.close()
             client.flush()  # Should not raise
 
+    def test_flush_keeps_pipeline_and_waits_for_in_flight_batches(self):
+        """Test that flush() doesn't rebuild the pipeline and returns when the batches are written."""
+        written = []
+
+        def post_write(*args, **kwargs):
+            time.sleep(0.2)
+            written.append(args[3])
+
+        write_options = WriteOptions(batch_size=1000, flush_interval=60_000, max_close_wait=5_000)
+        with patch('influxdb_client_3.write_client.client.write_api.WriteApi._post_write', side_effect=post_write):
+            client = InfluxDBClient3(host="http://localhost:8086", token="my-token", database="my-db",
+                                     write_client_options=write_client_options(write_options=write_options))
+            try:
+                subject = client._write_api._subject
+                client.write("test,tag=value field=1i")
+                client.flush()
+                self.assertEqual([b"test,tag=value field=1i"], written)
+                self.assertIs(subject, client._write_api._subject)
+
+                # nothing buffered - returns immediately
+                client.flush()
+
+                client.write("test,tag=value field=2i")
+                client.flush()
+                self.assertEqual([b"test,tag=value field=1i", b"test,tag=value field=2i"], written)
+            finally:
+                client.close()
+        self.assertTrue(client._write_api._completed.is_set())
+
+    def test_flush_waits_only_for_flushed_batches(self):
+        """Test that flush() doesn't wait for the batches sent before it or for an incomplete Observable."""
+        retrying = threading.Event()
+        release = threading.Event()
+        written = []
+
+        def post_write(*args, **kwargs):
+            if args[3] == b"test field=1i":
+                retrying.set()
+                release.wait(10)
+            written.append(args[3])
+
+        write_options = WriteOptions(batch_size=1000, flush_interval=60_000, max_flush_wait=5_000,
+                                     write_scheduler=ThreadPoolScheduler(max_workers=2))
+        with patch('influxdb_client_3.write_client.client.write_api.WriteApi._post_write', side_effect=post_write):
+            client = InfluxDBClient3(host="http://localhost:8086", token="my-token", database="my-db",
+                                     write_client_options=write_client_options(write_options=write_options))
+            try:
+                # the batch hanging in the write and the records of an Observable which is not completed
+                client.write("test field=1i")
+                client._write_api._subject.on_next(_FLUSH)
+                self.assertTrue(retrying.wait(5))
+                client.write(Subject())
+
+                client.write("test field=2i")
+                start = time.monotonic()
+                client.flush()
+                self.assertLess(time.monotonic() - start, 2)
+                self.assertEqual([b"test field=2i"], written)
+            finally:
+                release.set()
+                client.close()
+
+    def test_window_closed_by_flush(self):
+        """Test that the flush marker closes the buffered window."""
+        windows = []
+        subject = Subject()
+        subject.pipe(
+            _window_with_time_count_or_flush(count=3, timespan=datetime.timedelta(seconds=60)),
+            ops.flat_map(lambda window: window.pipe(ops.to_list())),
+        ).subscribe(windows.append)
+
+        for item in [1, 2, _FLUSH, _FLUSH, 3, 4, 5, 6, _FLUSH]:
+            subject.on_next(item)
+        subject.on_completed()
+
+        self.assertEqual([[1, 2], [3, 4, 5], [6], []], windows)
+
+    def test_window_closed_by_time(self):
+        """Test that the window is closed after the timespan."""
+        windows = []
+        emitted = threading.Event()
+        subject = Subject()
+        subject.pipe(
+            _window_with_time_count_or_flush(count=10, timespan=datetime.timedelta(milliseconds=50)),
+            ops.flat_map(lambda window: window.pipe(ops.to_list())),
+            ops.filter(lambda window: len(window) > 0),
+        ).subscribe(lambda window: (windows.append(window), emitted.set()))
+
+        subject.on_next(1)
+        self.assertTrue(emitted.wait(5))
+        self.assertEqual([[1]], windows)
+        subject.on_completed()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from influxdb_client_3.write_client.client.write.line_protocol import split_lines, series_key_end, measurement, \
+    timestamp, series_sort_key, split_body, bisect_body, rescale_body, coarsest_precision
+
+
+class TestLineProtocol(unittest.TestCase):
+
+    def test_split_lines(self):
+        self.assertEqual([b'm f=1i 1', b'm f=2i 2'], split_lines(b'm f=1i 1\n\nm f=2i 2\n'))
+        self.assertEqual([], split_lines(b''))
+
+    def test_series_key(self):
+        self.assertEqual(7, series_key_end(b'cpu,h=a f=1i 1'))
+        self.assertEqual(9, series_key_end(b'c\\ pu,h=a f=1i'))
+        self.assertEqual(3, series_key_end(b'cpu'))
+
+        self.assertEqual(b'cpu', measurement(b'cpu,h=a f=1i 1'))
+        self.assertEqual(b'cpu', measurement(b'cpu f=1i 1'))
+        self.assertEqual(b'c\\,pu', measurement(b'c\\,pu,h=a f=1i 1'))
+
+    def test_timestamp(self):
+        self.assertEqual(1, timestamp(b'cpu,h=a f=1i 1'))
+        self.assertEqual(-5, timestamp(b'cpu f=1i -5\r'))
+        self.assertIsNone(timestamp(b'cpu,h=a f=1i'))
+        self.assertIsNone(timestamp(b'cpu f="a 12"'))
+        self.assertIsNone(timestamp(b'cpu'))
+
+    def test_series_sort_key(self):
+        lines = [b'mem,h=a f=1i 3', b'cpu,h=b f=1i 1', b'cpu+x f=1i 1', b'cpu,h=a f=1i 2', b'cpu f=1i 4',
+                 b'cpu,h=a f=1i 1', b'cpu,h=a f=1i']
+        self.assertEqual([b'cpu f=1i 4', b'cpu,h=a f=1i', b'cpu,h=a f=1i 1', b'cpu,h=a f=1i 2', b'cpu,h=b f=1i 1',
+                          b'cpu+x f=1i 1', b'mem,h=a f=1i 3'], sorted(lines, key=series_sort_key))
+
+    def test_split_body(self):
+        body = b"aaaa\nbb\ncccccccc\n\nd\n"
+        self.assertEqual([b"aaaa", b"bb", b"cccccccc", b"d"], split_body(body, 4))
+        self.assertEqual([b"aaaa\nbb", b"cccccccc", b"d"], split_body(body, 7))
+        self.assertEqual([b"aaaa\nbb\ncccccccc\n\nd"], split_body(body, 100))
+        self.assertEqual([], split_body(b"\n\n", 1))
+
+    def test_bisect_body(self):
+        self.assertEqual((b"aaaa\nbb", b"cccccccc\n\nd"), bisect_body(b"aaaa\nbb\ncccccccc\n\nd\n"))
+        self.assertEqual((b"a", b"b"), bisect_body(b"a\nb"))
+        self.assertIsNone(bisect_body(b"single line\n"))
+
+    def test_rescale_body(self):
+        self.assertEqual((b"m f=1 1700000000\nm f=2 1700000060", "s"),
+                         rescale_body(b"m f=1 1700000000000000000\nm f=2 1700000060000000000\n"))
+        self.assertEqual((b"m f=1 1700000000000\nm f=2 -1700000060001", "ms"),
+                         rescale_body(b"m f=1 1700000000000000000\nm f=2 -1700000060001000000"))
+        self.assertEqual((b"m f=1 0\nm f=2 1700000000001", "ms"),
+                         rescale_body(b"m f=1 0\nm f=2 1700000000001000000"))
+        self.assertEqual((b"m f=1 1000\nm f=2 1", "ns"), rescale_body(b"m f=1 1000\nm f=2 1"))
+        # the server assigns the time of lines without timestamp in the precision of the request
+        self.assertEqual((b"m f=1\nm f=2 1000000000", "ns"), rescale_body(b"m f=1\nm f=2 1000000000"))
+        self.assertEqual((b'm f="a b 1000" 1', "s"), rescale_body(b'm f="a b 1000" 1000000000'))
+
+    def test_coarsest_precision(self):
+        self.assertEqual("s", coarsest_precision(np.array([1_000_000_000, 0, -3_000_000_000])))
+        self.assertEqual("ms", coarsest_precision(np.array([1_000_000_000, 1_001_000_000])))
+        self.assertEqual("us", coarsest_precision(np.array([1_000])))
+        self.assertEqual("ns", coarsest_precision(np.array([1_000, 1])))
@@ -0,0 +1,134 @@
+import os
+import re
+import tempfile
+import threading
+import time
+import unittest
+
+import pandas as pd
+import polars as pl
+import pytest
+import pyarrow as pa
+from pytest_httpserver import HTTPServer
+
+from influxdb_client_3 import WriteOptions
+from influxdb_client_3.write_client.client.util.multiprocessing_helper import MultiprocessingWriter, \
+    _SharedArrowRecord
+
+
+class TestSharedArrowRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def test_polars(self):
+        df = pl.DataFrame({'value': [1.0, 2.0], 'tag': ['a', 'b']})
+        shared = _SharedArrowRecord.create(df, self.directory)
+        self.assertEqual('polars', shared.kind)
+        self.assertTrue(os.path.exists(shared.path))
+
+        self.assertTrue(df.equals(shared.load()))
+        self.assertFalse(os.path.exists(shared.path))
+
+    def test_arrow(self):
+        table = pa.table({'value': [1, 2, 3]})
+        shared = _SharedArrowRecord.create(table, self.directory)
+        self.assertEqual('arrow', shared.kind)
+        self.assertEqual([1, 2, 3], shared.load()['value'].to_list())
+
+    def test_pandas_is_not_shared(self):
+        df = pd.DataFrame({'value': [1.0, 2.0]})
+        self.assertIsNone(_SharedArrowRecord.create(df, self.directory))
+
+    def test_unlink_all(self):
+        shared = [_SharedArrowRecord.create(pa.table({'value': [1]}), self.directory, prefix)
+                  for prefix in ['writer-a', 'writer-a', 'writer-b']]
+        _SharedArrowRecord.unlink_all(self.directory, 'writer-a')
+
+        self.assertEqual([os.path.basename(shared[2].path)], os.listdir(self.directory))
+
+    def test_not_supported(self):
+        self.assertIsNone(_SharedArrowRecord.create("mem,tag=a value=1", self.directory))
+        self.assertEqual([], os.listdir(self.directory))
+
+
+class TestMultiprocessingWriter:
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match='workers must be a positive number'):
+            MultiprocessingWriter(host='http://localhost:8086', workers=0)
+        with pytest.raises(ValueError, match="Unsupported sharding: 'hash'"):
+            MultiprocessingWriter(host='http://localhost:8086', sharding='hash')
+
+    def test_select_queue(self):
+        writer = MultiprocessingWriter(host='http://localhost:8086', database='db', workers=3)
+        try:
+            assert [writer._select_queue({}) for _ in range(4)] == \
+                   [writer.queues[0], writer.queues[1], writer.queues[2], writer.queues[0]]
+
+            writer.sharding = 'database'
+            assert writer._select_queue({'bucket': 'db1'}) is writer._select_queue({'bucket': 'db1'})
+            assert writer._select_queue({}) is writer._select_queue({'bucket': 'db'})
+        finally:
+            writer.__del__()
+
+    def test_workers_shared_memory(self, httpserver: HTTPServer):
+        httpserver.expect_request(re.compile(".*")).respond_with_data(status=204)
+        directory = tempfile.mkdtemp()
+
+        with MultiprocessingWriter(host=httpserver.url_for("/"), database='db', token='my-token', org='my-org',
+                                   workers=2, shared_memory=True, shared_memory_dir=directory,
+                                   write_options=WriteOptions(batch_size=1)) as writer:
+            for x in range(4):
+                df = pl.DataFrame({'value': [x], 'time': [x]})
+                writer.write(bucket='db', record=df, data_frame_measurement_name='mem',
+                             data_frame_timestamp_column='time', write_precision='s')
+            # the record which is not mapped by a worker is removed on close
+            _SharedArrowRecord.create(pa.table({'value': [1]}), directory, writer._shared_memory_prefix)
+
+        bodies = sorted(request.get_data() for request, _ in httpserver.log)
+        assert bodies == [f'mem value={x}i {x}'.encode() for x in range(4)]
+        assert os.listdir(directory) == []
+
+    def test_idle_worker_is_restarted(self, httpserver: HTTPServer):
+        httpserver.expect_request(re.compile(".*")).respond_with_data(status=204)
+
+        with MultiprocessingWriter(host=httpserver.url_for("/"), database='db', token='my-token', org='my-org',
+                                   workers=2, sharding='database', process_ttl=1,
+                                   write_options=WriteOptions(batch_size=1)) as writer:
+            assert writer._select_worker({'bucket': 'db'}) != writer._select_worker({'bucket': 'db1'})
+            writer.write(bucket='db', record='mem value=1i 1')
+            writer.write(bucket='db1', record='mem value=2i 2')
+            deadline = time.time() + 30
+            while not all(writer.exited) and time.time() < deadline:
+                time.sleep(0.1)
+            assert list(writer.exited) == [1, 1]
+            assert writer.disposed.value == 0
+
+            # the exited worker is started again, the other one stays exited
+            writer.write(bucket='db', record='mem value=3i 3')
+            assert sorted(writer.exited) == [0, 1]
+
+        bodies = sorted(request.get_data() for request, _ in httpserver.log)
+        assert bodies == [b'mem value=1i 1', b'mem value=2i 2', b'mem value=3i 3']
+        assert not any(process.is_alive() for process in writer.processes)
+
+    def test_close_while_worker_exits(self, httpserver: HTTPServer):
+        httpserver.expect_request(re.compile(".*")).respond_with_data(status=204)
+
+        writer = MultiprocessingWriter(host=httpserver.url_for("/"), database='db', token='my-token', org='my-org',
+                                       process_ttl=1, write_options=WriteOptions(batch_size=1))
+        writer.start()
+        writer.write(bucket='db', record='mem value=1i 1')
+        # the close takes the lock first, the worker exiting after process_ttl waits for it
+        lock = writer.exited.get_lock()
+        lock.acquire()
+        closing = threading.Thread(target=writer.__del__, daemon=True)
+        closing.start()
+        time.sleep(2)
+        lock.release()
+        closing.join(30)
+
+        assert not closing.is_alive()
+        assert not any(process.is_alive() for process in writer.processes)
+        assert [request.get_data() for request, _ in httpserver.log] == [b'mem value=1i 1']
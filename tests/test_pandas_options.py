@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import Mock
+
+import pandas as pd
+import pyarrow as pa
+
+from influxdb_client_3 import InfluxDBClient3, PandasOptions, QueryCache
+from tests.util import asyncio_run
+from tests.util.mocks import ConstantFlightServer
+
+
+def _table():
+    return pa.table({'host': pa.array(['a', 'b', 'a']).dictionary_encode(),
+                     'region': ['us', 'eu', 'us'],
+                     'value': [1.5, 2.5, None]})
+
+
+class TestPandasOptions(unittest.TestCase):
+
+    def test_default(self):
+        df = PandasOptions().to_pandas(_table())
+
+        self.assertEqual(_table().to_pandas().dtypes.tolist(), df.dtypes.tolist())
+
+    def test_memory_efficient(self):
+        df = PandasOptions.memory_efficient().to_pandas(_table())
+
+        self.assertIsInstance(df['host'].dtype, pd.CategoricalDtype)
+        self.assertEqual(pd.ArrowDtype(pa.string()), df['region'].dtype)
+        self.assertEqual(pd.ArrowDtype(pa.float64()), df['value'].dtype)
+        self.assertTrue(pd.isna(df['value'][2]))
+
+    def test_conversion_options(self):
+        data = Mock()
+        PandasOptions.memory_efficient(use_threads=False).to_pandas(data)
+        PandasOptions.memory_efficient().to_pandas(data, owned=False)
+        PandasOptions(strings_to_categorical=True).to_pandas(data)
+
+        owned, shared, categorical = [call.kwargs for call in data.to_pandas.call_args_list]
+        self.assertEqual((True, True, False), (owned['self_destruct'], owned['split_blocks'], owned['use_threads']))
+        self.assertIn('types_mapper', owned)
+        self.assertNotIn('self_destruct', shared)
+        self.assertEqual({'split_blocks': False, 'use_threads': True, 'strings_to_categorical': True}, categorical)
+
+
+class TestQueryPandasOptions(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = QueryCache()
+        self.client = InfluxDBClient3(host="localhost", org="my_org", database="my_db", token="my_token")
+        self.client._query_api._do_get = Mock(side_effect=lambda ticket, options: Mock(read_all=_table))
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_query(self):
+        df = self.client.query('SELECT * FROM cpu', mode='pandas', pandas_options=PandasOptions.memory_efficient())
+        frame = self.client.query_dataframe('SELECT * FROM cpu', pandas_options=PandasOptions.memory_efficient())
+
+        self.assertEqual(pd.ArrowDtype(pa.string()), df['region'].dtype)
+        self.assertEqual(df['region'].dtype, frame['region'].dtype)
+
+    def test_cached_table_is_not_released(self):
+        client = InfluxDBClient3(host="localhost", org="my_org", database="my_db", token="my_token",
+                                 query_cache=self.cache)
+        client._query_api._do_get = self.client._query_api._do_get
+        for _ in range(3):
+            df = client.query('SELECT * FROM cpu', mode='pandas', pandas_options=PandasOptions.memory_efficient())
+            self.assertEqual(['a', 'b', 'a'], df['host'].tolist())
+        client.close()
+
+        self.assertEqual(2, self.cache.stats().hits)
+
+    @asyncio_run
+    async def test_query_async(self):
+        df = await self.client.query_async('SELECT * FROM cpu', mode='pandas',
+                                           pandas_options=PandasOptions(arrow_dtypes=True))
+
+        self.assertEqual(pd.ArrowDtype(pa.float64()), df['value'].dtype)
+
+    def test_pandas_batches(self):
+        with ConstantFlightServer() as server:
+            client = InfluxDBClient3(host=f"http://localhost:{server.port}", org="my_org", database="my_db",
+                                     token="my_token")
+            table = client.query('SELECT * FROM data')
+            frames = list(client.query('SELECT * FROM data', mode='pandas_batches',
+                                       pandas_options=PandasOptions.memory_efficient()))
+            client.close()
+
+        self.assertEqual(table.num_rows, sum(len(frame) for frame in frames))
+        self.assertTrue(all(isinstance(dtype, pd.ArrowDtype) for frame in frames for dtype in frame.dtypes))
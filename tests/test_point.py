@@ -2,7 +2,7 @@ import datetime
 import unittest
 
 from influxdb_client_3 import WritePrecision
-from influxdb_client_3.write_client.client.write.point import EPOCH, Point, _np_is_subtype
+from influxdb_client_3.write_client.client.write.point import EPOCH, Point, _np_is_subtype, render_default_tags
 
 
 class TestPoint(unittest.TestCase):
@@ -26,6 +26,21 @@ class TestPoint(unittest.TestCase):
         self.assertEqual('h2o,region=us-east,host=h1,rack=r1 level=2i',
                          point.to_line_protocol(tag_order=["region", "", "host", "region", "missing"]))
 
+    def test_point_default_tags(self):
+        default_tags = render_default_tags({"zone": "eu west", "dc": "d1", "empty": "", "missing": None})
+        self.assertEqual({"dc": "dc=d1", "zone": "zone=eu\\ west"}, default_tags)
+
+        point = Point.measurement("h2o").field("level", 2)
+        self.assertEqual('h2o,dc=d1,zone=eu\\ west level=2i', point.to_line_protocol(default_tags=default_tags))
+
+        point = Point.measurement("h2o").tag("host", "h1").tag("dc", "d2").field("level", 2)
+        self.assertEqual('h2o,dc=d1,host=h1,zone=eu\\ west level=2i',
+                         point.to_line_protocol(default_tags=default_tags))
+        self.assertEqual('h2o,zone=eu\\ west,host=h1,dc=d1 level=2i',
+                         point.to_line_protocol(tag_order=["zone", "host"], default_tags=default_tags))
+        # the point itself is not modified
+        self.assertEqual('h2o,dc=d2,host=h1 level=2i', point.to_line_protocol())
+
     def test_point_field_types_and_time_conversion(self):
         point = Point.measurement("m") \
             .field("drop", None) \
@@ -122,6 +122,28 @@ class TestPolarsDataFrameSerializer(unittest.TestCase):
                 data_frame_measurement_name='iot-devices',
                 data_frame_timestamp_column='time')
 
+    def test_to_list_of_points_with_auto_precision(self):
+        import polars as pl
+        ps = PointSettings()
+        df = pl.DataFrame(data={
+            "temperature": [72.3, 72.1],
+            "time": pl.Series(["2022-10-01T12:01:00Z", "2022-10-01T12:02:00Z"]).str.to_datetime(time_unit='ns')
+        })
+
+        actual = polars_data_frame_to_list_of_points(
+            df, ps, precision='auto',
+            data_frame_measurement_name='iot-devices',
+            data_frame_timestamp_column='time')
+        self.assertEqual(['iot-devices temperature=72.3 1664625660', 'iot-devices temperature=72.1 1664625720'],
+                         actual)
+
+        df = pl.DataFrame(data={"temperature": [72.3], "time": [1664625660001000000]})
+        actual = polars_data_frame_to_list_of_points(
+            df, ps, precision='auto',
+            data_frame_measurement_name='iot-devices',
+            data_frame_timestamp_column='time')
+        self.assertEqual(['iot-devices temperature=72.3 1664625660001'], actual)
+
     def test_escape_for_key(self):
         import polars as pl
         ps = PointSettings(tag="prod")
@@ -0,0 +1,311 @@
+import json
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from unittest.mock import Mock
+
+import pandas as pd
+import pyarrow as pa
+
+from influxdb_client_3 import InfluxDBClient3, QueryCache, SchemaCache
+from tests.util import asyncio_run
+from tests.util.mocks import ConstantFlightServer
+
+
+def _table(rows=3):
+    return pa.table({'host': ['a'] * rows, 'value': list(range(rows))})
+
+
+class TestQueryCache(unittest.TestCase):
+
+    def test_get_put(self):
+        cache = QueryCache()
+        key = QueryCache.key('db', 'sql', 'SELECT 1', {'b': 2, 'a': 1})
+
+        self.assertIsNone(cache.get(key))
+        self.assertTrue(cache.put(key, _table()))
+        self.assertEqual(_table(), cache.get(QueryCache.key('db', 'sql', 'SELECT 1', {'a': 1, 'b': 2})))
+        self.assertIsNone(cache.get(QueryCache.key('db', 'sql', 'SELECT 1', {'a': 1})))
+
+        stats = cache.stats()
+        self.assertEqual((1, 2, 0, 0, 1), (stats.hits, stats.misses, stats.evictions, stats.expirations, stats.entries))
+        self.assertEqual(_table().nbytes, stats.size_bytes)
+
+    def test_lru_eviction_by_size(self):
+        size = _table().nbytes
+        cache = QueryCache(max_bytes=2 * size)
+        cache.put('a', _table())
+        cache.put('b', _table())
+        cache.get('a')
+        cache.put('c', _table())
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+        self.assertEqual(1, cache.stats().evictions)
+        self.assertEqual(2 * size, cache.stats().size_bytes)
+
+        self.assertFalse(cache.put('large', _table(1000)))
+        self.assertEqual(2, len(cache))
+
+    def test_ttl(self):
+        cache = QueryCache(ttl=10)
+        with mock.patch.object(QueryCache, '_clock', return_value=100):
+            cache.put('a', _table())
+            cache.put('b', _table(), ttl=60)
+        with mock.patch.object(QueryCache, '_clock', return_value=110):
+            self.assertIsNone(cache.get('a'))
+            self.assertIsNotNone(cache.get('b'))
+        self.assertEqual(1, cache.stats().expirations)
+        self.assertEqual(1, len(cache))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            QueryCache(max_bytes=0)
+        with self.assertRaises(ValueError):
+            QueryCache(ttl=0)
+
+
+class TestQueryApiCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = QueryCache()
+        self.client = InfluxDBClient3(host="localhost", org="my_org", database="my_db", token="my_token",
+                                      query_cache=self.cache)
+        self.do_get = Mock()
+        self.do_get.return_value.read_all.return_value = _table()
+        self.client._query_api._do_get = self.do_get
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_modes_served_from_cache(self):
+        self.assertEqual(_table(), self.client.query('SELECT * FROM cpu'))
+        self.assertEqual([0, 1, 2], self.client.query('SELECT * FROM cpu', mode='pandas')['value'].tolist())
+        self.assertEqual(_table().schema, self.client.query('SELECT * FROM cpu', mode='schema'))
+        self.assertEqual(_table(), self.client.query('SELECT * FROM cpu', mode='reader').read_all())
+        chunks = [chunk.data for chunk in self.client.query('SELECT * FROM cpu', mode='chunk')]
+        self.assertEqual(_table(), pa.Table.from_batches(chunks))
+
+        self.do_get.assert_called_once()
+        self.assertEqual(4, self.cache.stats().hits)
+
+    def test_key_contains_parameters_and_database(self):
+        self.client.query('SELECT * FROM cpu WHERE host=$host', query_parameters={'host': 'a'})
+        self.client.query('SELECT * FROM cpu WHERE host=$host', query_parameters={'host': 'b'})
+        self.client.query('SELECT * FROM cpu WHERE host=$host', query_parameters={'host': 'a'}, database='other')
+        self.client.query('SELECT * FROM cpu WHERE host=$host', query_parameters={'host': 'a'})
+
+        self.assertEqual(3, self.do_get.call_count)
+
+    def test_bypass(self):
+        self.client.query('SELECT * FROM cpu')
+        self.client.query('SELECT * FROM cpu', use_cache=False)
+
+        self.assertEqual(2, self.do_get.call_count)
+        self.assertEqual(1, len(self.cache))
+        # the cache arguments are not passed into FlightCallOptions
+        self.client.query('SELECT * FROM mem', cache_ttl=5)
+        self.assertEqual(3, self.do_get.call_count)
+
+    def test_without_cache(self):
+        client = InfluxDBClient3(host="localhost", org="my_org", database="my_db", token="my_token")
+        client._query_api._do_get = self.do_get
+        client.query('SELECT * FROM cpu', use_cache=True)
+        client.query('SELECT * FROM cpu')
+
+        self.assertEqual(2, self.do_get.call_count)
+        client.close()
+
+    @asyncio_run
+    async def test_query_async(self):
+        with ConstantFlightServer() as server:
+            client = InfluxDBClient3(host=f"http://localhost:{server.port}", org="my_org", database="my_db",
+                                     token="my_token", query_cache=self.cache)
+            first = await client.query_async('SELECT * FROM data')
+            second = await client.query_async('SELECT * FROM data', mode='pandas')
+            client.close()
+
+        self.assertEqual(first.num_rows, len(second))
+        self.assertEqual(1, self.cache.stats().hits)
+        self.assertEqual(1, self.cache.stats().misses)
+
+
+class TestQueryTimeRange(unittest.TestCase):
+    NOW = datetime(2024, 1, 1, 12, 0, 30, tzinfo=timezone.utc)
+
+    def setUp(self):
+        self.cache = QueryCache()
+        self.client = InfluxDBClient3(host="localhost", org="my_org", database="my_db", token="my_token",
+                                      query_cache=self.cache)
+        self.ranges = []
+        self.fields = ['value']
+        self.client._query_api._do_get = self._do_get
+        patcher = mock.patch.object(type(self.client._query_api), '_now', return_value=self.NOW)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.client.close()
+
+    def _do_get(self, ticket, options):
+        """Return a row every 10 seconds of the requested range."""
+        params = json.loads(ticket.ticket)['params']
+        self.ranges.append((params['start'], params['end']))
+        start, end = pd.Timestamp(params['start']), min(pd.Timestamp(params['end']), pd.Timestamp(self.NOW))
+        times = pd.date_range(start, end, freq='10s', inclusive='left')
+        reader = Mock()
+        reader.read_all.return_value = pa.table({'time': pa.array(times.as_unit('ns')),
+                                                 **{field: list(range(len(times))) for field in self.fields}})
+        return reader
+
+    def query(self, start, end=None, **kwargs):
+        return self.client.query_time_range('SELECT * FROM cpu WHERE time >= $start AND time < $end',
+                                            start=start, end=end, bucket_size=timedelta(minutes=1), **kwargs)
+
+    def test_fetch_only_missing_buckets(self):
+        first = self.query(datetime(2024, 1, 1, 11, 57, 15))
+        self.assertEqual([('2024-01-01T11:57:00Z', '2024-01-01T12:01:00Z')], self.ranges)
+        self.assertEqual(19, first.num_rows)
+        self.assertEqual(pd.Timestamp('2024-01-01T11:57:20Z'), first['time'][0].as_py())
+
+        # the open bucket is fetched again, the closed buckets come from the cache
+        self.ranges.clear()
+        second = self.query(datetime(2024, 1, 1, 11, 55))
+        self.assertEqual([('2024-01-01T11:55:00Z', '2024-01-01T11:57:00Z'),
+                          ('2024-01-01T12:00:00Z', '2024-01-01T12:01:00Z')], self.ranges)
+        self.assertEqual(33, second.num_rows)
+        self.assertEqual(sorted(second['time'].to_pylist()), second['time'].to_pylist())
+        self.assertEqual(3, self.cache.stats().hits)
+        self.assertEqual(5, len(self.cache))
+
+    def test_field_added_after_cached_buckets(self):
+        self.query(datetime(2024, 1, 1, 11, 58))
+        self.fields = ['usage', 'value']
+        result = self.query(datetime(2024, 1, 1, 11, 57))
+
+        # the cached buckets of 11:58 and 11:59 don't have the new field
+        self.assertEqual(['time', 'usage', 'value'], result.column_names)
+        self.assertEqual(list(range(6)) + [None] * 12 + list(range(3)), result['usage'].to_pylist())
+
+    def test_closed_range(self):
+        result = self.query(datetime(2024, 1, 1, 11, 58), datetime(2024, 1, 1, 11, 59, 30), mode='pandas')
+        result = self.query(datetime(2024, 1, 1, 11, 58), datetime(2024, 1, 1, 11, 59, 30), mode='pandas')
+
+        self.assertEqual(1, len(self.ranges))
+        self.assertEqual(9, len(result))
+
+    def test_without_cache(self):
+        self.query(datetime(2024, 1, 1, 11, 58, 15), use_cache=False)
+
+        self.assertEqual([('2024-01-01T11:58:15Z', '2024-01-01T12:00:30Z')], self.ranges)
+        self.assertEqual(0, len(self.cache))
+
+    def test_invalid_range(self):
+        with self.assertRaises(ValueError):
+            self.query(datetime(2024, 1, 1, 12, 0), datetime(2024, 1, 1, 11, 0))
+
+
+class TestQuerySchema(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = SchemaCache()
+        self.client = InfluxDBClient3(host="localhost", org="my_org", database="my_db", token="my_token",
+                                      query_schema_cache=self.cache)
+        self.do_get = Mock()
+        self.do_get.return_value.schema = _table().schema
+        self.client._query_api._do_get = self.do_get
+
+    def tearDown(self):
+        self.client.close()
+
+    def _query(self, call=0):
+        return json.loads(self.do_get.call_args_list[call][0][0].ticket)
+
+    def test_limit_zero(self):
+        self.assertEqual(_table().schema, self.client.query_schema('SELECT * FROM cpu;', query_parameters={'a': 1}))
+
+        ticket = self._query()
+        self.assertEqual('SELECT * FROM (\nSELECT * FROM cpu\n) AS schema_query LIMIT 0', ticket['sql_query'])
+        self.assertEqual({'a': 1}, ticket['params'])
+        self.do_get.return_value.cancel.assert_called_once()
+
+    def test_trailing_comment(self):
+        self.client.query_schema('SELECT * FROM cpu -- all hosts')
+
+        self.assertEqual('SELECT * FROM (\nSELECT * FROM cpu -- all hosts\n) AS schema_query LIMIT 0',
+                         self._query()['sql_query'])
+
+    def test_not_cached_by_default(self):
+        client = InfluxDBClient3(host="localhost", org="my_org", database="my_db", token="my_token")
+        client._query_api._do_get = self.do_get
+        client.query_schema('SELECT * FROM cpu')
+        client.query('SELECT * FROM cpu', mode='schema')
+        client.close()
+
+        self.assertEqual(2, self.do_get.call_count)
+
+    def test_cache_ttl(self):
+        with mock.patch.object(SchemaCache, '_clock', return_value=100):
+            self.client.query('SELECT * FROM cpu', mode='schema', cache_ttl=5)
+            self.client.query_schema('SELECT * FROM mem', cache_ttl=20)
+        with mock.patch.object(SchemaCache, '_clock', return_value=110):
+            self.client.query('SELECT * FROM cpu', mode='schema')
+            self.client.query_schema('SELECT * FROM mem')
+
+        self.assertEqual(3, self.do_get.call_count)
+        self.assertEqual(1, self.cache.stats().expirations)
+
+    def test_cached(self):
+        self.client.query_schema('SELECT * FROM cpu')
+        self.client.query('SELECT * FROM cpu', mode='schema')
+        self.client.query_schema('SELECT * FROM mem')
+        self.client.query_schema('SELECT * FROM cpu', database='other')
+        self.client.query_schema('SELECT * FROM cpu', use_cache=False)
+
+        self.assertEqual(4, self.do_get.call_count)
+
+    def test_query_mode_schema(self):
+        self.assertEqual(_table().schema, self.client.query('SHOW TABLES', mode='schema'))
+        self.assertEqual(_table().schema, self.client.query('SELECT * FROM cpu', language='influxql', mode='schema'))
+        self.assertEqual(_table().schema, self.client.query('SELECT * FROM a JOIN b ON a.id = b.id', mode='schema'))
+
+        # the queries of the schema mode are not rewritten
+        self.assertEqual('SHOW TABLES', self._query(0)['sql_query'])
+        self.assertEqual('SELECT * FROM cpu', self._query(1)['sql_query'])
+        self.assertEqual('SELECT * FROM a JOIN b ON a.id = b.id', self._query(2)['sql_query'])
+        self.assertEqual(3, self.do_get.return_value.cancel.call_count)
+
+    def test_without_limit_zero(self):
+        self.client.query_schema('SELECT * FROM a JOIN b ON a.id = b.id', limit_zero=False)
+
+        self.assertEqual('SELECT * FROM a JOIN b ON a.id = b.id', self._query()['sql_query'])
+
+    @asyncio_run
+    async def test_query_async_mode_schema(self):
+        self.assertEqual(_table().schema, await self.client.query_async('WITH t AS (SELECT 1) SELECT * FROM t',
+                                                                        mode='schema'))
+        self.assertEqual('WITH t AS (SELECT 1) SELECT * FROM t', self._query()['sql_query'])
+
+    def test_schema_cache(self):
+        cache = SchemaCache(max_entries=2)
+        cache.put('a', _table().schema)
+        cache.put('b', _table().schema)
+        cache.put('c', _table().schema)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(2, len(cache))
+        stats = cache.stats()
+        self.assertEqual((1, 1, 2), (stats.misses, stats.evictions, stats.entries))
+        with self.assertRaises(ValueError):
+            SchemaCache(max_entries=0)
+
+    def test_flight_server(self):
+        with ConstantFlightServer() as server:
+            client = InfluxDBClient3(host=f"http://localhost:{server.port}", org="my_org", database="my_db",
+                                     token="my_token", query_schema_cache=SchemaCache(ttl=5))
+            schema = client.query_schema('SELECT * FROM data')
+            table = client.query('SELECT * FROM data')
+            client.close()
+
+        self.assertEqual(table.schema, schema)
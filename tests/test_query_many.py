@@ -0,0 +1,220 @@
+import json
+import threading
+import time
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+from unittest.mock import Mock
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import ArrowInvalid
+
+from influxdb_client_3 import InfluxDBClient3
+from influxdb_client_3.exceptions import InfluxDB3ClientQueryError
+from influxdb_client_3.query.query_cache import _merge_by_time
+from tests.util import asyncio_run
+from tests.util.mocks import ConstantFlightServer
+
+
+class TestQueryMany(unittest.TestCase):
+
+    def setUp(self):
+        self.client = InfluxDBClient3(host="localhost", org="my_org", database="my_db", token="my_token")
+        self.running = 0
+        self.max_running = 0
+        self.options = []
+        self.lock = threading.Lock()
+        self.client._query_api._do_get = self._do_get
+
+    def tearDown(self):
+        self.client.close()
+
+    def _do_get(self, ticket, options):
+        """Return the query text after a delay depending on the query, 'fail' raises an error."""
+        ticket_data = json.loads(ticket.ticket)
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            self.options.append(options)
+        try:
+            query = ticket_data['sql_query']
+            time.sleep(0.02 * len(query))
+            if query == 'fail':
+                raise ArrowInvalid("invalid query")
+            reader = Mock()
+            reader.read_all.return_value = pa.table({'query': [query], 'database': [ticket_data['database']]})
+            return reader
+        finally:
+            with self.lock:
+                self.running -= 1
+
+    def test_ordered(self):
+        queries = ['q' * i for i in range(6, 0, -1)]
+        results = self.client.query_many(queries, max_concurrency=3)
+
+        self.assertEqual(list(range(6)), [result.index for result in results])
+        self.assertEqual(queries, [result.result['query'][0].as_py() for result in results])
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(3, self.max_running)
+
+    def test_as_completed(self):
+        results = list(self.client.query_many(['qqqqqqqqqq', 'q'], as_completed=True))
+
+        self.assertEqual([1, 0], [result.index for result in results])
+
+    def test_error_capture(self):
+        results = self.client.query_many(['q', 'fail', {'query': 'qq', 'database': 'other'}], timeout=5)
+
+        self.assertTrue(results[0].ok)
+        self.assertIsInstance(results[1].error, InfluxDB3ClientQueryError)
+        self.assertIsNone(results[1].result)
+        self.assertEqual('other', results[2].result['database'][0].as_py())
+        self.assertTrue(all(options.timeout == 5 for options in self.options))
+
+    def test_empty(self):
+        self.assertEqual([], self.client.query_many([]))
+        with self.assertRaises(ValueError):
+            self.client.query_many(['q'], max_concurrency=0)
+
+    @asyncio_run
+    async def test_async(self):
+        queries = ['q' * i for i in range(6, 0, -1)] + ['fail']
+        results = [result async for result in self.client.query_many_async(queries, max_concurrency=2)]
+
+        self.assertEqual(list(range(7)), [result.index for result in results])
+        self.assertEqual(queries[:-1], [result.result['query'][0].as_py() for result in results[:-1]])
+        self.assertIsInstance(results[-1].error, InfluxDB3ClientQueryError)
+        self.assertLessEqual(self.max_running, 2)
+
+        results = self.client.query_many_async(['qqqqqqqqqq', 'q'], as_completed=True)
+        completed = [result.index async for result in results]
+        self.assertEqual([1, 0], completed)
+
+
+class TestQueryPartitioned(unittest.TestCase):
+
+    def setUp(self):
+        self.client = InfluxDBClient3(host="localhost", org="my_org", database="my_db", token="my_token")
+        self.params = []
+        self.client._query_api._do_get = self._do_get
+
+    def tearDown(self):
+        self.client.close()
+
+    def _do_get(self, ticket, options):
+        """Return a row every 10 seconds of the time range or the rows of the host in reversed time order."""
+        params = json.loads(ticket.ticket)['params']
+        self.params.append(params)
+        reader = Mock()
+        if 'host' in params:
+            if params['host'] == 'fail':
+                raise ArrowInvalid("invalid query")
+            times = [pd.Timestamp(value, unit='s') for value in params['times']]
+            fields = {field: [1.0] * len(times) for field in params.get('fields', [])}
+            reader.read_all.return_value = pa.table({'time': pa.array(times, pa.timestamp('ns')),
+                                                     'host': [params['host']] * len(times), **fields})
+            return reader
+        times = pd.date_range(params['start'], params['end'], freq='10s', inclusive='left')
+        reader.read_all.return_value = pa.table({'time': pa.array(times.as_unit('ns')),
+                                                 'value': list(range(len(times)))})
+        return reader
+
+    def test_time_partitions(self):
+        result = self.client.query_partitioned('SELECT * FROM cpu WHERE time >= $start AND time < $end',
+                                               start=datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc),
+                                               end=datetime(2024, 1, 1, 12, 2, tzinfo=timezone.utc),
+                                               partitions=3, order_by_time=True, query_parameters={'a': 1})
+
+        self.assertEqual([('2024-01-01T12:00:00Z', '2024-01-01T12:00:40Z'),
+                          ('2024-01-01T12:00:40Z', '2024-01-01T12:01:20Z'),
+                          ('2024-01-01T12:01:20Z', '2024-01-01T12:02:00Z')],
+                         sorted((params['start'], params['end']) for params in self.params))
+        self.assertTrue(all(params['a'] == 1 for params in self.params))
+        self.assertEqual(12, result.num_rows)
+        self.assertEqual(sorted(result['time'].to_pylist()), result['time'].to_pylist())
+
+    def test_parameter_partitions_ordered_by_time(self):
+        partitions = [{'host': 'a', 'times': [1, 4, 5]}, {'host': 'b', 'times': [2, 4]}, {'host': 'c', 'times': []}]
+        merged = self.client.query_partitioned('SELECT * FROM cpu WHERE host = $host', mode='pandas',
+                                               partition_parameters=partitions, order_by_time=True)
+        concatenated = self.client.query_partitioned('SELECT * FROM cpu WHERE host = $host',
+                                                     partition_parameters=partitions)
+
+        self.assertEqual(['a', 'b', 'a', 'b', 'a'], merged['host'].tolist())
+        self.assertEqual(['a', 'a', 'a', 'b', 'b'], concatenated['host'].to_pylist())
+
+    def test_partitions_with_different_fields(self):
+        partitions = [{'host': 'a', 'times': [1, 3]}, {'host': 'b', 'times': [2], 'fields': ['usage']}]
+        merged = self.client.query_partitioned('SELECT * FROM cpu WHERE host = $host',
+                                               partition_parameters=partitions, order_by_time=True)
+
+        self.assertEqual(['a', 'b', 'a'], merged['host'].to_pylist())
+        self.assertEqual([None, 1.0, None], merged['usage'].to_pylist())
+
+    def test_failed_partition(self):
+        with self.assertRaises(InfluxDB3ClientQueryError):
+            self.client.query_partitioned('SELECT * FROM cpu WHERE host = $host',
+                                          partition_parameters=[{'host': 'a', 'times': [1]}, {'host': 'fail'}])
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.client.query_partitioned('SELECT 1')
+        with self.assertRaises(ValueError):
+            self.client.query_partitioned('SELECT 1', start=0, end=10, partitions=0)
+        with self.assertRaises(ValueError):
+            self.client.query_partitioned('SELECT 1', start=10, end=0)
+
+
+def _times(*seconds):
+    return pa.table({'time': pa.array([value * 1_000_000_000 for value in seconds], pa.timestamp('ns')),
+                     'seq': list(range(len(seconds)))})
+
+
+class TestMergeByTime(unittest.TestCase):
+
+    def _merge(self, *tables):
+        with mock.patch.object(pc, 'sort_indices', wraps=pc.sort_indices) as sort_indices:
+            merged = _merge_by_time(list(tables), 'time')
+        times = [value // 1_000_000_000 for value in merged['time'].cast(pa.int64()).to_pylist()]
+        return times, merged, sort_indices.call_count
+
+    def test_disjoint_tables_are_not_sorted(self):
+        times, _, sorts = self._merge(_times(5, 6), _times(), _times(1, 2), _times(3, 4))
+
+        self.assertEqual([1, 2, 3, 4, 5, 6], times)
+        self.assertEqual(0, sorts)
+
+    def test_only_overlapping_tables_are_sorted(self):
+        times, merged, sorts = self._merge(_times(7, 9), _times(1, 3), _times(2, 3), _times(8))
+
+        self.assertEqual([1, 2, 3, 3, 7, 8, 9], times)
+        # the rows of the same time keep the order of the tables
+        self.assertEqual([0, 0, 1, 1, 0, 0, 1], merged['seq'].to_pylist())
+        self.assertEqual(2, sorts)
+
+    def test_unordered_table(self):
+        times, _, sorts = self._merge(_times(3, 1, 2), _times(4))
+
+        self.assertEqual([1, 2, 3, 4], times)
+        self.assertEqual(1, sorts)
+
+    def test_empty_tables(self):
+        times, _, _ = self._merge(_times(), _times())
+
+        self.assertEqual([], times)
+
+
+class TestQueryManyFlight(unittest.TestCase):
+
+    def test_query_many(self):
+        with ConstantFlightServer() as server:
+            client = InfluxDBClient3(host=f"http://localhost:{server.port}", org="my_org", database="my_db",
+                                     token="my_token")
+            results = client.query_many([f"SELECT {i}" for i in range(10)], max_concurrency=4, mode="pandas")
+            client.close()
+
+        for index, result in enumerate(results):
+            self.assertTrue(result.ok)
+            self.assertIn(f"SELECT {index}", result.result['reference'].tolist())
@@ -0,0 +1,82 @@
+import pickle
+import unittest
+from unittest import mock
+
+import pytest
+from urllib3 import HTTPResponse
+from urllib3.exceptions import MaxRetryError
+
+from influxdb_client_3 import InfluxDBClient3, RetryBudget, WriteOptions, WriteType, write_client_options
+from influxdb_client_3.write_client._sync.transport import LoopbackTransport
+
+
+class TestRetryBudget(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(RetryBudget, '_clock', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_min_retries_per_second(self):
+        budget = RetryBudget(ttl=2, min_retries_per_second=1, percent_can_retry=0.5)
+        self.assertEqual(2, budget.balance())
+        self.assertTrue(budget.try_withdraw())
+        self.assertTrue(budget.try_withdraw())
+        self.assertFalse(budget.try_withdraw())
+        self.assertEqual(1, budget.rejected)
+
+        # the retries expire with the window
+        self.now += 2
+        self.assertTrue(budget.try_withdraw())
+
+    def test_percent_of_successes(self):
+        budget = RetryBudget(ttl=10, min_retries_per_second=0, percent_can_retry=0.2)
+        self.assertFalse(budget.try_withdraw())
+        for _ in range(10):
+            budget.deposit()
+        self.assertEqual(2, budget.balance())
+        self.assertTrue(budget.try_withdraw())
+        self.assertTrue(budget.try_withdraw())
+        self.assertFalse(budget.try_withdraw())
+
+        self.now += 10
+        self.assertEqual(0, budget.balance())
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            RetryBudget(ttl=0)
+        with pytest.raises(ValueError):
+            RetryBudget(percent_can_retry=-1)
+
+    def test_pickle(self):
+        budget = RetryBudget(ttl=5)
+        budget.deposit()
+        restored = pickle.loads(pickle.dumps(budget))
+        self.assertEqual(budget.balance(), restored.balance())
+
+
+class TestWritesRetryBudget(unittest.TestCase):
+
+    def test_retry_stops_when_budget_is_spent(self):
+        budget = RetryBudget(ttl=10, min_retries_per_second=0.1, percent_can_retry=0)
+        retry = WriteOptions(retry_budget=budget, retry_interval=0).to_retry_strategy()
+        response = HTTPResponse(status=503, reason='Service Unavailable')
+
+        retry = retry.increment(method='POST', url='/api/v2/write', response=response)
+        self.assertIs(budget, retry.retry_budget)
+        with pytest.raises(MaxRetryError) as err:
+            retry.increment(method='POST', url='/api/v2/write', response=response)
+        self.assertIn('retry budget exhausted', str(err.value))
+        self.assertEqual(1, budget.rejected)
+
+    def test_successful_requests_deposit(self):
+        budget = RetryBudget(ttl=10, min_retries_per_second=0, percent_can_retry=0.5)
+        client = InfluxDBClient3(host='http://localhost:8181', token='my-token', database='my-db', org='my-org',
+                                 transport=LoopbackTransport(),
+                                 write_client_options=write_client_options(
+                                     write_options=WriteOptions(write_type=WriteType.synchronous,
+                                                                retry_budget=budget)))
+        for _ in range(4):
+            client.write("mem,tag=a value=1i")
+        self.assertEqual(2, budget.balance())
@@ -0,0 +1,186 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pyarrow as pa
+
+from influxdb_client_3 import InfluxDBClient3
+from influxdb_client_3.query.single_flight import SingleFlight
+from tests.util import asyncio_run
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.group = SingleFlight()
+        self.calls = 0
+
+    def _slow(self, value='result'):
+        def fn():
+            self.calls += 1
+            time.sleep(0.2)
+            if isinstance(value, Exception):
+                raise value
+            return value
+        return fn
+
+    def test_concurrent_calls_share_result(self):
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            futures = [executor.submit(self.group.do, 'key', self._slow()) for _ in range(5)]
+            results = [future.result() for future in futures]
+
+        self.assertEqual(['result'] * 5, results)
+        self.assertEqual(1, self.calls)
+        self.assertEqual(4, self.group.shared)
+        self.assertEqual(0, len(self.group))
+
+    def test_error_is_shared(self):
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(self.group.do, 'key', self._slow(ValueError('failed'))) for _ in range(3)]
+            for future in futures:
+                with self.assertRaisesRegex(ValueError, 'failed'):
+                    future.result()
+
+        self.assertEqual(1, self.calls)
+        self.assertEqual(0, len(self.group))
+
+    def test_completed_call_is_executed_again(self):
+        self.group.do('key', self._slow())
+        self.group.do('key', self._slow())
+        self.group.do('other', self._slow())
+
+        self.assertEqual(3, self.calls)
+        self.assertEqual(0, self.group.shared)
+
+    @asyncio_run
+    async def test_async_and_sync_callers(self):
+        loop = asyncio.get_running_loop()
+
+        async def slow():
+            return await loop.run_in_executor(None, self._slow())
+
+        leader = asyncio.ensure_future(self.group.do_async('key', slow))
+        await asyncio.sleep(0.05)
+        followers = [self.group.do_async('key', slow) for _ in range(3)]
+        sync_follower = loop.run_in_executor(None, self.group.do, 'key', self._slow())
+        results = await asyncio.gather(leader, *followers, sync_follower)
+
+        self.assertEqual(['result'] * 5, results)
+        self.assertEqual(1, self.calls)
+
+    @asyncio_run
+    async def test_cancelled_follower(self):
+        loop = asyncio.get_running_loop()
+
+        async def slow():
+            return await loop.run_in_executor(None, self._slow())
+
+        leader = asyncio.ensure_future(self.group.do_async('key', slow))
+        await asyncio.sleep(0.05)
+        followers = [asyncio.ensure_future(self.group.do_async('key', slow)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        followers[0].cancel()
+
+        self.assertEqual('result', await leader)
+        self.assertEqual(['result', 'result'], await asyncio.gather(*followers[1:]))
+        self.assertTrue(followers[0].cancelled())
+        self.assertEqual(1, self.calls)
+
+    @asyncio_run
+    async def test_cancelled_leader(self):
+        loop = asyncio.get_running_loop()
+
+        async def slow():
+            return await loop.run_in_executor(None, self._slow())
+
+        leader = asyncio.ensure_future(self.group.do_async('key', slow))
+        await asyncio.sleep(0.05)
+        follower = asyncio.ensure_future(self.group.do_async('key', slow))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+
+        self.assertEqual('result', await follower)
+        self.assertTrue(leader.cancelled())
+        self.assertEqual(1, self.calls)
+        self.assertEqual(0, len(self.group))
+
+    @asyncio_run
+    async def test_async_error_is_shared(self):
+        async def failing():
+            await asyncio.sleep(0.05)
+            raise ValueError('failed')
+
+        results = await asyncio.gather(*[self.group.do_async('key', failing) for _ in range(3)],
+                                       return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(2, self.group.shared)
+        self.assertEqual(0, len(self.group))
+
+
+class TestQueryCoalescing(unittest.TestCase):
+
+    def setUp(self):
+        self.client = InfluxDBClient3(host="localhost", org="my_org", database="my_db", token="my_token",
+                                      query_coalesce=True)
+        self.do_get = Mock(side_effect=self._do_get)
+        self.client._query_api._do_get = self.do_get
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.client.close()
+
+    def _do_get(self, ticket, options):
+        self.release.wait(5)
+        reader = Mock()
+        reader.read_all.return_value = pa.table({'value': [1, 2, 3]})
+        return reader
+
+    def _query_concurrently(self, queries):
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            futures = [executor.submit(self.client.query, query, **kwargs) for query, kwargs in queries]
+            time.sleep(0.2)
+            self.release.set()
+            return [future.result() for future in futures]
+
+    def test_identical_queries_share_stream(self):
+        results = self._query_concurrently([('SELECT * FROM cpu', {'mode': 'pandas'}),
+                                            ('SELECT * FROM cpu', {}),
+                                            ('SELECT * FROM cpu', {'mode': 'reader'})])
+
+        self.do_get.assert_called_once()
+        self.assertEqual([1, 2, 3], results[0]['value'].tolist())
+        self.assertEqual(3, results[1].num_rows)
+        self.assertEqual(3, results[2].read_all().num_rows)
+
+    def test_different_queries_are_executed(self):
+        self._query_concurrently([('SELECT * FROM cpu', {'query_parameters': {'host': 'a'}}),
+                                  ('SELECT * FROM cpu', {'query_parameters': {'host': 'b'}}),
+                                  ('SELECT * FROM cpu', {'headers': [(b'trace-id', b'1')]}),
+                                  ('SELECT * FROM cpu', {'coalesce': False}),
+                                  ('SELECT * FROM mem', {})])
+
+        self.assertEqual(5, self.do_get.call_count)
+
+    @asyncio_run
+    async def test_query_async(self):
+        queries = [self.client.query_async('SELECT * FROM cpu') for _ in range(4)]
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.2, self.release.set)
+        results = await asyncio.gather(*queries)
+
+        self.do_get.assert_called_once()
+        self.assertTrue(all(result.num_rows == 3 for result in results))
+
+    def test_disabled_by_default(self):
+        client = InfluxDBClient3(host="localhost", org="my_org", database="my_db", token="my_token")
+        client._query_api._do_get = self.do_get
+        self.release.set()
+        client.query('SELECT * FROM cpu', coalesce=True)
+        client.query('SELECT * FROM cpu')
+
+        self.assertEqual(2, self.do_get.call_count)
+        client.close()
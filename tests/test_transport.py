@@ -0,0 +1,119 @@
+import gzip
+import pickle
+import threading
+import unittest
+
+import urllib3
+
+from influxdb_client_3 import InfluxDBClient3, InfluxDBError, WriteOptions, write_client_options
+from influxdb_client_3.write_client._sync.rest_client import RestClient
+from influxdb_client_3.write_client._sync.transport import LoopbackTransport, LoopbackResponse, Transport, \
+    Urllib3Transport
+
+
+class TestTransport(unittest.TestCase):
+
+    def test_default_transport(self):
+        rest_client = RestClient(base_url='http://localhost:8181')
+        self.assertIsInstance(rest_client.transport, Urllib3Transport)
+        self.assertIsInstance(rest_client.pool_manager, urllib3.PoolManager)
+
+        rest_client = RestClient(base_url='http://localhost:8181', proxy='http://localhost:3128')
+        self.assertIsInstance(rest_client.pool_manager, urllib3.ProxyManager)
+
+        # the default transport is created again after unpickling
+        restored = pickle.loads(pickle.dumps(rest_client))
+        self.assertIsInstance(restored.pool_manager, urllib3.ProxyManager)
+        self.assertIsNot(rest_client.transport, restored.transport)
+
+    def test_transport_interface(self):
+        with self.assertRaises(TypeError):
+            Transport()
+
+        class NoRequestTransport(Transport):
+            pass
+
+        with self.assertRaises(TypeError):
+            NoRequestTransport()
+
+        response = LoopbackResponse(status=429, headers={'Retry-After': '3'})
+        self.assertEqual('3', response.getheader('retry-after'))
+
+    def test_loopback_write(self):
+        transport = LoopbackTransport()
+        with InfluxDBClient3(host='http://localhost:8181', token='my-token', database='my-db', org='my-org',
+                             enable_gzip=True, transport=transport,
+                             write_client_options=write_client_options(
+                                 write_options=WriteOptions(batch_size=2, flush_interval=10_000))) as client:
+            for i in range(4):
+                client.write(f"mem,tag=a value={i}i {i}")
+
+        self.assertEqual(2, transport.request_count)
+        request = transport.requests[0]
+        self.assertEqual('POST', request.method)
+        self.assertEqual('http://localhost:8181/api/v2/write?org=my-org&bucket=my-db&precision=ns', request.url)
+        self.assertEqual('gzip', request.headers['Content-Encoding'])
+        self.assertEqual('Token my-token', request.headers['Authorization'])
+        self.assertEqual(b"mem,tag=a value=0i 0\nmem,tag=a value=1i 1", gzip.decompress(request.body))
+
+    def test_loopback_responses(self):
+        error = LoopbackResponse(status=400, reason='Bad Request', data='{"message": "invalid line"}')
+        transport = LoopbackTransport(responses=[error, LoopbackResponse()], record=False)
+        client = InfluxDBClient3(host='http://localhost:8181', token='my-token', database='my-db', org='my-org',
+                                 transport=transport)
+
+        with self.assertRaises(InfluxDBError) as err:
+            client._write_api.write(record="mem,tag=a value=1i")
+        self.assertEqual('invalid line', err.exception.message)
+
+        client._write_api.write(record="mem,tag=a value=1i")
+        client._write_api.write(record="mem,tag=a value=1i")
+        self.assertEqual(3, transport.request_count)
+        self.assertEqual([], transport.requests)
+
+        transport = LoopbackTransport(responses=lambda request: LoopbackResponse(status=201 if request.body else 204))
+        rest_client = RestClient(base_url='http://localhost:8181', transport=transport)
+        self.assertEqual(201, rest_client.request('POST', '/api/v2/write', body=b'mem value=1i').status)
+        self.assertEqual(204, rest_client.request('GET', '/ping').status)
+
+    def test_payload_too_large_halves_are_concurrent(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def respond(request):
+            if request.body.count(b"\n") > 1:
+                return LoopbackResponse(status=413, reason='Payload Too Large')
+            # both halves have to be in flight at the same time
+            barrier.wait()
+            return LoopbackResponse()
+
+        transport = LoopbackTransport(responses=respond)
+        with InfluxDBClient3(host='http://localhost:8181', token='my-token', database='my-db', org='my-org',
+                             transport=transport) as client:
+            client.write([f"mem,tag=a value={i}i {i}" for i in range(4)])
+
+        self.assertEqual(3, transport.request_count)
+
+    def test_batching_close_after_payload_too_large(self):
+        transport = LoopbackTransport(responses=lambda request: LoopbackResponse(status=413, reason='Payload Too Large')
+                                      if request.body.count(b"\n") > 1 else LoopbackResponse())
+        client = InfluxDBClient3(host='http://localhost:8181', token='my-token', database='my-db', org='my-org',
+                                 transport=transport,
+                                 write_client_options=write_client_options(
+                                     write_options=WriteOptions(batch_size=4, flush_interval=10_000)))
+        write_api = client._write_api
+        client.write([f"mem,tag=a value={i}i {i}" for i in range(4)])
+        client.close()
+
+        # the halves are posted by the pool, the pool is closed after the batch is written
+        self.assertEqual(3, transport.request_count)
+        self.assertIsNone(write_api._pool)
+
+    def test_loopback_pickle(self):
+        rest_client = RestClient(base_url='http://localhost:8181', transport=LoopbackTransport())
+        rest_client.request('GET', '/ping')
+
+        restored = pickle.loads(pickle.dumps(rest_client))
+        self.assertIsInstance(restored.transport, LoopbackTransport)
+        restored.request('GET', '/health')
+        self.assertEqual(['http://localhost:8181/ping', 'http://localhost:8181/health'],
+                         [request.url for request in restored.transport.requests])
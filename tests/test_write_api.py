@@ -8,7 +8,8 @@ import pytest
 from urllib3 import response
 from urllib3.exceptions import ConnectTimeoutError
 
-from influxdb_client_3 import InfluxDBClient3, InfluxDBError
+from influxdb_client_3 import InfluxDBClient3, InfluxDBError, Point, PointSettings, WriteOptions, \
+    write_client_options
 from influxdb_client_3.exceptions import InfluxDBPartialWriteError
 from influxdb_client_3.version import VERSION
 from influxdb_client_3.write_client.write_exceptions import ApiException
@@ -55,6 +56,51 @@ class WriteApiTests(unittest.TestCase):
         self.assertEqual(f"{_package}/{VERSION}", write_api.default_header["User-Agent"])
         self.assertEqual("Token my-token", write_api.default_header["Authorization"])
 
+    def test_default_tags_applied_during_serialization(self):
+        client = InfluxDBClient3(
+            host='http://localhost:8181',
+            token='my-token',
+            database='my-bucket',
+            org='my-org',
+            point_settings=PointSettings(env="prod")
+        )
+        client._write_api._post_write = mock.Mock()
+
+        points = [Point.measurement("cpu").tag("host", f"h{i}").field("value", i) for i in range(2)]
+        dictionary = {"measurement": "mem", "fields": {"value": 1}}
+        client.write(record=(record for record in [*points, dictionary]))
+
+        body = client._write_api._post_write.call_args[0][3]
+        self.assertEqual(b'cpu,env=prod,host=h0 value=0i\n'
+                         b'cpu,env=prod,host=h1 value=1i\n'
+                         b'mem,env=prod value=1i', body)
+        # records are not modified
+        self.assertEqual({"host": "h0"}, points[0]._tags)
+        self.assertNotIn("tags", dictionary)
+
+    def test_batching_sort_batch(self):
+        for group_by_measurement, expected in [
+            (False, [b'cpu,host=a f=1i 1\ncpu,host=a f=3i 3\ncpu,host=b f=2i 2\nmem,host=a f=4i 1']),
+            (True, [b'mem,host=a f=4i 1', b'cpu,host=a f=1i 1\ncpu,host=a f=3i 3\ncpu,host=b f=2i 2']),
+        ]:
+            with self.subTest(group_by_measurement=group_by_measurement):
+                client = InfluxDBClient3(
+                    host='http://localhost:8181',
+                    token='my-token',
+                    database='my-bucket',
+                    org='my-org',
+                    write_client_options=write_client_options(
+                        write_options=WriteOptions(batch_size=10, flush_interval=60_000, sort_batch=True,
+                                                   group_by_measurement=group_by_measurement))
+                )
+                client._write_api._post_write = mock.Mock()
+                client.write(record=["mem,host=a f=4i 1\ncpu,host=b f=2i 2", "cpu,host=a f=3i 3",
+                                     "cpu,host=a f=1i 1"])
+                client.close()
+
+                bodies = [call[0][3] for call in client._write_api._post_write.call_args_list]
+                self.assertEqual(sorted(expected), sorted(bodies))
+
     def test_api_error_cloud(self):
         response_body = '{"message": "parsing failed for write_lp endpoint"}'
         with self.assertRaises(InfluxDBError) as err:
@@ -423,3 +469,62 @@ class WriteApiTests(unittest.TestCase):
         expected = ("Server doesn't support the V3 API endpoint (/api/v3/write_lp). "
                     "Set use_v2_api=True to use the V2 API endpoint.")
         self.assertEqual(expected, err.exception.message)
+
+    def test_prepared_write_is_reused(self):
+        client = InfluxDBClient3(
+            host='http://localhost:8181',
+            token='my-token',
+            database='my-bucket',
+            org='my-org',
+            enable_gzip=True,
+            gzip_threshold=100,
+        )
+        write_api = client._write_api
+        write_api.rest_client.pool_manager.request = mock.Mock(
+            return_value=response.HTTPResponse(status=204, reason='No Content', body=b''))
+
+        write_api.write(record="mem,tag=a value=1i 1")
+        write_api.write(record="mem,tag=a value=" + "1" * 200 + "i 1")
+        write_api.write(record="mem,tag=a value=1i 1", _request_timeout=100)
+
+        self.assertEqual(1, len(write_api._prepared_writes))
+        prepared = next(iter(write_api._prepared_writes.values()))
+        self.assertEqual('/api/v2/write', prepared.path)
+        self.assertEqual((('org', 'my-org'), ('bucket', 'my-bucket'), ('precision', 'ns')), prepared.query_params)
+        # gzip and default headers are not leaked into the prepared request
+        self.assertNotIn('Content-Encoding', prepared.header_params)
+        self.assertNotIn('Authorization', prepared.header_params)
+
+        calls = write_api.rest_client.pool_manager.request.call_args_list
+        self.assertEqual(['http://localhost:8181/api/v2/write?org=my-org&bucket=my-bucket&precision=ns'] * 3,
+                         [kwargs['url'] for _, kwargs in calls])
+        self.assertEqual([None, 'gzip', None], [kwargs['headers'].get('Content-Encoding') for _, kwargs in calls])
+        self.assertEqual('Token my-token', calls[0][1]['headers']['Authorization'])
+
+        write_api.write(record="mem,tag=a value=1i 1", no_sync=True, use_v2_api=False)
+        self.assertEqual(2, len(write_api._prepared_writes))
+        self.assertEqual('http://localhost:8181/api/v3/write_lp?org=my-org&db=my-bucket&precision=nanosecond'
+                         '&no_sync=true', write_api.rest_client.pool_manager.request.call_args[1]['url'])
+
+    def test_prepared_write_with_changed_default_header(self):
+        client = InfluxDBClient3(host='http://localhost:8181', token='my-token', database='my-bucket', org='my-org')
+        write_api = client._write_api
+        write_api.rest_client.pool_manager.request = mock.Mock(
+            return_value=response.HTTPResponse(status=204, reason='No Content', body=b''))
+
+        write_api.write(record="mem,tag=a value=1i 1")
+        write_api.default_header['Authorization'] = 'Token refreshed-token'
+        write_api.default_header['Content-Type'] = 'text/plain'
+        write_api.write(record="mem,tag=a value=1i 1")
+
+        self.assertEqual(1, len(write_api._prepared_writes))
+        headers = [kwargs['headers'] for _, kwargs in write_api.rest_client.pool_manager.request.call_args_list]
+        self.assertEqual(['Token my-token', 'Token refreshed-token'], [header['Authorization'] for header in headers])
+        self.assertEqual(['text/plain; charset=utf-8', 'text/plain'], [header['Content-Type'] for header in headers])
+
+    def test_prepared_write_missing_org(self):
+        client = InfluxDBClient3(host='http://localhost:8181', token='my-token', database='my-bucket')
+        with self.assertRaises(ValueError) as err:
+            client._write_api._post_write(False, 'my-bucket', None, b"mem,tag=a value=1i 1", 'ns', False, True, True)
+        self.assertIn("`org`", str(err.exception))
+        self.assertEqual({}, client._write_api._prepared_writes)
@@ -1,9 +1,19 @@
+import gzip
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import Mock
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
+import pyarrow.parquet as parquet
 
 from influxdb_client_3 import InfluxDBClient3
+from influxdb_client_3.exceptions import InfluxDB3ClientWriteFileError
 from influxdb_client_3.write_client.client.write_api import WriteApi
 
 
@@ -64,3 +74,275 @@ class TestWriteFile(unittest.TestCase):
         #                                          data_frame_tag_columns=['building'],
         #                                          data_frame_timestamp_column='time',
         #                                          write_precision='s')
+
+    def test_write_file_csv_streaming(self):
+
+        mock_write = Mock(spec=WriteApi)
+        self.client._write_api.write = mock_write.write
+
+        self.client.write_file(file='tests/data/iot.csv', timestamp_column='time', measurement_name="iot-devices",
+                               tag_columns=["building"], columns=["building", "temperature", "time"],
+                               row_filter=ds.field("temperature") > 72.15, streaming_batch_size=1)
+
+        expected_df = pd.DataFrame({
+            "building": ['5a', '5a'],
+            "temperature": [72.3, 72.2],
+            "time": pd.to_datetime(["2022-10-01T12:01:00Z", "2022-10-03T12:01:00Z"]).astype('datetime64[s, UTC]'),
+        })
+
+        records = [kwargs['record'] for _, kwargs in mock_write.write.call_args_list]
+        assert mock_write.write.call_count == 2
+        assert expected_df.equals(pd.concat(records, ignore_index=True))
+
+        _, actual = mock_write.write.call_args
+        del actual['record']
+        assert actual == {
+            'bucket': 'my_db',
+            'data_frame_measurement_name': 'iot-devices',
+            'data_frame_tag_columns': ['building'],
+            'data_frame_timestamp_column': 'time',
+        }
+
+    def test_write_file_parquet_streaming(self):
+
+        mock_write = Mock(spec=WriteApi)
+        self.client._write_api.write = mock_write.write
+
+        table = pa.table({
+            "measurement": ['cpu', 'cpu', 'mem', 'mem'],
+            "host": ['a', 'b', 'a', 'b'],
+            "value": [1.0, 2.0, 3.0, 4.0],
+            "time": pd.to_datetime(["2022-10-01", "2022-10-02", "2022-10-03", "2022-10-04"]),
+        })
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file = os.path.join(tmp_dir, "data.parquet")
+            parquet.write_table(table, file, row_group_size=2)
+
+            self.client.write_file(file=file, tag_columns=["host"], streaming=True, streaming_batch_size=2)
+
+        calls = [(kwargs['data_frame_measurement_column'], kwargs['record']['measurement'].tolist(),
+                  kwargs['record']['value'].tolist())
+                 for _, kwargs in mock_write.write.call_args_list]
+        assert calls == [('measurement', ['cpu', 'cpu'], [1.0, 2.0]), ('measurement', ['mem', 'mem'], [3.0, 4.0])]
+
+    def test_write_file_json_streaming_not_supported(self):
+        with self.assertRaises(ValueError):
+            self.client.write_file(file='tests/data/iot.json', streaming=True)
+
+    def test_write_multiple_files(self):
+
+        mock_write = Mock(spec=WriteApi)
+        self.client._write_api.write = mock_write.write
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.makedirs(os.path.join(tmp_dir, "nested"))
+            for idx, name in enumerate(["a.csv", "b.csv", os.path.join("nested", "c.csv")]):
+                with open(os.path.join(tmp_dir, name), "w") as f:
+                    f.write(f"host,value,time\nh{idx},{idx}.5,2022-10-01T12:01:00Z\n")
+            with open(os.path.join(tmp_dir, "notes.md"), "w") as f:
+                f.write("ignored")
+
+            progress = []
+            self.client.write_file(file=tmp_dir, measurement_name="cpu", tag_columns=["host"], max_workers=2,
+                                   progress_callback=lambda file, rows, completed: progress.append(
+                                       (os.path.relpath(file, tmp_dir), rows, completed)))
+
+            assert mock_write.write.call_count == 3
+            assert sorted(progress) == [("a.csv", 1, True), ("b.csv", 1, True),
+                                        (os.path.join("nested", "c.csv"), 1, True)]
+
+            mock_write.reset_mock()
+            self.client.write_file(file=[os.path.join(tmp_dir, "a.csv"), os.path.join(tmp_dir, "*.csv")],
+                                   measurement_name="cpu", tag_columns=["host"])
+            assert mock_write.write.call_count == 2
+
+    def test_write_multiple_files_resume_with_manifest(self):
+
+        mock_write = Mock(spec=WriteApi)
+        self.client._write_api.write = mock_write.write
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ["a.csv", "b.csv"]:
+                with open(os.path.join(tmp_dir, name), "w") as f:
+                    f.write("host,value,time\nh1,1.5,2022-10-01T12:01:00Z\n")
+            with open(os.path.join(tmp_dir, "c.csv"), "w") as f:
+                f.write("host,value,time\nh1,1.5,not-a-time\n")
+            mock_write.write.side_effect = lambda **kwargs: kwargs['record']['time'].dt.tz
+
+            manifest = os.path.join(tmp_dir, "manifest.txt")
+            with self.assertRaises(InfluxDB3ClientWriteFileError) as err:
+                self.client.write_file(file=os.path.join(tmp_dir, "*.csv"), measurement_name="cpu",
+                                       tag_columns=["host"], manifest=manifest)
+            assert list(err.exception.file_errors.keys()) == [os.path.join(tmp_dir, "c.csv")]
+            assert mock_write.write.call_count == 3
+
+            with open(manifest) as f:
+                assert sorted(f.read().splitlines()) == [os.path.abspath(os.path.join(tmp_dir, name))
+                                                         for name in ["a.csv", "b.csv"]]
+
+            # only the failed file is written again
+            mock_write.reset_mock()
+            mock_write.write.side_effect = None
+            self.client.write_file(file=os.path.join(tmp_dir, "*.csv"), measurement_name="cpu",
+                                   tag_columns=["host"], manifest=manifest)
+            assert mock_write.write.call_count == 1
+            assert mock_write.write.call_args[1]['record']['time'].tolist() == ['not-a-time']
+
+    def test_write_directory_skips_manifest(self):
+        self.client._write_api.rest_client.request = Mock()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for name in ["a.lp", "b.lp"]:
+                with open(os.path.join(tmp_dir, name), "w") as f:
+                    f.write("cpu,host=h1 value=1i 1\n")
+            manifest = os.path.join(tmp_dir, "manifest.lp")
+
+            self.client.write_file(file=tmp_dir, manifest=manifest)
+            # the manifest written by the first upload is not uploaded as line protocol
+            self.client.write_file(file=tmp_dir, manifest=manifest)
+
+            with open(manifest) as f:
+                assert sorted(f.read().splitlines()) == [os.path.abspath(os.path.join(tmp_dir, name))
+                                                         for name in ["a.lp", "b.lp"]]
+        assert self.client._write_api.rest_client.request.call_count == 2
+
+    def test_write_directory_skips_txt_files(self):
+        self.client._write_api.rest_client.request = Mock()
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "a.lp"), "w") as f:
+                f.write("cpu,host=h1 value=1i 1\n")
+            with open(os.path.join(tmp_dir, "data.txt"), "w") as f:
+                f.write("cpu,host=h2 value=2i 2\n")
+            with open(os.path.join(tmp_dir, "README.txt"), "w") as f:
+                f.write("Exported from the production cluster.\n")
+
+            self.client.write_file(file=tmp_dir)
+            self.client.write_file(file=os.path.join(tmp_dir, "*"))
+            # the .txt file named explicitly is line protocol
+            self.client.write_file(file=os.path.join(tmp_dir, "data.txt"))
+
+        bodies = [kwargs['body'] for _, kwargs in self.client._write_api.rest_client.request.call_args_list]
+        assert bodies == [b"cpu,host=h1 value=1i 1", b"cpu,host=h1 value=1i 1", b"cpu,host=h2 value=2i 2"]
+
+    def test_progress_callback_is_not_called_concurrently(self):
+        self.client._write_api.rest_client.request = Mock()
+        running = []
+        overlaps = []
+        lock = threading.Lock()
+
+        def progress_callback(file, rows, completed):
+            with lock:
+                running.append(file)
+                overlaps.append(len(running) > 1)
+            time.sleep(0.01)
+            with lock:
+                running.remove(file)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for index in range(4):
+                with open(os.path.join(tmp_dir, f"{index}.lp"), "w") as f:
+                    f.write("".join(f"cpu,host=h{i} value={i}i {i}\n" for i in range(20)))
+
+            self.client.write_file(file=tmp_dir, max_workers=4, file_parser_options={'max_body_bytes': 64},
+                                   progress_callback=progress_callback)
+
+        assert len(overlaps) > 4
+        assert not any(overlaps)
+
+    def test_write_files_not_found(self):
+        with self.assertRaises(ValueError):
+            self.client.write_file(file='tests/data/*.missing')
+
+    def test_write_line_protocol_file(self):
+        self.client._write_api.rest_client.request = Mock()
+
+        lines = [f"cpu,host=h{i} value={i}i {i}".encode() for i in range(100)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file = os.path.join(tmp_dir, "data.lp")
+            with open(file, "wb") as f:
+                f.write(b"\n".join(lines) + b"\n")
+
+            progress = []
+            self.client.write_file(file=file, file_parser_options={'max_body_bytes': 256}, concurrent_requests=4,
+                                   write_precision='s',
+                                   progress_callback=lambda _, rows, completed: progress.append((rows, completed)))
+
+        calls = self.client._write_api.rest_client.request.call_args_list
+        bodies = [kwargs['body'] for _, kwargs in calls]
+        assert all(len(body) <= 256 for body in bodies)
+        assert b"\n".join(bodies).split(b"\n") == lines
+        assert calls[0][1]['query_params'][-1] == ('precision', 's')
+        assert progress[-1] == (100, True)
+
+    def test_write_line_protocol_gzip_file(self):
+        body = b"cpu,host=a value=1i 1\ncpu,host=b value=2i 2\n"
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file = os.path.join(tmp_dir, "data.lp.gz")
+            with gzip.open(file, "wb") as f:
+                f.write(body)
+            with open(file, "rb") as f:
+                compressed = f.read()
+
+            # forwarded without decompressing
+            self.client._write_api.rest_client.request = Mock()
+            self.client.write_file(file=file)
+            _, kwargs = self.client._write_api.rest_client.request.call_args
+            assert kwargs['body'] == compressed
+            assert kwargs['headers']['Content-Encoding'] == 'gzip'
+
+            # larger than max_body_bytes is decompressed and split
+            self.client._write_api.rest_client.request = Mock()
+            self.client.write_file(file=file, file_parser_options={'max_body_bytes': 24})
+            calls = self.client._write_api.rest_client.request.call_args_list
+            assert [kwargs['body'] for _, kwargs in calls] == [b"cpu,host=a value=1i 1", b"cpu,host=b value=2i 2"]
+            assert 'Content-Encoding' not in calls[0][1]['headers']
+
+    def test_write_line_protocol_gzip_file_larger_when_decompressed(self):
+        lines = [b"cpu,host=a value=1i 1"] * 100
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file = os.path.join(tmp_dir, "data.lp.gz")
+            with gzip.open(file, "wb") as f:
+                f.write(b"\n".join(lines))
+            assert os.path.getsize(file) <= 512
+
+            # the decompressed content is larger than max_body_bytes, it is decompressed and split
+            self.client._write_api.rest_client.request = Mock()
+            self.client.write_file(file=file, file_parser_options={'max_body_bytes': 512})
+            calls = self.client._write_api.rest_client.request.call_args_list
+            bodies = [kwargs['body'] for _, kwargs in calls]
+            assert len(bodies) > 1 and all(len(body) <= 512 for body in bodies)
+            assert b"\n".join(bodies).split(b"\n") == lines
+            assert all('Content-Encoding' not in kwargs['headers'] for _, kwargs in calls)
+
+    def test_write_file_split_by_measurement(self):
+
+        self.client._write_api.rest_client.request = Mock()
+
+        table = pa.table({
+            "iox::measurement": pa.array(['cpu', 'mem', 'cpu', None, 'disk', 'mem']).dictionary_encode(),
+            "host": ['a', 'b', 'c', 'x', 'd', 'e'],
+            "value": [1.0, 2.0, 3.0, 0.0, 4.0, 5.0],
+            "time": pd.to_datetime(["2022-10-01", "2022-10-02", "2022-10-03", "2022-10-03", "2022-10-04",
+                                    "2022-10-05"]),
+        })
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file = os.path.join(tmp_dir, "data.feather")
+            feather.write_feather(table, file)
+
+            self.client.write_file(file=file, tag_columns=["host"], database="other_db", write_precision='s',
+                                   concurrent_requests=2)
+
+        # the rows are written in two concurrent requests, the row without measurement is skipped
+        calls = self.client._write_api.rest_client.request.call_args_list
+        assert len(calls) == 2
+        assert all(('bucket', 'other_db') in kwargs['query_params'] and ('precision', 's') in kwargs['query_params']
+                   for _, kwargs in calls)
+        lines = sorted(line for _, kwargs in calls for line in kwargs['body'].split(b'\n'))
+        assert lines == [
+            b'cpu,host=a value=1.0 1664582400',
+            b'cpu,host=c value=3.0 1664755200',
+            b'disk,host=d value=4.0 1664841600',
+            b'mem,host=b value=2.0 1664668800',
+            b'mem,host=e value=5.0 1664928000',
+        ]
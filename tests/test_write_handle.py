@@ -0,0 +1,121 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+import reactivex as rx
+
+from influxdb_client_3 import InfluxDBClient3, WriteHandle, WriteOptions, write_client_options
+from influxdb_client_3.write_client.client.write.write_handle import wait_all
+
+
+class TestWriteHandle(unittest.TestCase):
+
+    def test_handle(self):
+        handle = WriteHandle()
+        callbacks = []
+        handle.add_done_callback(callbacks.append)
+        self.assertFalse(handle.done())
+        self.assertFalse(handle.wait(0))
+        with self.assertRaises(TimeoutError):
+            handle.result(0)
+
+        handle._retain(2)
+        handle._release()
+        handle._release(ValueError('failed'))
+        self.assertFalse(handle.done())
+        handle._release()
+        self.assertTrue(handle.done())
+        self.assertEqual([handle], callbacks)
+        self.assertIsInstance(handle.exception(), ValueError)
+        with self.assertRaises(ValueError):
+            handle.result()
+        self.assertEqual('WriteHandle[failed]', repr(handle))
+
+        handle.add_done_callback(callbacks.append)
+        self.assertEqual([handle, handle], callbacks)
+
+    def test_wait_all(self):
+        written, pending = WriteHandle(), WriteHandle()
+        written._release()
+        wait_all([written, None], timeout=0)
+        with self.assertRaises(TimeoutError):
+            wait_all([written, pending], timeout=0.01)
+
+
+class TestBatchingWriteHandle(unittest.TestCase):
+
+    def setUp(self):
+        self.bodies = []
+        self.lock = threading.Lock()
+
+    def _post_write(self, _async_req, bucket, org, body, *args, **kwargs):
+        with self.lock:
+            self.bodies.append(body)
+        if b'fail' in body:
+            raise ValueError('failed batch')
+
+    def _client(self, **write_options):
+        return InfluxDBClient3(host='http://localhost:8181', token='my-token', database='my-db', org='my-org',
+                               write_client_options=write_client_options(
+                                   write_options=WriteOptions(flush_interval=10_000, max_retries=0,
+                                                              **write_options)))
+
+    def test_handles_resolved_by_batches(self):
+        with patch('influxdb_client_3.write_client.client.write_api.WriteApi._post_write',
+                   autospec=True) as post_write:
+            post_write.side_effect = lambda api, *args, **kwargs: self._post_write(*args, **kwargs)
+            client = self._client(batch_size=2)
+            try:
+                first = client.write(["mem value=1i 1", "mem value=2i 2"])
+                second = client.write("mem value=3i 3")
+                self.assertIsInstance(first, WriteHandle)
+                first.result(timeout=5)
+                self.assertFalse(second.done())
+
+                # the second write shares the batch with the failed line
+                failed = client.write(["mem fail=4i 4", "mem value=5i 5"])
+                self.assertIsInstance(second.exception(timeout=5), ValueError)
+                self.assertFalse(failed.done())
+
+                observed = client.write(rx.from_iterable(["mem value=6i 6"]))
+                self.assertIsNone(observed.exception(timeout=5))
+                self.assertIsInstance(failed.exception(timeout=5), ValueError)
+
+                client.write("mem value=7i 7")
+                with self.assertRaises(TimeoutError):
+                    client._write_api.wait_all(timeout=0.01)
+                client.write("mem value=8i 8")
+                client._write_api.wait_all(timeout=5)
+                self.assertEqual(set(), client._write_api._handles)
+            finally:
+                client.close()
+
+    def test_handles_with_group_by_measurement(self):
+        with patch('influxdb_client_3.write_client.client.write_api.WriteApi._post_write',
+                   autospec=True) as post_write:
+            post_write.side_effect = lambda api, *args, **kwargs: self._post_write(*args, **kwargs)
+            client = self._client(batch_size=2, group_by_measurement=True, sort_batch=True)
+            try:
+                first = client.write(b"cpu value=1i 1")
+                second = client.write(b"mem fail=2i 2\ndisk value=2i 2")
+                self.assertIsNone(first.exception(timeout=5))
+                self.assertIsInstance(second.exception(timeout=5), ValueError)
+                self.assertEqual(sorted([b"cpu value=1i 1", b"mem fail=2i 2", b"disk value=2i 2"]), sorted(self.bodies))
+            finally:
+                client.close()
+
+    def test_handles_failed_by_pipeline_error(self):
+        with patch('influxdb_client_3.write_client.client.write_api.WriteApi._post_write',
+                   autospec=True) as post_write:
+            post_write.side_effect = lambda api, *args, **kwargs: self._post_write(*args, **kwargs)
+            client = self._client(batch_size=10)
+            try:
+                pending = client.write("mem value=1i 1")
+                self.assertFalse(pending.done())
+
+                client._write_api._subject.on_error(RuntimeError('pipeline failed'))
+                self.assertIsInstance(pending.exception(timeout=5), RuntimeError)
+                self.assertIsInstance(client.write("mem value=2i 2").exception(timeout=5), RuntimeError)
+                client._write_api.wait_all(timeout=0)
+            finally:
+                client.close()
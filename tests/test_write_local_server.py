@@ -1,13 +1,18 @@
+import asyncio
+import gzip
 import re
 import time
 from http import HTTPStatus
+from typing import NamedTuple
 
 import pandas as pd
 import pytest
 from pytest_httpserver import HTTPServer, RequestMatcher
 from urllib3.exceptions import TimeoutError as urllib3_TimeoutError
+from werkzeug import Response
 
 from influxdb_client_3 import InfluxDBClient3, WriteOptions, WritePrecision, write_client_options, WriteType
+from influxdb_client_3.exceptions import InfluxDBShardedWriteError
 from influxdb_client_3.write_client.write_exceptions import ApiException
 
 
@@ -41,6 +46,47 @@ class TestWriteLocalServer:
             method="POST", uri="/api/v2/write",
             query_string={"org": "ORG", "bucket": "DB", "precision": "ns"}))
 
+    def test_write_with_auto_precision(self, httpserver: HTTPServer):
+        self.set_response_status(httpserver, 204)
+
+        InfluxDBClient3(
+            host=(httpserver.url_for("/")), org="ORG", database="DB", token="TOKEN",
+            write_client_options=write_client_options(
+                write_options=WriteOptions(write_type=WriteType.synchronous, write_precision=WritePrecision.AUTO)
+            )
+        ).write(["mem,tag=a value=1i 1700000000000000000", {
+            "measurement": "mem", "tags": {"tag": "b"}, "fields": {"value": 2}, "time": 1700000060000000000
+        }])
+
+        self.assert_request_made(httpserver, RequestMatcher(
+            method="POST", uri="/api/v2/write",
+            query_string={"org": "ORG", "bucket": "DB", "precision": "s"}))
+        assert httpserver.log[0][0].get_data() == b"mem,tag=a value=1i 1700000000\nmem,tag=b value=2i 1700000060"
+
+    def test_post_write_async_with_auto_precision(self, httpserver: HTTPServer):
+        self.set_response_status(httpserver, 204)
+        client = InfluxDBClient3(host=(httpserver.url_for("/")), org="ORG", database="DB", token="TOKEN")
+
+        asyncio.run(client._write_api.post_write_async("ORG", "DB", "mem,tag=a value=1i 1700000000000000000",
+                                                       precision=WritePrecision.AUTO, use_v2_api=True))
+
+        self.assert_request_made(httpserver, RequestMatcher(
+            method="POST", uri="/api/v2/write",
+            query_string={"org": "ORG", "bucket": "DB", "precision": "s"}))
+        assert httpserver.log[0][0].get_data() == b"mem,tag=a value=1i 1700000000"
+
+    def test_write_gzipped_body_with_auto_precision(self, httpserver: HTTPServer):
+        self.set_response_status(httpserver, 204)
+        body = gzip.compress(b"mem,tag=a value=1i 1700000000000000000")
+
+        InfluxDBClient3(host=(httpserver.url_for("/")), org="ORG", database="DB", token="TOKEN")._write_api \
+            .write_body(body, write_precision=WritePrecision.AUTO, content_encoding='gzip')
+
+        self.assert_request_made(httpserver, RequestMatcher(
+            method="POST", uri="/api/v2/write",
+            query_string={"org": "ORG", "bucket": "DB", "precision": "ns"}))
+        assert httpserver.log[0][0].get_data() == body
+
     def test_write_with_write_options(self, httpserver: HTTPServer):
         self.set_response_status(httpserver, 200)
 
@@ -333,3 +379,130 @@ class TestWriteLocalServer:
             )
         except TypeError as e:
             pytest.fail(f"write_dataframe raised TypeError: {e}")
+
+    @staticmethod
+    def limit_body_size(httpserver: HTTPServer, max_bytes):
+        def handler(request):
+            if len(request.get_data()) > max_bytes:
+                return Response(status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+            return Response(status=HTTPStatus.NO_CONTENT)
+
+        httpserver.expect_request(re.compile(".*")).respond_with_handler(handler)
+
+    def test_write_split_by_max_request_bytes(self, httpserver: HTTPServer):
+        self.limit_body_size(httpserver, 64)
+        lines = [f"mem,tag=t{i} value={i}i {i}" for i in range(20)]
+
+        InfluxDBClient3(
+            host=(httpserver.url_for("/")), org="ORG", database="DB", token="TOKEN",
+            write_client_options=write_client_options(
+                write_options=WriteOptions(write_type=WriteType.synchronous, max_request_bytes=64)
+            )
+        ).write(lines)
+
+        bodies = [request.get_data() for request, _ in httpserver.log]
+        assert len(bodies) > 1
+        assert all(len(body) <= 64 for body in bodies)
+        assert sorted(b"\n".join(bodies).decode().split("\n")) == sorted(lines)
+
+    def test_write_split_on_payload_too_large(self, httpserver: HTTPServer):
+        self.limit_body_size(httpserver, 100)
+        lines = [f"mem,tag=t{i} value={i}i {i}" for i in range(20)]
+
+        InfluxDBClient3(
+            host=(httpserver.url_for("/")), org="ORG", database="DB", token="TOKEN",
+            write_client_options=write_client_options(
+                write_options=WriteOptions(write_type=WriteType.synchronous)
+            )
+        ).write(lines)
+
+        statuses = [response.status_code for _, response in httpserver.log]
+        assert statuses[0] == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        written = [request.get_data() for request, response in httpserver.log if response.status_code == 204]
+        # the halves are sent concurrently
+        assert sorted(b"\n".join(written).decode().split("\n")) == sorted(lines)
+
+    def test_write_single_line_too_large(self, httpserver: HTTPServer):
+        self.limit_body_size(httpserver, 10)
+
+        with pytest.raises(ApiException) as err:
+            InfluxDBClient3(
+                host=(httpserver.url_for("/")), org="ORG", database="DB", token="TOKEN",
+                write_client_options=write_client_options(
+                    write_options=WriteOptions(write_type=WriteType.synchronous)
+                )
+            ).write(["mem,tag=a value=1i 1", "mem,tag=b value=2i 2"])
+        assert err.value.status == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        # the body and both of its single line halves
+        assert len(httpserver.log) == 3
+
+    def test_write_shards(self, httpserver: HTTPServer):
+        self.set_response_status(httpserver, 204)
+        lines = [f"mem,tag=t{i} value={i}i {i}" for i in range(20)]
+
+        InfluxDBClient3(
+            host=(httpserver.url_for("/")), org="ORG", database="DB", token="TOKEN",
+            write_client_options=write_client_options(
+                write_options=WriteOptions(write_type=WriteType.synchronous, write_shards=4)
+            )
+        ).write(lines)
+
+        bodies = [request.get_data() for request, _ in httpserver.log]
+        assert len(bodies) == 4
+        assert sorted(b"\n".join(bodies).decode().split("\n")) == sorted(lines)
+
+    def test_write_shards_of_single_body(self, httpserver: HTTPServer):
+        self.set_response_status(httpserver, 204)
+        lines = [f"mem,tag=t{i} value={i}i {i}" for i in range(20)]
+
+        InfluxDBClient3(
+            host=(httpserver.url_for("/")), org="ORG", database="DB", token="TOKEN",
+            write_client_options=write_client_options(
+                write_options=WriteOptions(write_type=WriteType.synchronous)
+            )
+        ).write("\n".join(lines), write_shards=3)
+
+        bodies = [request.get_data() for request, _ in httpserver.log]
+        assert 1 < len(bodies) <= 4
+        assert sorted(b"\n".join(bodies).decode().split("\n")) == sorted(lines)
+
+    def test_write_shards_of_named_tuple(self, httpserver: HTTPServer):
+        self.set_response_status(httpserver, 204)
+
+        class Sensor(NamedTuple):
+            name: str
+            location: str
+            value: int
+            timestamp: int
+
+        InfluxDBClient3(
+            host=(httpserver.url_for("/")), org="ORG", database="DB", token="TOKEN",
+            write_client_options=write_client_options(
+                write_options=WriteOptions(write_type=WriteType.synchronous, write_shards=4)
+            )
+        ).write(Sensor("sensor", "room", 12, 1), record_measurement_key="name", record_tag_keys=["location"],
+                record_field_keys=["value"], record_time_key="timestamp")
+
+        bodies = [request.get_data() for request, _ in httpserver.log]
+        assert bodies == [b"sensor,location=room value=12i 1"]
+
+    def test_write_shards_failed(self, httpserver: HTTPServer):
+        def handler(request):
+            if b"tag=t0" in request.get_data():
+                return Response(status=HTTPStatus.BAD_REQUEST)
+            return Response(status=HTTPStatus.NO_CONTENT)
+
+        httpserver.expect_request(re.compile(".*")).respond_with_handler(handler)
+        lines = [f"mem,tag=t{i} value={i}i {i}" for i in range(4)]
+
+        with pytest.raises(InfluxDBShardedWriteError) as err:
+            InfluxDBClient3(
+                host=(httpserver.url_for("/")), org="ORG", database="DB", token="TOKEN",
+                write_client_options=write_client_options(
+                    write_options=WriteOptions(write_type=WriteType.synchronous, write_shards=4)
+                )
+            ).write(lines)
+        assert err.value.shards == 4
+        assert list(err.value.shard_errors.keys()) == [0]
+        assert err.value.shard_errors[0].status == HTTPStatus.BAD_REQUEST
+        assert len(httpserver.log) == 4